@@ -1,10 +1,24 @@
 import os
+import re
+import json
+import time
+import asyncio
+import functools
+import uuid
 import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from dateutil.parser import parse
 from sqlmodel import Session
-from .models import TaskCreate, Task
-from .crud import create_task, list_tasks, search_tasks
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import TaskCreate, TaskUpdate, TaskStatus, TaskPriority
+from .skills import TodoSkills
+from . import intents
+from .tool_output import ToolOutputStats, PAGE_SIZE, task_line, task_page
 import google.generativeai as genai
 
 # Load env vars
@@ -18,121 +32,489 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("OPENAI_API_KEY") or o
 if GOOGLE_API_KEY:
     genai.configure(api_key=GOOGLE_API_KEY)
 
-class TodoAgent:
-    def __init__(self, session: Session):
-        self.session = session
-        self.enabled = bool(GOOGLE_API_KEY)
+# verified model that supports functions
+# gemini-flash-latest usually maps to the stable 1.5 Flash model
+MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-flash-latest")
+SYSTEM_INSTRUCTION = (
+    "You are a helpful Todo List Assistant. You can create, list, search, and update tasks. "
+    "When a user mentions a time or recurrence (like 'every Friday' or 'tomorrow'), "
+    "extract that information carefully. Statuses: pending, in_progress, completed, cancelled. "
+    "Priorities: low, medium, high, urgent. Recurrence: daily, weekly, monthly, 'every Friday', "
+    "'every 2 weeks', or an RRULE. Tools show tasks with 8-character id prefixes; pass those as ids. "
+    "Lists are paged: only ask for the next page when the user needs more."
+)
+DISABLED_MESSAGE = "AI Agent is disabled. Please set GOOGLE_API_KEY in .env file."
 
-    def process_message(self, message: str) -> str:
+# --- Tools ---
+# Plain module-level functions, so the model and its tool schemas are built
+# once per process. The DB session of the request being served is bound
+# through a context variable for the duration of each message.
+
+_session: ContextVar[Optional[Session]] = ContextVar("agent_session", default=None)
+
+@contextmanager
+def bind_session(session: Session):
+    token = _session.set(session)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+def current_session() -> Session:
+    session = _session.get()
+    if session is None:
+        raise RuntimeError("Agent tool called outside of a bound session")
+    return session
+
+def create_todo(
+    title: str,
+    priority: str = "medium",
+    category: str = None,
+    recurrence: str = None,
+    due_date: str = None,
+    reminder_at: str = None
+):
+    """Create a new task in the todo list."""
+    logger.info(f"Tool Call: create_todo(title={title})")
+    try:
+        task_data = TaskCreate(
+            title=title,
+            priority=TaskPriority(priority),
+            category=category,
+            recurrence_rule=recurrence,
+            due_date=parse(due_date) if due_date else None,
+            reminder_at=parse(reminder_at) if reminder_at else None
+        )
+        task = TodoSkills.create_task(current_session(), task_data)
+        return f"SUCCESS: Created {task_line(task)}"
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+def update_todo(
+    id: str,
+    title: str = None,
+    status: str = None,
+    priority: str = None,
+    category: str = None,
+    due_date: str = None,
+    recurrence: str = None
+):
+    """Update an existing task. `id` is the task's id or its 8-character prefix."""
+    logger.info(f"Tool Call: update_todo(id={id})")
+    try:
+        session = current_session()
+        task_id = TodoSkills.resolve_task_id(session, id)
+        if task_id is None:
+            return f"ERROR: No single task matches id {id}"
+        update_data = {}
+        if title: update_data["title"] = title
+        if status: update_data["status"] = TaskStatus(status)
+        if priority: update_data["priority"] = TaskPriority(priority)
+        if category: update_data["category"] = category
+        if recurrence: update_data["recurrence_rule"] = recurrence
+        if due_date: update_data["due_date"] = parse(due_date)
+
+        task = TodoSkills.update_task(session, task_id, TaskUpdate(**update_data))
+        return f"SUCCESS: Updated {task_line(task)}" if task else f"ERROR: Task {id} not found"
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+def get_todos(status: str = "pending", page: int = 1):
+    """List tasks from the todo list, one page at a time."""
+    logger.info(f"Tool Call: get_todos(status={status}, page={page})")
+    try:
+        page = max(int(page), 1)
+        tasks = TodoSkills.list_tasks(
+            current_session(), status=TaskStatus(status), offset=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE + 1
+        )
+        return task_page(tasks, page, f'get_todos(status="{status}", page={page + 1})', "No tasks found.")
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+def search_todos(query: str, page: int = 1):
+    """Search tasks by keyword, one page of results at a time."""
+    logger.info(f"Tool Call: search_todos(query={query}, page={page})")
+    try:
+        page = max(int(page), 1)
+        tasks = TodoSkills.search_tasks(
+            current_session(), query, offset=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE + 1
+        )
+        return task_page(tasks, page, f"search_todos(query={query!r}, page={page + 1})", "No matching tasks found.")
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+TOOLS = [create_todo, get_todos, search_todos, update_todo]
+TOOLS_BY_NAME = {tool.__name__: tool for tool in TOOLS}
+
+# --- LLM clients ---
+# A client streams (event, data) pairs for one user message: "text" with a
+# {"delta"} of model output, and "tool_call" / "tool_result" around each tool
+# it runs through the `call_tool` coroutine the runtime passes in.
+
+AgentEvent = Tuple[str, Dict[str, Any]]
+ToolCaller = Callable[[str, Dict[str, Any]], Awaitable[str]]
+
+# Model turns that may request tools before a message is abandoned
+MAX_TOOL_ROUNDS = 5
+TOOL_ROUNDS_EXCEEDED = "I stopped after too many tool calls."
+
+class LLMClient:
+    """Starts chats; a chat object keeps its own history."""
+
+    def start_chat(self) -> Any:
+        raise NotImplementedError
+
+    def stream(self, chat: Any, message: str, call_tool: ToolCaller) -> AsyncIterator[AgentEvent]:
+        raise NotImplementedError
+
+class GeminiClient(LLMClient):
+    def __init__(self, model_name: str = MODEL_NAME, tools: List[Callable] = TOOLS):
+        self.model_name = model_name
+        self.tools = tools
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        # Deriving the tool declarations is the expensive part; do it once
+        with self._lock:
+            if self._model is None:
+                self._model = genai.GenerativeModel(
+                    model_name=self.model_name,
+                    tools=self.tools,
+                    system_instruction=SYSTEM_INSTRUCTION
+                )
+            return self._model
+
+    def start_chat(self) -> Any:
+        # Function calls are run by stream() below: the SDK's automatic
+        # function calling does not support streamed responses
+        return self.model.start_chat()
+
+    async def stream(self, chat: Any, message: str, call_tool: ToolCaller) -> AsyncIterator[AgentEvent]:
+        content: Any = message
+        start = len(chat.history)
+        for _ in range(MAX_TOOL_ROUNDS):
+            response = await chat.send_message_async(content, stream=True)
+            calls = []
+            async for chunk in response:
+                for part in chunk.parts:
+                    if "text" in part and part.text:
+                        yield "text", {"delta": part.text}
+                    if "function_call" in part:
+                        calls.append(part.function_call)
+            if not calls:
+                return
+            replies = []
+            for call in calls:
+                args = genai.protos.FunctionCall.to_dict(call).get("args", {})
+                yield "tool_call", {"name": call.name, "args": args}
+                output = await call_tool(call.name, args)
+                yield "tool_result", {"name": call.name, "output": output}
+                replies.append(genai.protos.Part(
+                    function_response=genai.protos.FunctionResponse(name=call.name, response={"result": output})
+                ))
+            content = genai.protos.Content(parts=replies)
+        # The last round's function calls were never answered, and the API
+        # rejects a history that ends on one. Replace this message's turns
+        # with the plain exchange, so the stored conversation can continue.
+        chat.history = chat.history[:start] + [
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text=message)]),
+            genai.protos.Content(role="model", parts=[genai.protos.Part(text=TOOL_ROUNDS_EXCEEDED)]),
+        ]
+        yield "text", {"delta": TOOL_ROUNDS_EXCEEDED}
+
+class FakeChat:
+    def __init__(self):
+        self.history: List[Tuple[str, str]] = []
+
+class FakeLLMClient(LLMClient):
+    """
+    Local stand-in for tests and benchmarks. A message of the form
+    `<tool name> <JSON arguments>` calls that tool and replies with its
+    output; anything else is echoed back. `respond` replaces that behaviour
+    and `latency` simulates the model round trip. Replies are streamed
+    word by word.
+    """
+
+    def __init__(self, respond: Optional[Callable[[FakeChat, str], str]] = None, latency: float = 0.0):
+        self.respond = respond
+        self.latency = latency
+        self.chats_started = 0
+
+    def start_chat(self) -> FakeChat:
+        self.chats_started += 1
+        return FakeChat()
+
+    async def stream(self, chat: FakeChat, message: str, call_tool: ToolCaller) -> AsyncIterator[AgentEvent]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        chat.history.append(("user", message))
+        name, _, arguments = message.partition(" ")
+        if self.respond is not None:
+            reply = self.respond(chat, message)
+        elif name in TOOLS_BY_NAME:
+            args = json.loads(arguments) if arguments.strip() else {}
+            yield "tool_call", {"name": name, "args": args}
+            reply = await call_tool(name, args)
+            yield "tool_result", {"name": name, "output": reply}
+        else:
+            reply = f"You said: {message}"
+        chat.history.append(("model", reply))
+        for delta in re.findall(r"\s*\S+", reply) or [reply]:
+            yield "text", {"delta": delta}
+
+# --- Conversations ---
+
+class Conversation:
+    def __init__(self, conversation_id: str, chat: Any):
+        self.id = conversation_id
+        self.chat = chat
+        # A chat's history is not safe to extend from two requests at once
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+class ConversationStore:
+    """LRU of live chats; entries idle for longer than `idle_ttl` seconds are dropped."""
+
+    def __init__(self, max_conversations: int = 1000, idle_ttl: float = 1800.0):
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.resumed = 0
+        self.evicted = 0
+
+    def get_or_create(self, conversation_id: Optional[str], start_chat: Callable[[], Any]) -> Conversation:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            conversation = self._conversations.get(conversation_id) if conversation_id else None
+            if conversation is not None:
+                self._conversations.move_to_end(conversation.id)
+                self.resumed += 1
+            else:
+                # Unknown or expired ids start over under the same id
+                conversation = Conversation(conversation_id or uuid.uuid4().hex, start_chat())
+                self._conversations[conversation.id] = conversation
+                self.created += 1
+                while len(self._conversations) > self.max_conversations:
+                    self._conversations.popitem(last=False)
+                    self.evicted += 1
+            conversation.last_used = now
+            return conversation
+
+    def _evict_idle(self, now: float) -> None:
+        # Oldest first, so stop at the first one still in use
+        while self._conversations:
+            conversation = next(iter(self._conversations.values()))
+            if now - conversation.last_used <= self.idle_ttl:
+                return
+            self._conversations.popitem(last=False)
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def stats(self) -> Dict[str, int]:
+        return {"active": len(self), "created": self.created, "resumed": self.resumed, "evicted": self.evicted}
+
+# --- Runtime ---
+
+class AgentReply:
+    def __init__(self, response: str, conversation_id: Optional[str]):
+        self.response = response
+        self.conversation_id = conversation_id
+
+class AgentRuntime:
+    def __init__(
+        self,
+        client: Optional[LLMClient],
+        conversations: Optional[ConversationStore] = None,
+        fast_path: bool = True
+    ):
+        self.client = client
+        self.conversations = conversations or ConversationStore()
+        # Simple commands are answered locally (see intents); the rest go to the model
+        self.fast_path = fast_path
+        self.fast_path_stats = intents.FastPathStats()
+        self.tool_stats = ToolOutputStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    async def stream(
+        self, session: Union[AsyncSession, Session], message: str, conversation_id: Optional[str] = None
+    ) -> AsyncIterator[AgentEvent]:
+        """
+        Events for one message: "conversation" first, then the client's
+        "text" / "tool_call" / "tool_result" events as they happen, and
+        "done" with the whole response last. Failures are reported as an
+        "error" event followed by "done". A message handled by the fast path
+        yields "intent" and a single "text" instead; it is not added to the
+        model's chat history.
+        """
+        reply = await self._try_fast_path(session, message)
+        if reply is not None:
+            intent, text = reply
+            if self.enabled:
+                conversation_id = self.conversations.get_or_create(conversation_id, self.client.start_chat).id
+                yield "conversation", {"conversation_id": conversation_id}
+            yield "intent", {"name": intent.name}
+            yield "text", {"delta": text}
+            yield "done", {"response": text, "conversation_id": conversation_id}
+            return
         if not self.enabled:
-            return "AI Agent is disabled. Please set GOOGLE_API_KEY in .env file."
-            
+            yield "done", {"response": DISABLED_MESSAGE, "conversation_id": None}
+            return
+        parts = []
         try:
-            # --- Tool Definitions (Closures to capture session) ---
-            from .skills import TodoSkills
-            from .models import TaskStatus, TaskPriority, TaskCreate, TaskUpdate
-            from datetime import datetime
-
-            def create_todo(
-                title: str, 
-                priority: str = "medium", 
-                category: str = None, 
-                recurrence: str = None,
-                due_date: str = None,
-                reminder_at: str = None
-            ):
-                """Create a new task in the todo list."""
-                logger.info(f"Tool Call: create_todo(title={title})")
-                try:
-                    from dateutil.parser import parse
-                    parsed_due = parse(due_date) if due_date else None
-                    parsed_reminder = parse(reminder_at) if reminder_at else None
-
-                    task_data = TaskCreate(
-                        title=title, 
-                        priority=TaskPriority(priority), 
-                        category=category,
-                        recurrence_rule=recurrence,
-                        due_date=parsed_due,
-                        reminder_at=parsed_reminder
-                    )
-                    task = TodoSkills.create_task(self.session, task_data)
-                    return f"SUCCESS: Created task '{task.title}' [ID: {task.id}]"
-                except Exception as e:
-                    return f"ERROR: {str(e)}"
+            conversation = self.conversations.get_or_create(conversation_id, self.client.start_chat)
+            conversation_id = conversation.id
+            yield "conversation", {"conversation_id": conversation_id}
+            async with conversation.lock:
+                call_tool = functools.partial(self._call_tool, session)
+                async for event, data in self.client.stream(conversation.chat, message, call_tool):
+                    if event == "text":
+                        parts.append(data["delta"])
+                    yield event, data
+        except Exception as e:
+            logger.error(f"Agent Logic Error: {e}", exc_info=True)
+            error = f"I encountered an error processing your request: {str(e)}"
+            yield "error", {"message": error}
+            parts = [error]
+        yield "done", {"response": "".join(parts), "conversation_id": conversation_id}
 
-            def update_todo(
-                id: str,
-                title: str = None,
-                status: str = None,
-                priority: str = None,
-                category: str = None,
-                due_date: str = None,
-                recurrence: str = None
-            ):
-                """Update an existing task."""
-                logger.info(f"Tool Call: update_todo(id={id})")
-                try:
-                    from dateutil.parser import parse
-                    update_data = {}
-                    if title: update_data["title"] = title
-                    if status: update_data["status"] = TaskStatus(status)
-                    if priority: update_data["priority"] = TaskPriority(priority)
-                    if category: update_data["category"] = category
-                    if recurrence: update_data["recurrence_rule"] = recurrence
-                    if due_date: update_data["due_date"] = parse(due_date)
-                    
-                    task = TodoSkills.update_task(self.session, id, TaskUpdate(**update_data))
-                    return f"SUCCESS: Updated task {id}" if task else f"ERROR: Task {id} not found"
-                except Exception as e:
-                    return f"ERROR: {str(e)}"
+    async def process_message(
+        self, session: Union[AsyncSession, Session], message: str, conversation_id: Optional[str] = None
+    ) -> AgentReply:
+        async for event, data in self.stream(session, message, conversation_id):
+            if event == "done":
+                return AgentReply(data["response"], data["conversation_id"])
 
-            def get_todos(status: str = "pending"):
-                """List tasks from the todo list."""
-                logger.info(f"Tool Call: get_todos(status={status})")
-                try:
-                    tasks = TodoSkills.list_tasks(self.session, status=TaskStatus(status), limit=20)
-                    if not tasks:
-                        return "No tasks found."
-                    return "\n".join([f"- {t.title} [ID: {t.id}] (Status: {t.status}, Priority: {t.priority})" for t in tasks])
-                except Exception as e:
-                    return f"ERROR: {str(e)}"
+    async def _try_fast_path(
+        self, session: Union[AsyncSession, Session], message: str
+    ) -> Optional[Tuple[intents.Intent, str]]:
+        if not self.fast_path:
+            return None
+        start = time.perf_counter()
+        intent = intents.parse(message)
+        text = None
+        if intent is not None:
+            try:
+                text = await self._run_sync(session, intents.execute, intent)
+            except Exception as e:
+                # e.g. a title the model would have shortened; let it try
+                logger.info(f"Fast path fell through for {intent.name}: {e}")
+        self.fast_path_stats.record(intent, text is not None, time.perf_counter() - start)
+        return (intent, text) if text is not None else None
 
-            def search_todos(query: str):
-                """Search tasks by keyword."""
-                logger.info(f"Tool Call: search_todos(query={query})")
+    @staticmethod
+    async def _run_sync(session: Union[AsyncSession, Session], fn: Callable, *args) -> Any:
+        # Tools and intents are sync TodoSkills code; on an AsyncSession they
+        # run through run_sync, so the DB I/O still goes through the async driver
+        if isinstance(session, AsyncSession):
+            return await session.run_sync(fn, *args)
+        return fn(session, *args)
+
+    async def _call_tool(self, session: Union[AsyncSession, Session], name: str, args: Dict[str, Any]) -> str:
+        tool = TOOLS_BY_NAME.get(name)
+        if tool is None:
+            return f"ERROR: Unknown tool {name}"
+
+        def invoke(sync_session: Session) -> str:
+            with bind_session(sync_session):
                 try:
-                    tasks = TodoSkills.search_tasks(self.session, query)
-                    if not tasks:
-                        return "No matching tasks found."
-                    return "\n".join([f"- {t.title} [ID: {t.id}] (Status: {t.status})" for t in tasks])
-                except Exception as e:
+                    return tool(**args)
+                except TypeError as e:
                     return f"ERROR: {str(e)}"
 
-            # --- Agent Execution ---
-            
-            tools = [create_todo, get_todos, search_todos, update_todo]
-            
-            # verified model that supports functions
-            # gemini-flash-latest usually maps to the stable 1.5 Flash model
-            system_instruction = (
-                "You are a helpful Todo List Assistant. You can create, list, search, and update tasks. "
-                "When a user mentions a time or recurrence (like 'every Friday' or 'tomorrow'), "
-                "extract that information carefully. Statuses: pending, in_progress, completed, cancelled. "
-                "Priorities: low, medium, high, urgent. Recurrence: daily, weekly, monthly."
-            )
-            model = genai.GenerativeModel(
-                model_name='gemini-flash-latest', 
-                tools=tools,
-                system_instruction=system_instruction
-            )
-            
-            # Automatic function calling handles the loop
-            chat = model.start_chat(enable_automatic_function_calling=True)
-            
-            response = chat.send_message(message)
-            return response.text
-            
-        except Exception as e:
-            logger.error(f"Agent Logic Error: {e}", exc_info=True)
-            return f"I encountered an error processing your request: {str(e)}"
+        output = await self._run_sync(session, invoke)
+        tokens = self.tool_stats.record(name, output)
+        logger.info(f"Tool Output: {name} ~{tokens} tokens")
+        return output
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "client": type(self.client).__name__ if self.client else None,
+            **self.conversations.stats(),
+            "fast_path": self.fast_path_stats.stats(),
+            "tool_output": self.tool_stats.stats(),
+        }
+
+def build_agent_runtime() -> AgentRuntime:
+    """
+    AGENT_LLM=gemini (default, needs GOOGLE_API_KEY) | fake; AGENT_FAST_PATH=on | off;
+    AGENT_MAX_CONVERSATIONS, AGENT_IDLE_SECONDS.
+    """
+    kind = os.getenv("AGENT_LLM", "gemini")
+    conversations = ConversationStore(
+        int(os.getenv("AGENT_MAX_CONVERSATIONS", "1000")),
+        float(os.getenv("AGENT_IDLE_SECONDS", "1800"))
+    )
+    fast_path = os.getenv("AGENT_FAST_PATH", "on") != "off"
+    if kind == "fake":
+        return AgentRuntime(FakeLLMClient(), conversations, fast_path)
+    return AgentRuntime(GeminiClient() if GOOGLE_API_KEY else None, conversations, fast_path)
+
+agent_runtime = build_agent_runtime()
+
+def get_agent_runtime() -> AgentRuntime:
+    return agent_runtime
+
+class TodoAgent:
+    """One-shot wrapper kept for existing callers: a fresh conversation per message."""
+
+    def __init__(self, session: Session, runtime: Optional[AgentRuntime] = None):
+        self.session = session
+        self.runtime = runtime or agent_runtime
+        self.enabled = self.runtime.enabled
+
+    def process_message(self, message: str) -> str:
+        # For sync callers only; async code awaits AgentRuntime.process_message
+        return asyncio.run(self.runtime.process_message(self.session, message)).response
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    from pathlib import Path
+    from sqlmodel import SQLModel, create_engine
+
+    # python -m backend.agent [messages]: runtime overhead per message with the
+    # fake client, then time to first event for concurrent slow conversations
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    async def overhead(session: Session) -> float:
+        runtime = AgentRuntime(FakeLLMClient())
+        conversation_id = None
+        start = time.perf_counter()
+        for i in range(count):
+            message = "get_todos" if i % 2 else "create_todo " + json.dumps({"title": f"Task {i}"})
+            conversation_id = (await runtime.process_message(session, message, conversation_id)).conversation_id
+        return time.perf_counter() - start
+
+    async def first_events(session: Session, clients: int = 50, latency: float = 0.5) -> Tuple[float, float]:
+        runtime = AgentRuntime(FakeLLMClient(latency=latency))
+        start = time.perf_counter()
+
+        async def one() -> float:
+            async for event, _ in runtime.stream(session, "hello"):
+                if event == "text":
+                    first = time.perf_counter() - start
+            return first
+
+        firsts = await asyncio.gather(*(one() for _ in range(clients)))
+        return max(firsts), time.perf_counter() - start
+
+    logging.getLogger(__name__).setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'agent.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            elapsed = asyncio.run(overhead(session))
+            slowest_first, total = asyncio.run(first_events(session))
+        engine.dispose()
+    print(f"{count} messages in {elapsed:.2f}s: {elapsed / count * 1000:.2f} ms/message")
+    print(f"50 concurrent chats at 0.5s model latency: last first-text {slowest_first:.2f}s, all done {total:.2f}s")
@@ -0,0 +1,141 @@
+from typing import List, Optional, Dict, Any, AsyncIterator, Sequence
+from datetime import datetime
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority, TaskSearchHit, TaskStats, TaskChangeFeed, BulkItemResult
+from .skills import TodoSkills
+
+class AsyncTodoSkills:
+    """
+    Async facade over TodoSkills for the FastAPI routes.
+    Each call runs the sync TodoSkills logic through AsyncSession.run_sync, so the
+    I/O goes through the async driver while the business rules stay in one place.
+    """
+
+    @staticmethod
+    async def create_task(session: AsyncSession, task_create: TaskCreate) -> Task:
+        return await session.run_sync(TodoSkills.create_task, task_create)
+
+    @staticmethod
+    async def get_task(session: AsyncSession, task_id: str) -> Optional[Task]:
+        return await session.get(Task, task_id)
+
+    @staticmethod
+    async def task_version(session: AsyncSession, task_id: str) -> Optional[datetime]:
+        return await session.run_sync(TodoSkills.task_version, task_id)
+
+    @staticmethod
+    async def collection_version(session: AsyncSession) -> int:
+        return await session.run_sync(TodoSkills.collection_version)
+
+    @staticmethod
+    async def get_stats(session: AsyncSession) -> TaskStats:
+        return await session.run_sync(TodoSkills.get_stats)
+
+    @staticmethod
+    async def list_changes(session: AsyncSession, since: Optional[int] = None, limit: int = 500) -> TaskChangeFeed:
+        return await session.run_sync(TodoSkills.list_changes, since, limit)
+
+    @staticmethod
+    async def compact_changes(session: AsyncSession, before: datetime) -> int:
+        return await session.run_sync(TodoSkills.compact_changes, before)
+
+    @staticmethod
+    async def list_tasks(
+        session: AsyncSession,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        tags: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        offset: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Task]:
+        return await session.run_sync(
+            TodoSkills.list_tasks, status, priority, tags, category, sort_by, sort_order,
+            offset, limit, cursor, tag_mode, due_after, due_before
+        )
+
+    @staticmethod
+    async def list_task_rows(
+        session: AsyncSession,
+        fields: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        tags: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        offset: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        return await session.run_sync(
+            TodoSkills.list_task_rows, fields, status, priority, tags, category, sort_by, sort_order,
+            offset, limit, cursor, tag_mode, due_after, due_before
+        )
+
+    # Builds the statement only, so it needs no session
+    export_statement = staticmethod(TodoSkills.export_statement)
+
+    @staticmethod
+    async def export_rows(session: AsyncSession, statement, batch_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+        """Yield lists of rows from `statement`, streamed from a server-side cursor."""
+        result = await session.stream(statement.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+    @staticmethod
+    async def update_task(session: AsyncSession, task_id: str, task_update: TaskUpdate) -> Optional[Task]:
+        return await session.run_sync(TodoSkills.update_task, task_id, task_update)
+
+    @staticmethod
+    async def complete_task(session: AsyncSession, task_id: str) -> Optional[Task]:
+        return await session.run_sync(TodoSkills.complete_task, task_id)
+
+    @staticmethod
+    async def delete_task(session: AsyncSession, task_id: str) -> bool:
+        return await session.run_sync(TodoSkills.delete_task, task_id)
+
+    @staticmethod
+    async def search_tasks(session: AsyncSession, query: str, offset: int = 0, limit: int = 50) -> List[Task]:
+        return await session.run_sync(TodoSkills.search_tasks, query, offset, limit)
+
+    @staticmethod
+    async def search_task_hits(session: AsyncSession, query: str, offset: int = 0, limit: int = 20) -> List[TaskSearchHit]:
+        return await session.run_sync(TodoSkills.search_task_hits, query, offset, limit)
+
+    @staticmethod
+    async def bulk_create_tasks(session: AsyncSession, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+        return await session.run_sync(TodoSkills.bulk_create_tasks, items)
+
+    @staticmethod
+    async def bulk_update_tasks(session: AsyncSession, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+        return await session.run_sync(TodoSkills.bulk_update_tasks, items)
+
+    @staticmethod
+    async def bulk_complete_tasks(session: AsyncSession, task_ids: List[str]) -> List[BulkItemResult]:
+        return await session.run_sync(TodoSkills.bulk_complete_tasks, task_ids)
+
+    @staticmethod
+    async def bulk_delete_tasks(session: AsyncSession, task_ids: List[str]) -> List[BulkItemResult]:
+        return await session.run_sync(TodoSkills.bulk_delete_tasks, task_ids)
+
+    @staticmethod
+    async def import_rows(session: AsyncSession, task_rows: List[Dict[str, Any]], tag_rows: List[Dict[str, Any]]) -> None:
+        await session.run_sync(TodoSkills.import_rows, task_rows, tag_rows)
+
+    @staticmethod
+    async def materialize_occurrences(session: AsyncSession, until: datetime, max_per_series: int = 366) -> int:
+        return await session.run_sync(TodoSkills.materialize_occurrences, until, max_per_series)
+
+    @staticmethod
+    async def advance_overdue_recurring(session: AsyncSession, now: Optional[datetime] = None) -> int:
+        return await session.run_sync(TodoSkills.advance_overdue_recurring, now)
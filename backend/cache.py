@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+# Read-through cache for task reads.
+# Single tasks live under "task:<id>" and are dropped when that task changes.
+# List/search results are keyed on the normalized query plus a version number
+# (the database's collection_version for the API); any write bumps it, so
+# stale query entries become unreachable and age out of the LRU. Writes made
+# through TodoSkills also bump this process's generation.
+
+class CacheBackend:
+    """Minimal key/value interface; values are JSON-compatible."""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    """In-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Counters live outside the LRU so the generation can never be evicted
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+class RedisCache(CacheBackend):
+    """Backend for any redis-py compatible client (Redis, KeyDB, fakeredis, ...)."""
+
+    def __init__(self, client, prefix: str = "todo:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), ex=int(ttl) if ttl else None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class TaskCache:
+    GENERATION_KEY = "generation"
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = 30.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def generation(self) -> int:
+        if not self.enabled:
+            return 0
+        return self.backend.get(self.GENERATION_KEY) or 0
+
+    def query_key(self, kind: str, generation: int, **params) -> str:
+        normalized = {k: _normalize(v) for k, v in sorted(params.items()) if v is not None}
+        return f"{kind}:{generation}:{json.dumps(normalized, separators=(',', ':'))}"
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        # Skip the store if a write landed while the value was being read;
+        # callers whose key already carries a version pass no generation
+        if self.enabled and (generation is None or self.generation() == generation):
+            self.backend.set(key, value, self.ttl)
+
+    @staticmethod
+    def task_key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    def invalidate(self, task_ids: Iterable[str] = ()) -> None:
+        """Drop the given tasks and every cached list/search result."""
+        if not self.enabled:
+            return
+        self.backend.incr(self.GENERATION_KEY)
+        self.backend.delete(*(self.task_key(task_id) for task_id in task_ids))
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+def build_task_cache() -> TaskCache:
+    """TASK_CACHE_BACKEND=memory (default) | redis | off; REDIS_URL for redis."""
+    kind = os.getenv("TASK_CACHE_BACKEND", "memory")
+    ttl = float(os.getenv("TASK_CACHE_TTL", "30"))
+    if kind == "off":
+        return TaskCache(None, ttl)
+    if kind == "redis":
+        import redis
+        return TaskCache(RedisCache(redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))), ttl)
+    return TaskCache(MemoryCache(int(os.getenv("TASK_CACHE_MAX_ENTRIES", "10000"))), ttl)
+
+task_cache = build_task_cache()
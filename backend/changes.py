@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from .models import TaskChangeFeed
+from .events import EventHub, format_sse
+
+# Change feed over the TaskChange log.
+# TodoSkills appends a row per touched task inside each write transaction and
+# calls notify() after the commit; waiting long-poll requests and SSE streams
+# then re-read the log. They also re-read it every `poll_interval` seconds, so
+# writes from other processes (CLI, MCP server) are picked up too.
+# `load(since)` is the async reader, e.g. AsyncTodoSkills.list_changes bound to a session.
+
+Loader = Callable[[Optional[int]], Awaitable[TaskChangeFeed]]
+
+logger = logging.getLogger(__name__)
+
+class ChangeFeed:
+    def __init__(self, retention: float = 7 * 24 * 3600, compact_interval: float = 3600, poll_interval: float = 15.0):
+        self.retention = timedelta(seconds=retention)
+        self.compact_interval = compact_interval
+        self.poll_interval = poll_interval
+        self.hub = EventHub(replay=0)
+        self._task: Optional[asyncio.Task] = None
+        self.compacted = 0
+        self.compaction_errors = 0
+
+    def notify(self) -> None:
+        """Wake readers after a committed write; safe from any thread."""
+        self.hub.publish("changes", None)
+
+    async def _wait(self, queue: asyncio.Queue, timeout: float) -> bool:
+        """Wait for a notification; False on timeout."""
+        try:
+            await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        # Several commits may have landed; one re-read covers them all
+        while not queue.empty():
+            queue.get_nowait()
+        return True
+
+    async def long_poll(self, load: Loader, since: Optional[int], timeout: float) -> TaskChangeFeed:
+        """Return as soon as there are changes after `since`, or after `timeout` seconds."""
+        queue = self.hub.subscribe()
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                feed = await load(since)
+                remaining = deadline - loop.time()
+                if feed.changes or feed.resync or since is None or remaining <= 0:
+                    return feed
+                await self._wait(queue, min(remaining, self.poll_interval))
+        finally:
+            self.hub.unsubscribe(queue)
+
+    async def stream(
+        self,
+        load: Loader,
+        since: Optional[int],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        SSE: `changes` events (id = the feed position, so Last-Event-ID resumes)
+        and a `resync` event when the client has fallen behind the retained log,
+        after which streaming continues from the current position.
+        """
+        queue = self.hub.subscribe()
+        try:
+            if since is None:
+                since = (await load(None)).next
+                yield format_sse("position", {"next": since}, since)
+            while True:
+                feed = await load(since)
+                if feed.resync:
+                    since = feed.next
+                    yield format_sse("resync", {"next": since}, since)
+                    continue
+                if feed.changes:
+                    since = feed.next
+                    yield format_sse("changes", feed.model_dump(mode="json"), since)
+                    continue
+                if not await self._wait(queue, self.poll_interval):
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+        finally:
+            self.hub.unsubscribe(queue)
+
+    async def run_compaction(self, compact: Callable[[datetime], Awaitable[int]]) -> None:
+        while True:
+            # A failed pass (e.g. a locked database) is retried next interval
+            # rather than ending retention pruning for good
+            try:
+                self.compacted += await compact(datetime.utcnow() - self.retention)
+            except Exception:
+                self.compaction_errors += 1
+                logger.exception("Change log compaction failed; retrying in %.0fs", self.compact_interval)
+            await asyncio.sleep(self.compact_interval)
+
+    def start(self, compact: Callable[[datetime], Awaitable[int]]) -> None:
+        self._task = asyncio.create_task(self.run_compaction(compact))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self):
+        return {"compacted": self.compacted, "compaction_errors": self.compaction_errors, "listeners": self.hub.subscriber_count}
+
+change_feed = ChangeFeed(
+    retention=float(os.getenv("CHANGE_RETENTION_SECONDS", str(7 * 24 * 3600))),
+    compact_interval=float(os.getenv("CHANGE_COMPACT_INTERVAL_SECONDS", "3600")),
+)
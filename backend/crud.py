@@ -1,6 +1,7 @@
 from sqlmodel import Session
-from typing import List, Optional
-from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime
+from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority, TaskSearchHit, TaskStats, TaskChangeFeed, BulkItemResult
 from .skills import TodoSkills
 
 def create_task(session: Session, task_create: TaskCreate) -> Task:
@@ -9,6 +10,15 @@ def create_task(session: Session, task_create: TaskCreate) -> Task:
 def get_task(session: Session, task_id: str) -> Optional[Task]:
     return session.get(Task, task_id)
 
+def get_stats(session: Session) -> TaskStats:
+    return TodoSkills.get_stats(session)
+
+def list_changes(session: Session, since: Optional[int] = None, limit: int = 500) -> TaskChangeFeed:
+    return TodoSkills.list_changes(session, since, limit)
+
+def compact_changes(session: Session, before: datetime) -> int:
+    return TodoSkills.compact_changes(session, before)
+
 def list_tasks(
     session: Session,
     status: Optional[TaskStatus] = None,
@@ -18,23 +28,76 @@ def list_tasks(
     sort_by: Optional[str] = None,
     sort_order: str = "desc",
     offset: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    tag_mode: str = "any",
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None
 ) -> List[Task]:
-    return TodoSkills.list_tasks(session, status, priority, tags, category, sort_by, sort_order, offset, limit)
+    return TodoSkills.list_tasks(
+        session, status, priority, tags, category, sort_by, sort_order, offset, limit, cursor, tag_mode,
+        due_after, due_before
+    )
+
+def list_task_rows(
+    session: Session,
+    fields: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    tags: Optional[str] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: str = "desc",
+    offset: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    tag_mode: str = "any",
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    return TodoSkills.list_task_rows(
+        session, fields, status, priority, tags, category, sort_by, sort_order, offset, limit, cursor, tag_mode,
+        due_after, due_before
+    )
+
+def encode_cursor(task: Union[Task, Dict[str, Any]], sort_by: Optional[str] = None, sort_order: str = "desc") -> str:
+    return TodoSkills.encode_cursor(task, sort_by, sort_order)
+
+def export_rows(session: Session, statement, batch_size: int = 1000):
+    return TodoSkills.export_rows(session, statement, batch_size)
 
 def update_task(session: Session, task_id: str, task_update: TaskUpdate) -> Optional[Task]:
     return TodoSkills.update_task(session, task_id, task_update)
 
 def delete_task(session: Session, task_id: str) -> bool:
-    db_task = session.get(Task, task_id)
-    if not db_task:
-        return False
-    session.delete(db_task)
-    session.commit()
-    return True
+    return TodoSkills.delete_task(session, task_id)
 
 def complete_task(session: Session, task_id: str) -> Optional[Task]:
     return TodoSkills.complete_task(session, task_id)
 
-def search_tasks(session: Session, query: str) -> List[Task]:
-    return TodoSkills.search_tasks(session, query)
+def search_tasks(session: Session, query: str, offset: int = 0, limit: int = 50) -> List[Task]:
+    return TodoSkills.search_tasks(session, query, offset, limit)
+
+def search_task_hits(session: Session, query: str, offset: int = 0, limit: int = 20) -> List[TaskSearchHit]:
+    return TodoSkills.search_task_hits(session, query, offset, limit)
+
+def bulk_create_tasks(session: Session, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+    return TodoSkills.bulk_create_tasks(session, items)
+
+def bulk_update_tasks(session: Session, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+    return TodoSkills.bulk_update_tasks(session, items)
+
+def bulk_complete_tasks(session: Session, task_ids: List[str]) -> List[BulkItemResult]:
+    return TodoSkills.bulk_complete_tasks(session, task_ids)
+
+def bulk_delete_tasks(session: Session, task_ids: List[str]) -> List[BulkItemResult]:
+    return TodoSkills.bulk_delete_tasks(session, task_ids)
+
+def import_rows(session: Session, task_rows: List[Dict[str, Any]], tag_rows: List[Dict[str, Any]]) -> None:
+    TodoSkills.import_rows(session, task_rows, tag_rows)
+
+def materialize_occurrences(session: Session, until: datetime, max_per_series: int = 366) -> int:
+    return TodoSkills.materialize_occurrences(session, until, max_per_series)
+
+def advance_overdue_recurring(session: Session, now: Optional[datetime] = None) -> int:
+    return TodoSkills.advance_overdue_recurring(session, now)
@@ -1,5 +1,16 @@
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from .skills import TodoSkills
+from .search import install_search_index
+from .models import TaskStat
+from .stats import TOTAL, NONE_KEY
+from typing import Dict, Any
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,17 +19,164 @@ load_dotenv()
 # Get DATABASE_URL from environment or default to SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./backend/database.db")
 
-# Create engine with appropriate settings
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite settings
-    engine = create_engine(DATABASE_URL, echo=True, connect_args={"check_same_thread": False})
-else:
-    # PostgreSQL/Neon DB settings
-    engine = create_engine(DATABASE_URL, echo=True)
+# Engine profile: dev (SQL echo on), prod (quiet, tuned pool) or test (quiet)
+DB_PROFILE = os.getenv("DB_PROFILE", "dev")
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "dev": {"echo": True},
+    "prod": {
+        "echo": False,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    },
+    "test": {"echo": False},
+}
+
+# Applied to every new SQLite connection. WAL lets readers run alongside a
+# writer, and busy_timeout makes writers wait instead of failing with
+# "database is locked". The task table carries many (column, id) indexes, so
+# the page cache is sized well above SQLite's 2 MB default to keep their
+# upper levels in memory during large writes (negative = KiB).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_KB", "65536")),
+}
+
+class PoolWaitStats:
+    """Counts connection checkouts and how long callers waited for them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+class TimedPoolMixin:
+    @property
+    def wait_stats(self) -> PoolWaitStats:
+        # Pools are rebuilt by recreate()/dispose(), so create lazily per instance
+        if "_wait_stats" not in self.__dict__:
+            self._wait_stats = PoolWaitStats()
+        return self._wait_stats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def _engine_options(url: str, profile: str, asynchronous: bool) -> Dict[str, Any]:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{profile}'. Use one of: {', '.join(PROFILES)}")
+    options = dict(PROFILES[profile])
+    pool_options = {k: options.pop(k) for k in list(options) if k.startswith("pool_") or k == "max_overflow"}
+    if url.startswith("sqlite"):
+        if not asynchronous:
+            options["connect_args"] = {"check_same_thread": False}
+        # In-memory databases use SQLAlchemy's single-connection pools
+        if make_url(url).database in (None, "", ":memory:"):
+            return options
+    options["poolclass"] = TimedAsyncQueuePool if asynchronous else TimedQueuePool
+    options.update(pool_options)
+    return options
+
+def build_engine(url: str, profile: str = DB_PROFILE):
+    engine = create_engine(url, **_engine_options(url, profile, asynchronous=False))
+    if url.startswith("sqlite"):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+def build_async_engine(url: str, profile: str = DB_PROFILE):
+    async_url = to_async_url(url)
+    engine = create_async_engine(async_url, **_engine_options(async_url, profile, asynchronous=True))
+    if async_url.startswith("sqlite"):
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver URL for its async counterpart (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+engine = build_engine(DATABASE_URL)
+# Async engine for the FastAPI routes; the sync engine stays for the MCP server and CLI callers
+async_engine = build_async_engine(DATABASE_URL)
+
+def pool_stats(target=None) -> Dict[str, Dict[str, Any]]:
+    """Live pool statistics for the sync and async engines (or just `target`)."""
+    engines = {"sync": engine, "async": async_engine.sync_engine}
+    if target is not None:
+        engines = {"engine": getattr(target, "sync_engine", target)}
+    stats = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        entry: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        if isinstance(pool, TimedPoolMixin):
+            waits = pool.wait_stats
+            entry.update(
+                checkouts=waits.checkouts,
+                total_wait_ms=round(waits.total_wait * 1000, 3),
+                max_wait_ms=round(waits.max_wait * 1000, 3),
+            )
+        stats[name] = entry
+    return stats
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist, so add any new ones
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        install_search_index(connection)
+    with Session(engine) as session:
+        # Move tags from the legacy JSON column into the TaskTag table
+        TodoSkills.backfill_tags(session)
+        # Seed the counters for databases created before TaskStat existed
+        if session.get(TaskStat, (TOTAL, NONE_KEY)) is None:
+            TodoSkills.rebuild_stats(session)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+async def get_async_session():
+    # expire_on_commit=False so returned tasks can be serialized after the commit
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+# In-process fan-out of server-sent events.
+# Each SSE connection gets its own bounded queue. A short replay buffer lets a
+# reconnecting EventSource resume from its Last-Event-ID. publish() may be
+# called from any thread; queues are only touched on the event loop.
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+class EventHub:
+    def __init__(self, replay: int = 100, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._replay: Deque[Tuple[int, str, Any]] = deque(maxlen=replay)
+        self._subscribers: List[asyncio.Queue] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Any) -> int:
+        """Queue an event for every subscriber; returns its id."""
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            self._replay.append((event_id, event, data))
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            return event_id
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out((event_id, event, data))
+        else:
+            loop.call_soon_threadsafe(self._fan_out, (event_id, event, data))
+        return event_id
+
+    def _fan_out(self, item: Tuple[int, str, Any]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # A stalled client misses events rather than holding memory;
+                # it can catch up through Last-Event-ID on reconnect
+                self.dropped += 1
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """Register a queue on the running loop, pre-filled with events after `last_event_id`."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            backlog = [item for item in self._replay if last_event_id is not None and item[0] > last_event_id]
+            self._subscribers.append(queue)
+        for item in backlog[-self.queue_size:]:
+            queue.put_nowait(item)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+    async def stream(
+        self,
+        last_event_id: Optional[int] = None,
+        heartbeat: float = 15.0,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[str]:
+        """SSE text for a StreamingResponse; a comment line is sent every `heartbeat` seconds."""
+        queue = self.subscribe(last_event_id)
+        try:
+            while True:
+                try:
+                    event_id, event, data = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event, data, event_id)
+        finally:
+            self.unsubscribe(queue)
+
+    def stats(self) -> Dict[str, int]:
+        return {"subscribers": self.subscriber_count, "dropped": self.dropped}
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable, Sequence
+from .models import Task
+
+# Streaming export of task rows as NDJSON or CSV.
+# Rows arrive in batches from a server-side cursor and each batch is encoded
+# into one chunk, so memory is bounded by the batch size, not the table size.
+
+EXPORT_COLUMNS = tuple(column.name for column in Task.__table__.columns)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def ndjson_chunk(rows: Iterable[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def csv_chunk(rows: Iterable[Sequence[Any]], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    # csv writes None as an empty field
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+async def encode(batches: AsyncIterator[Sequence[Sequence[Any]]], format: str) -> AsyncIterator[str]:
+    """Encode row batches (in EXPORT_COLUMNS order) as `format` chunks."""
+    if format == "csv":
+        # The header goes out even when there are no rows
+        yield csv_chunk((), header=True)
+    async for rows in batches:
+        yield csv_chunk(rows) if format == "csv" else ndjson_chunk(rows)
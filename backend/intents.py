@@ -0,0 +1,268 @@
+import re
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+from dateutil.parser import parse as parse_date, ParserError
+from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
+from sqlmodel import Session, select, col, func
+from .models import Task, TaskCreate, TaskStatus, TaskPriority
+from .skills import TodoSkills
+from .tool_output import SHORT_ID_LENGTH, task_line
+from . import recurrence, stats
+
+# Deterministic fast path for simple chat commands.
+# "add buy milk tomorrow high priority", "list pending", "complete <id>" and
+# the like are recognised with regular expressions and run straight through
+# TodoSkills, skipping the model round trip. Anything not matched with
+# confidence (unparseable dates, ambiguous titles, free-form questions)
+# returns None and goes to the LLM as before. Deletes always go to the model,
+# so nothing destructive runs on a pattern match alone.
+
+class Intent(NamedTuple):
+    name: str
+    args: Dict[str, Any]
+
+LIST_LIMIT = 20
+
+# A full task id or the 8-character prefix the tools show
+_ID_REF = r"[0-9a-f]{8}(?:-[0-9a-f-]{1,28})?"
+_WEEKDAYS = {
+    "monday": MO, "tuesday": TU, "wednesday": WE, "thursday": TH,
+    "friday": FR, "saturday": SA, "sunday": SU,
+}
+_PRIORITY = r"low|medium|high|urgent"
+
+_ADD = re.compile(
+    r"^(?:please\s+)?(?:add|create|remind\s+me\s+to)\s+(?:a\s+|an\s+)?(?:new\s+)?"
+    r"(?:(?:task|todo|to-do)\s*:?\s+)?(?:to\s+)?(?P<rest>.+)$", re.I
+)
+_LIST = re.compile(
+    r"^(?:list|show|get|display)(?:\s+(?:me|my|all\s+my))?"
+    r"(?:\s+(?P<status>all|pending|open|in\s+progress|completed|done|cancelled|paused|on\s+hold))?"
+    r"(?:\s+(?:tasks|todos|to-dos|items))?$", re.I
+)
+_COMPLETE = re.compile(
+    r"^(?:complete|finish|done|mark|check\s+off)\s+(?:task\s+)?(?P<target>.+?)"
+    r"(?:\s+(?:as\s+)?(?:done|complete|completed|finished))?$", re.I
+)
+_SEARCH = re.compile(
+    r"^(?:search(?:\s+for)?|find\s+(?:tasks?|todos?)(?:\s+(?:about|with|matching|for))?)\s+(?P<query>.+)$", re.I
+)
+
+_PRIORITY_PHRASE = re.compile(
+    rf"(?:,\s*|\s+|^)(?:(?:with\s+)?(?P<a>{_PRIORITY})\s+priority|priority\s*[:=]?\s*(?P<b>{_PRIORITY}))\b", re.I
+)
+_RECURRENCE_PHRASE = re.compile(
+    r"(?:,\s*|\s+|^)(?P<rule>every\s+(?:other\s+)?(?:\d+\s+)?[a-z]+(?:\s*(?:,|and)\s*[a-z]+day)*"
+    r"|daily|weekly|monthly|yearly|annually|biweekly|fortnightly|on\s+weekdays|weekdays)\b", re.I
+)
+_TIME = r"(?:at\s+)?\d{1,2}(?::\d{2})?\s*(?:am|pm)|at\s+\d{1,2}(?::\d{2})?"
+_DATE_PHRASE = re.compile(
+    r"(?:,\s*|\s+|^)(?:due\s+|on\s+|by\s+)?"
+    r"(?P<day>today|tonight|tomorrow|(?:next\s+|this\s+)?(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+    r"|in\s+\d+\s+(?:day|week)s?|\d{4}-\d{2}-\d{2})"
+    rf"(?:\s+(?P<time>{_TIME}))?\b", re.I
+)
+_DUE_PHRASE = re.compile(
+    r"(?:,\s*|\s+)(?:due|by|on)\s+"
+    r"(?P<when>[a-z]{3,9}\.?\s+\d{1,2}(?:st|nd|rd|th)?(?:,?\s+\d{4})?|\d{1,2}/\d{1,2}(?:/\d{2,4})?)"
+    rf"(?:\s+(?P<time>{_TIME}))?$", re.I
+)
+_TRAILING_TIME = re.compile(rf"\s+(?P<time>{_TIME})$", re.I)
+
+_STATUS_WORDS = {
+    "pending": TaskStatus.PENDING, "open": TaskStatus.PENDING, "in progress": TaskStatus.IN_PROGRESS,
+    "completed": TaskStatus.COMPLETED, "done": TaskStatus.COMPLETED, "cancelled": TaskStatus.CANCELLED,
+    "paused": TaskStatus.PAUSED, "on hold": TaskStatus.ON_HOLD,
+}
+
+def _apply_time(day: datetime, text: Optional[str]) -> Optional[datetime]:
+    if not text:
+        return day
+    try:
+        moment = parse_date(re.sub(r"^at\s+", "", text, flags=re.I), default=day)
+    except (ParserError, ValueError, OverflowError):
+        return None
+    # A bare "at 5" means the afternoon for a todo
+    if not re.search(r"am|pm|:", text, re.I) and moment.hour < 7:
+        moment += timedelta(hours=12)
+    return moment
+
+def _relative_day(phrase: str, today: datetime) -> Optional[datetime]:
+    phrase = re.sub(r"\s+", " ", phrase)
+    if phrase in ("today", "tonight"):
+        return today
+    if phrase == "tomorrow":
+        return today + timedelta(days=1)
+    match = re.match(r"in (\d+) (day|week)s?", phrase)
+    if match:
+        return today + timedelta(days=int(match.group(1)) * (7 if match.group(2) == "week" else 1))
+    match = re.match(r"(next |this )?(\w+day)$", phrase)
+    if match and match.group(2) in _WEEKDAYS:
+        # The coming occurrence; "next" skips one found within the next two days
+        day = today + relativedelta(days=1, weekday=_WEEKDAYS[match.group(2)](+1))
+        if match.group(1) == "next " and (day - today).days <= 2:
+            day += timedelta(days=7)
+        return day
+    try:
+        return datetime.strptime(phrase, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+def _parse_add(rest: str, now: datetime) -> Optional[Intent]:
+    args: Dict[str, Any] = {}
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    match = _PRIORITY_PHRASE.search(rest)
+    if match:
+        args["priority"] = TaskPriority((match.group("a") or match.group("b")).lower())
+        rest = rest[:match.start()] + rest[match.end():]
+
+    match = _RECURRENCE_PHRASE.search(rest)
+    if match:
+        rule = re.sub(r"^on\s+", "", match.group("rule").lower())
+        if recurrence.compile_rule(rule) is None:
+            return None
+        args["recurrence_rule"] = rule
+        rest = rest[:match.start()] + rest[match.end():]
+
+    match = _DATE_PHRASE.search(rest) or _DUE_PHRASE.search(rest)
+    if match:
+        if "day" in match.groupdict():
+            day = _relative_day(match.group("day").lower(), today)
+        else:
+            try:
+                day = parse_date(match.group("when"), default=today)
+            except (ParserError, ValueError, OverflowError):
+                return None
+        due = _apply_time(day, match.group("time")) if day else None
+        if due is None:
+            return None
+        if (match.groupdict().get("day") or "").lower() == "tonight" and not match.group("time"):
+            due = due.replace(hour=20)
+        args["due_date"] = due
+        rest = rest[:match.start()] + rest[match.end():]
+    else:
+        match = _TRAILING_TIME.search(rest)
+        if match:
+            args["due_date"] = _apply_time(today, match.group("time"))
+            if args["due_date"] is None:
+                return None
+            rest = rest[:match.start()]
+
+    if "recurrence_rule" in args and "due_date" in args:
+        # "every friday at 3pm": the first occurrence from the given day and time
+        args["due_date"] = recurrence.first_on_or_after(args["recurrence_rule"], args["due_date"], now)
+
+    title = re.sub(r"\s+", " ", rest).strip(" ,.;:-")
+    title = re.sub(r"\s+(?:on|by|due|at|for|with|and)$", "", title, flags=re.I)
+    if not title:
+        return None
+    args["title"] = title
+    return Intent("create", args)
+
+def parse(message: str, now: Optional[datetime] = None) -> Optional[Intent]:
+    """Classify a chat message; None when it should go to the model."""
+    text = re.sub(r"\s+", " ", message.strip()).rstrip(".!?")
+    if not text or "?" in text:
+        return None
+
+    match = _LIST.match(text)
+    if match:
+        status = (match.group("status") or "all").lower()
+        return Intent("list", {"status": None if status == "all" else _STATUS_WORDS[re.sub(r"\s+", " ", status)]})
+    if text.lower() in ("what do i have to do", "what's on my list", "what is on my list", "my tasks", "todo list"):
+        return Intent("list", {"status": TaskStatus.PENDING})
+
+    match = _COMPLETE.match(text)
+    if match:
+        return Intent("complete", {"target": match.group("target").strip(" '\"")})
+
+    match = _SEARCH.match(text)
+    if match:
+        return Intent("search", {"query": match.group("query").strip(" '\"")})
+
+    match = _ADD.match(text)
+    if match:
+        return _parse_add(match.group("rest"), now or datetime.utcnow())
+    return None
+
+# --- Execution ---
+
+def _describe(task: Task) -> str:
+    return "- " + task_line(task)
+
+def _describe_all(tasks: List[Task], empty: str) -> str:
+    if not tasks:
+        return empty
+    lines = [_describe(task) for task in tasks[:LIST_LIMIT]]
+    if len(tasks) > LIST_LIMIT:
+        lines.append(f"...and more; showing the first {LIST_LIMIT}.")
+    return "\n".join(lines)
+
+def _resolve(session: Session, target: str) -> Optional[Task]:
+    """A task by id or short id, or by title when exactly one open task has it."""
+    if re.fullmatch(_ID_REF, target, re.I):
+        task_id = TodoSkills.resolve_task_id(session, target, min_length=SHORT_ID_LENGTH)
+        if task_id is not None:
+            return session.get(Task, task_id)
+    matches = session.exec(
+        select(Task).where(
+            func.lower(Task.title) == target.lower(),
+            col(Task.status).in_(stats.OPEN_STATUSES)
+        ).limit(2)
+    ).all()
+    return matches[0] if len(matches) == 1 else None
+
+def execute(session: Session, intent: Intent) -> Optional[str]:
+    """Run an intent; None when it turns out to be ambiguous after all."""
+    args = intent.args
+    if intent.name == "create":
+        task = TodoSkills.create_task(session, TaskCreate(**args))
+        return "Added:\n" + _describe(task)
+    if intent.name == "list":
+        tasks = TodoSkills.list_tasks(session, status=args["status"], limit=LIST_LIMIT + 1)
+        return _describe_all(tasks, "No tasks found.")
+    if intent.name == "search":
+        tasks = TodoSkills.search_tasks(session, args["query"], limit=LIST_LIMIT + 1)
+        return _describe_all(tasks, "No matching tasks found.")
+    if intent.name == "complete":
+        task = _resolve(session, args["target"])
+        if task is None:
+            return None
+        task = TodoSkills.complete_task(session, task.id)
+        return "Completed:\n" + _describe(task)
+    return None
+
+# --- Metrics ---
+
+class FastPathStats:
+    def __init__(self, window: int = 1000):
+        self.messages = 0
+        self.hits = 0
+        self.by_intent: Counter = Counter()
+        # Latencies (ms) of recent fast-path replies
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, intent: Optional[Intent], handled: bool, elapsed: float) -> None:
+        with self._lock:
+            self.messages += 1
+            if handled:
+                self.hits += 1
+                self.by_intent[intent.name] += 1
+                self._latencies.append(elapsed * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "messages": self.messages,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.messages, 4) if self.messages else 0.0,
+                "by_intent": dict(self.by_intent),
+                "p50_ms": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                "p95_ms": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+            }
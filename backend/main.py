@@ -1,18 +1,36 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session
-from typing import List, Optional
-from .database import create_db_and_tables, get_session
-from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority
-from . import crud
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from .database import create_db_and_tables, get_session, get_async_session, pool_stats, async_engine
+from .async_skills import AsyncTodoSkills
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority, TaskSearchHit, BulkItemResult, BulkIds, ImportResult, TaskStats, TaskChangeFeed
+from . import crud, export, importer, serialization
 from contextlib import asynccontextmanager
+import hashlib
 from pydantic import BaseModel
-from .agent import TodoAgent
+from .agent import AgentRuntime, get_agent_runtime
+from .cache import task_cache
+from .reminders import reminder_scheduler
+from .changes import change_feed
+from .events import SSE_HEADERS, format_sse, parse_last_event_id
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    reminder_scheduler.start(lambda: AsyncSession(async_engine, expire_on_commit=False))
+
+    async def compact_changes(before: datetime) -> int:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            return await AsyncTodoSkills.compact_changes(session, before)
+
+    change_feed.start(compact_changes)
     yield
+    await change_feed.stop()
+    await reminder_scheduler.stop()
 
 app = FastAPI(lifespan=lifespan, title="Hackathon Todo API", version="2.0.0")
 
@@ -23,14 +41,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+async def read_through(key: str, load):
+    """
+    Serve `key` from the task cache, or run `load` and cache its JSON payload.
+    Keys carry the database version they were read at (collection_version or
+    a task's updated_at), so writes from other processes, which cannot bump
+    this process's cache generation, still make old entries unreachable.
+    """
+    value = task_cache.get(key)
+    if value is None:
+        value = await load()
+        if value is not None:
+            task_cache.set(key, value)
+    return value
+
+def make_etag(*parts) -> str:
+    """Strong ETag derived from the given version parts."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
 @app.post("/tasks", response_model=Task)
-def create_task(task: TaskCreate, session: Session = Depends(get_session)):
-    return crud.create_task(session, task)
+async def create_task(task: TaskCreate, session: AsyncSession = Depends(get_async_session)):
+    return await AsyncTodoSkills.create_task(session, task)
 
 @app.get("/tasks", response_model=List[Task])
-def list_tasks(
+async def list_tasks(
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
     tags: Optional[str] = None,
@@ -39,49 +87,270 @@ def list_tasks(
     sort_order: str = "asc",
     offset: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = None,
+    tag_mode: str = "any",
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return; id is always included"),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
+):
+    # Rows come back as plain dicts of only the selected columns and are
+    # encoded once; the encoded body is what gets cached
+    async def load():
+        try:
+            rows = await AsyncTodoSkills.list_task_rows(
+                session, fields, status, priority, tags, category, sort_by, sort_order, offset, limit, cursor,
+                tag_mode, due_after, due_before
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # A full page means there may be more; hand back the keyset cursor for it
+        next_cursor = None
+        if rows and len(rows) == limit:
+            next_cursor = crud.encode_cursor(rows[-1], sort_by, sort_order)
+        return {"body": serialization.dumps(rows), "next_cursor": next_cursor}
+
+    params = dict(
+        status=status, priority=priority, tags=tags, category=category,
+        sort_by=sort_by, sort_order=sort_order, offset=offset, limit=limit, cursor=cursor,
+        tag_mode=tag_mode, due_after=due_after, due_before=due_before, fields=fields
+    )
+    # Read the version before the rows, so a concurrent write can only make
+    # the ETag older than the data (forcing a refetch), never newer
+    version = await AsyncTodoSkills.collection_version(session)
+    etag = make_etag("tasks", version, task_cache.query_key("tasks", 0, **params))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    page = await read_through(task_cache.query_key("tasks", version, **params), load)
+    headers = {"ETag": etag}
+    if page["next_cursor"]:
+        headers["X-Next-Cursor"] = page["next_cursor"]
+    return serialization.json_response(page["body"], headers)
+
+# Stats, changes, export, import, recurrence and bulk routes are declared before
+# /tasks/{task_id} so those names are not read as ids
+@app.get("/tasks/stats", response_model=TaskStats)
+async def task_stats(session: AsyncSession = Depends(get_async_session)):
+    return await AsyncTodoSkills.get_stats(session)
+
+@app.get("/tasks/changes", response_model=TaskChangeFeed)
+async def task_changes(
+    since: Optional[int] = Query(None, ge=0, description="Feed position from a previous response's `next`"),
+    limit: int = Query(500, ge=1, le=5000),
+    timeout: float = Query(25.0, ge=0, le=60, description="Seconds to wait for changes (long-poll)"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Changes after `since`; waits up to `timeout` seconds when there are none yet."""
+    async def load(position: Optional[int]) -> TaskChangeFeed:
+        feed = await AsyncTodoSkills.list_changes(session, position, limit)
+        # End the read transaction: the next poll must see newer commits, and
+        # the connection goes back to the pool while this request waits
+        await session.commit()
+        return feed
+
+    return await change_feed.long_poll(load, since, timeout)
+
+@app.get("/tasks/changes/stream")
+async def task_change_stream(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """SSE version of /tasks/changes; a reconnecting EventSource resumes from Last-Event-ID."""
+    async def load(position: Optional[int]) -> TaskChangeFeed:
+        feed = await AsyncTodoSkills.list_changes(session, position)
+        await session.commit()
+        return feed
+
+    resume = parse_last_event_id(last_event_id)
+    return StreamingResponse(
+        change_feed.stream(load, resume if resume is not None else since, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@app.get("/tasks/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    tags: Optional[str] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: str = "asc",
+    tag_mode: str = "any",
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_async_session)
 ):
-    return crud.list_tasks(
-        session, status, priority, tags, category, sort_by, sort_order, offset, limit
+    # Build the query up front so bad parameters fail before streaming starts
+    try:
+        statement = AsyncTodoSkills.export_statement(
+            status, priority, tags, category, sort_by, sort_order, tag_mode, due_after, due_before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        export.encode(AsyncTodoSkills.export_rows(session, statement), format),
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
     )
 
+@app.post("/tasks/import", response_model=ImportResult)
+async def import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Streamed NDJSON or CSV body; the format defaults from the Content-Type."""
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    return await importer.import_tasks(session, request.stream(), format)
+
+MAX_BULK_ITEMS = 10000
+
+@app.post("/tasks/recurrence/materialize")
+async def materialize_occurrences(
+    horizon_days: int = Query(30, ge=1, le=366),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Create the occurrences of all recurring tasks due within the horizon."""
+    until = datetime.utcnow() + timedelta(days=horizon_days)
+    return {"created": await AsyncTodoSkills.materialize_occurrences(session, until)}
+
+@app.post("/tasks/recurrence/advance")
+async def advance_overdue_recurring(session: AsyncSession = Depends(get_async_session)):
+    """Move overdue recurring tasks to their next occurrence."""
+    return {"advanced": await AsyncTodoSkills.advance_overdue_recurring(session)}
+
+def check_bulk_size(count: int):
+    if count > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per bulk request")
+
+@app.post("/tasks/bulk", response_model=List[BulkItemResult])
+async def bulk_create_tasks(items: List[Dict[str, Any]], session: AsyncSession = Depends(get_async_session)):
+    check_bulk_size(len(items))
+    return await AsyncTodoSkills.bulk_create_tasks(session, items)
+
+@app.patch("/tasks/bulk", response_model=List[BulkItemResult])
+async def bulk_update_tasks(items: List[Dict[str, Any]], session: AsyncSession = Depends(get_async_session)):
+    check_bulk_size(len(items))
+    return await AsyncTodoSkills.bulk_update_tasks(session, items)
+
+@app.post("/tasks/bulk/complete", response_model=List[BulkItemResult])
+async def bulk_complete_tasks(request: BulkIds, session: AsyncSession = Depends(get_async_session)):
+    check_bulk_size(len(request.ids))
+    return await AsyncTodoSkills.bulk_complete_tasks(session, request.ids)
+
+@app.delete("/tasks/bulk", response_model=List[BulkItemResult])
+async def bulk_delete_tasks(request: BulkIds, session: AsyncSession = Depends(get_async_session)):
+    check_bulk_size(len(request.ids))
+    return await AsyncTodoSkills.bulk_delete_tasks(session, request.ids)
+
 @app.get("/tasks/{task_id}", response_model=Task)
-def get_task(task_id: str, session: Session = Depends(get_session)):
-    task = crud.get_task(session, task_id)
-    if not task:
+async def get_task(
+    task_id: str,
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
+):
+    # updated_at, read without loading the row, is both the ETag and the
+    # version the cached copy must match
+    updated_at = await AsyncTodoSkills.task_version(session, task_id)
+    if updated_at is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    etag = make_etag("task", task_id, jsonable_encoder(updated_at))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def load():
+        task = await AsyncTodoSkills.get_task(session, task_id)
+        # Encoded once and cached as the response body, so hits skip the
+        # response_model pass
+        return {"etag": etag, "body": serialization.dumps(task.model_dump())} if task else None
+
+    key = task_cache.task_key(task_id)
+    cached = task_cache.get(key)
+    if cached is None or cached["etag"] != etag:
+        cached = await load()
+        if cached is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        task_cache.set(key, cached)
+    return serialization.json_response(cached["body"], {"ETag": etag})
 
 @app.patch("/tasks/{task_id}", response_model=Task)
-def update_task(task_id: str, task_update: TaskUpdate, session: Session = Depends(get_session)):
-    task = crud.update_task(session, task_id, task_update)
+async def update_task(task_id: str, task_update: TaskUpdate, session: AsyncSession = Depends(get_async_session)):
+    task = await AsyncTodoSkills.update_task(session, task_id, task_update)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @app.delete("/tasks/{task_id}")
-def delete_task(task_id: str, session: Session = Depends(get_session)):
-    success = crud.delete_task(session, task_id)
+async def delete_task(task_id: str, session: AsyncSession = Depends(get_async_session)):
+    success = await AsyncTodoSkills.delete_task(session, task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"ok": True}
 
 @app.post("/tasks/{task_id}/complete", response_model=Task)
-def complete_task(task_id: str, session: Session = Depends(get_session)):
-    task = crud.complete_task(session, task_id)
+async def complete_task(task_id: str, session: AsyncSession = Depends(get_async_session)):
+    task = await AsyncTodoSkills.complete_task(session, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
-@app.get("/search", response_model=List[Task])
-def search_tasks(query: str, session: Session = Depends(get_session)):
-    return crud.search_tasks(session, query)
+@app.get("/search", response_model=List[TaskSearchHit])
+async def search_tasks(
+    query: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session)
+):
+    async def load():
+        hits = await AsyncTodoSkills.search_task_hits(session, query, offset, limit)
+        return serialization.dumps([hit.model_dump() for hit in hits])
+
+    version = await AsyncTodoSkills.collection_version(session)
+    key = task_cache.query_key("search", version, query=query, offset=offset, limit=limit)
+    return serialization.json_response(await read_through(key, load))
+
+@app.get("/reminders/stream")
+async def reminder_stream(request: Request, last_event_id: Optional[str] = Header(None)):
+    """Server-sent `reminder` events as reminders come due; replaces client polling."""
+    return StreamingResponse(
+        reminder_scheduler.hub.stream(parse_last_event_id(last_event_id), is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@app.get("/metrics")
+def metrics():
+    return {"pool": pool_stats(), "cache": task_cache.stats(), "reminders": reminder_scheduler.stats(),
+            "changes": change_feed.stats(), "agent": get_agent_runtime().stats()}
 
 class ChatRequest(BaseModel):
     message: str
+    # Returned by the previous reply; omit to start a new conversation
+    conversation_id: Optional[str] = None
 
 @app.post("/chat")
-def chat_agent(request: ChatRequest, session: Session = Depends(get_session)):
-    agent = TodoAgent(session)
-    response = agent.process_message(request.message)
-    return {"response": response}
+async def chat_agent(
+    request: ChatRequest,
+    session: AsyncSession = Depends(get_async_session),
+    runtime: AgentRuntime = Depends(get_agent_runtime)
+):
+    reply = await runtime.process_message(session, request.message, request.conversation_id)
+    return {"response": reply.response, "conversation_id": reply.conversation_id}
+
+@app.post("/chat/stream")
+async def chat_agent_stream(
+    request: ChatRequest,
+    session: AsyncSession = Depends(get_async_session),
+    runtime: AgentRuntime = Depends(get_agent_runtime)
+):
+    """SSE: `conversation`, then `text` deltas and `tool_call` / `tool_result` progress, then `done`."""
+    events = runtime.stream(session, request.message, request.conversation_id)
+    body = (format_sse(event, data) async for event, data in events)
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from mcp import ClientSession
+
+# Load test for the MCP server's HTTP transports.
+# N simulated clients each open their own MCP session and run a mix of
+# create / list / search / update calls against one server process:
+#   python -m backend.mcp_load --spawn --clients 50 --calls 20
+#   python -m backend.mcp_load --url http://127.0.0.1:8001/mcp --clients 50
+# --spawn starts `backend.mcp_server` on a free local port for the run,
+# against whatever DATABASE_URL is set.
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"MCP server did not start on port {port}")
+            await asyncio.sleep(0.1)
+
+def _connect(url: str, transport: str):
+    if transport == "sse":
+        from mcp.client.sse import sse_client
+        return sse_client(url)
+    from mcp.client.streamable_http import streamablehttp_client
+    return streamablehttp_client(url)
+
+async def _client(url: str, transport: str, number: int, calls: int, latencies: Dict[str, List[float]]) -> int:
+    errors = 0
+    async with _connect(url, transport) as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            task_id: Optional[str] = None
+            for call in range(calls):
+                step = call % 4
+                if step == 0:
+                    name, arguments = "create_todo", {"title": f"Load client {number} task {call}"}
+                elif step == 1:
+                    name, arguments = "list_todos", {"limit": 20}
+                elif step == 2:
+                    name, arguments = "search_todos", {"query": f"client {number}", "limit": 20}
+                else:
+                    name, arguments = "update_todo", {"task_id": task_id or "missing", "priority": "high"}
+                start = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                latencies.setdefault(name, []).append(time.perf_counter() - start)
+                errors += bool(result.isError)
+                if name == "create_todo" and not result.isError:
+                    task_id = result.structuredContent.get("id") if result.structuredContent else None
+    return errors
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run(url: str, transport: str, clients: int, calls: int) -> Dict[str, object]:
+    latencies: Dict[str, List[float]] = {}
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(_client(url, transport, n, calls, latencies) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    every = [value for values in latencies.values() for value in values]
+    return {
+        "clients": clients,
+        "calls": len(every),
+        "errors": sum(errors),
+        "seconds": round(elapsed, 2),
+        "calls_per_second": round(len(every) / elapsed, 1),
+        "p50_ms": round(statistics.median(every) * 1000, 1),
+        "p95_ms": round(_percentile(every, 0.95) * 1000, 1),
+        "by_tool_p95_ms": {name: round(_percentile(values, 0.95) * 1000, 1) for name, values in sorted(latencies.items())},
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive N concurrent MCP clients against one server.")
+    parser.add_argument("--url", help="server endpoint; defaults to the spawned server")
+    parser.add_argument("--transport", choices=("streamable-http", "sse"), default="streamable-http")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=20, help="tool calls per client")
+    parser.add_argument("--spawn", action="store_true", help="start a local server for the run")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.spawn:
+        # The spawned server expects the schema in place, as it does in production
+        os.environ.setdefault("DB_PROFILE", "test")
+        from .database import create_db_and_tables
+        create_db_and_tables()
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "backend.mcp_server", "--transport", args.transport, "--port", str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        asyncio.run(_wait_for_port(port))
+        url = url or f"http://127.0.0.1:{port}/{'sse' if args.transport == 'sse' else 'mcp'}"
+    if not url:
+        parser.error("pass --url or --spawn")
+    try:
+        report = asyncio.run(run(url, args.transport, args.clients, args.calls))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,92 @@
+import argparse
+import os
 from mcp.server.fastmcp import FastMCP
-from .database import get_session
-from .models import TaskCreate, TaskUpdate, TaskStatus, TaskPriority
-from .skills import TodoSkills
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from . import mcp_tools
 
-# Create an MCP server
-mcp = FastMCP("Hackathon Todo Server")
+# Create an MCP server.
+# stdio (the default) serves one client per process. The "streamable-http"
+# and "sse" transports serve many clients from one process, with their tool
+# calls running concurrently on the event loop:
+#   python -m backend.mcp_server --transport streamable-http --port 8001
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+mcp = FastMCP(
+    "Hackathon Todo Server",
+    host=os.getenv("MCP_HOST", "127.0.0.1"),
+    port=int(os.getenv("MCP_PORT", "8001")),
+)
 
 @mcp.tool()
-def list_todos(status: str = None, priority: str = None, category: str = None):
+async def list_todos(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = mcp_tools.PAGE_SIZE
+):
     """
-    List tasks from the todo list with optional filters.
+    List tasks from the todo list with optional filters, newest first.
+    Returns up to `limit` todos (capped at 200) and a `next_cursor`; pass it
+    back as `cursor` to get the next page. `next_cursor` is null on the last page.
     """
-    with next(get_session()) as session:
-        tasks = TodoSkills.list_tasks(
-            session, 
-            status=TaskStatus(status) if status else None,
-            priority=TaskPriority(priority) if priority else None,
-            category=category
-        )
-        return [{"id": t.id, "title": t.title, "status": t.status, "priority": t.priority, "due_date": str(t.due_date) if t.due_date else None} for t in tasks]
+    return await mcp_tools.list_todos(status, priority, category, cursor, limit)
 
 @mcp.tool()
-def create_todo(title: str, description: str = None, priority: str = "medium", category: str = None, recurrence: str = None, due_date: str = None):
+async def create_todo(title: str, description: str = None, priority: str = "medium", category: str = None, recurrence: str = None, due_date: str = None):
     """
     Create a new task in the todo list.
     """
-    with next(get_session()) as session:
-        parsed_due = None
-        if due_date:
-            try:
-                parsed_due = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
-            except:
-                pass
+    return await mcp_tools.create_todo(title, description, priority, category, recurrence, due_date)
 
-        task_data = TaskCreate(
-            title=title,
-            description=description,
-            priority=TaskPriority(priority),
-            category=category,
-            recurrence_rule=recurrence,
-            due_date=parsed_due
-        )
-        task = TodoSkills.create_task(session, task_data)
-        return {"id": task.id, "title": task.title, "status": task.status}
+@mcp.tool()
+async def create_todos(todos: List[Dict[str, Any]]):
+    """
+    Create many tasks in one call. Each item takes the create_todo fields
+    (title, description, priority, category, recurrence, due_date).
+    Returns one {index, id, ok, error} result per item, in order.
+    """
+    return await mcp_tools.create_todos(todos)
 
 @mcp.tool()
-def update_todo(task_id: str, status: str = None, priority: str = None, title: str = None):
+async def update_todo(task_id: str, status: str = None, priority: str = None, title: str = None):
     """
     Update an existing task's status or priority.
     """
-    with next(get_session()) as session:
-        update_data = {}
-        if status: update_data["status"] = TaskStatus(status)
-        if priority: update_data["priority"] = TaskPriority(priority)
-        if title: update_data["title"] = title
-        
-        task = TodoSkills.update_task(session, task_id, TaskUpdate(**update_data))
-        if task:
-            return {"id": task.id, "title": task.title, "status": task.status}
-        return "Task not found"
+    return await mcp_tools.update_todo(task_id, status, priority, title)
 
 @mcp.tool()
-def search_todos(query: str):
+async def update_todos(updates: List[Dict[str, Any]]):
     """
-    Search for tasks using a keyword.
+    Update many tasks in one call. Each item is {task_id, status?, priority?, title?}.
+    Returns one {index, id, ok, error} result per item, in order.
+    """
+    return await mcp_tools.update_todos(updates)
+
+@mcp.tool()
+async def complete_todos(task_ids: List[str]):
     """
-    with next(get_session()) as session:
-        tasks = TodoSkills.search_tasks(session, query)
-        return [{"id": t.id, "title": t.title, "status": t.status} for t in tasks]
+    Mark many tasks completed in one call; recurring tasks get their next occurrence.
+    Returns one {index, id, ok, error} result per id, in order.
+    """
+    return await mcp_tools.complete_todos(task_ids)
+
+@mcp.tool()
+async def search_todos(query: str, cursor: Optional[str] = None, limit: int = mcp_tools.PAGE_SIZE):
+    """
+    Search for tasks using a keyword, best match first.
+    Returns up to `limit` todos (capped at 200) and a `next_cursor` for the next page.
+    """
+    return await mcp_tools.search_todos(query, cursor, limit)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the todo tools over MCP.")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=os.getenv("MCP_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=mcp.settings.host)
+    parser.add_argument("--port", type=int, default=mcp.settings.port)
+    args = parser.parse_args(argv)
+    mcp.settings.host, mcp.settings.port = args.host, args.port
+    mcp.run(transport=args.transport)
 
 if __name__ == "__main__":
-    mcp.run()
+    main()
@@ -0,0 +1,226 @@
+import base64
+import json
+import os
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .models import TaskCreate, TaskUpdate, TaskStatus, TaskPriority, BulkItemResult
+from .async_skills import AsyncTodoSkills
+from .skills import TodoSkills
+
+# Tool bodies for the MCP server; backend/mcp_server.py registers them.
+# MCP clients issue long runs of small calls, so every call borrows an async
+# session from one pooled engine owned by the server process. Over the HTTP
+# transports many clients share that process, and awaiting the database lets
+# their calls interleave instead of queueing behind each other. List results
+# are capped and keyset paged, and the batch tools write many tasks in one
+# transaction through the TodoSkills bulk methods.
+
+# Defaults to the quiet, pooled "prod" profile: SQL echo would go to stdout,
+# which is the stdio transport's channel.
+MCP_DB_PROFILE = os.getenv("MCP_DB_PROFILE", "prod")
+PAGE_SIZE = int(os.getenv("MCP_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MCP_MAX_PAGE_SIZE", "200"))
+MAX_BATCH_ITEMS = int(os.getenv("MCP_MAX_BATCH_ITEMS", "500"))
+LIST_FIELDS = "id,title,status,priority,due_date"
+
+class SessionScope:
+    """One async session per tool call, over an engine built once for the process."""
+
+    def __init__(self, profile: str = MCP_DB_PROFILE):
+        self.profile = profile
+        self._engine = None
+        self._lock = threading.Lock()
+        # asyncio locks belong to one event loop, so keep one per loop
+        self._write_locks = weakref.WeakKeyDictionary()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    from .database import DATABASE_URL, build_async_engine
+                    self._engine = build_async_engine(DATABASE_URL, self.profile)
+        return self._engine
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+
+    def use(self, engine) -> None:
+        """Serve sessions from the async `engine` instead, e.g. a test database."""
+        self._engine = engine
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        # Closing the session rolls back anything uncommitted and returns the connection to the pool
+        async with AsyncSession(self.engine, expire_on_commit=False) as session:
+            yield session
+
+    @asynccontextmanager
+    async def write_session(self) -> AsyncIterator[AsyncSession]:
+        """
+        A session for calls that write. SQLite allows one writer at a time, and
+        a transaction held across awaits keeps the lock while other calls sit in
+        SQLite's busy handler until they time out with "database is locked", so
+        SQLite writers queue here instead. Readers are never held up (WAL).
+        """
+        if self.engine.dialect.name != "sqlite":
+            async with self.session() as session:
+                yield session
+            return
+        loop = asyncio.get_running_loop()
+        lock = self._write_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            async with self.session() as session:
+                yield session
+
+scope = SessionScope()
+
+def _page_limit(limit: Optional[int]) -> int:
+    return max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+
+def _parse_due(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def _value(value: Any) -> Any:
+    if isinstance(value, (TaskStatus, TaskPriority)):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _todo(task: Any, fields: str = LIST_FIELDS) -> Dict[str, Any]:
+    get = task.get if isinstance(task, dict) else lambda name: getattr(task, name)
+    return {name: _value(get(name)) for name in fields.split(",")}
+
+def _encode_search_cursor(query: str, offset: int) -> str:
+    raw = json.dumps({"q": query, "o": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_search_cursor(cursor: str, query: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode()))
+        offset, matches = int(payload["o"]), payload["q"] == query
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not matches:
+        raise ValueError("Cursor belongs to a different query")
+    return max(offset, 0)
+
+def _check_batch(items: list) -> None:
+    if len(items) > MAX_BATCH_ITEMS:
+        raise ValueError(f"At most {MAX_BATCH_ITEMS} items per call")
+
+def _results(results: List[BulkItemResult]) -> List[Dict[str, Any]]:
+    return [result.dict(exclude_none=True) for result in results]
+
+async def list_todos(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = PAGE_SIZE
+) -> Dict[str, Any]:
+    limit = _page_limit(limit)
+    async with scope.session() as session:
+        # One extra row tells whether another page exists
+        rows = await AsyncTodoSkills.list_task_rows(
+            session,
+            fields=LIST_FIELDS,
+            status=TaskStatus(status) if status else None,
+            priority=TaskPriority(priority) if priority else None,
+            category=category,
+            limit=limit + 1,
+            cursor=cursor
+        )
+    page = rows[:limit]
+    next_cursor = TodoSkills.encode_cursor(page[-1]) if len(rows) > limit else None
+    return {"todos": [_todo(row) for row in page], "next_cursor": next_cursor}
+
+async def search_todos(query: str, cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Dict[str, Any]:
+    limit = _page_limit(limit)
+    offset = _decode_search_cursor(cursor, query) if cursor else 0
+    async with scope.session() as session:
+        tasks = await AsyncTodoSkills.search_tasks(session, query, offset, limit + 1)
+        todos = [_todo(task, "id,title,status") for task in tasks[:limit]]
+    next_cursor = _encode_search_cursor(query, offset + limit) if len(tasks) > limit else None
+    return {"todos": todos, "next_cursor": next_cursor}
+
+async def create_todo(
+    title: str,
+    description: Optional[str] = None,
+    priority: str = "medium",
+    category: Optional[str] = None,
+    recurrence: Optional[str] = None,
+    due_date: Optional[str] = None
+) -> Dict[str, Any]:
+    task_data = TaskCreate(
+        title=title,
+        description=description,
+        priority=TaskPriority(priority),
+        category=category,
+        recurrence_rule=recurrence,
+        due_date=_parse_due(due_date)
+    )
+    async with scope.write_session() as session:
+        task = await AsyncTodoSkills.create_task(session, task_data)
+        return _todo(task, "id,title,status")
+
+def _update_fields(status: Optional[str], priority: Optional[str], title: Optional[str]) -> Dict[str, Any]:
+    update_data = {}
+    if status:
+        update_data["status"] = TaskStatus(status)
+    if priority:
+        update_data["priority"] = TaskPriority(priority)
+    if title:
+        update_data["title"] = title
+    return update_data
+
+async def update_todo(task_id: str, status: Optional[str] = None, priority: Optional[str] = None, title: Optional[str] = None):
+    async with scope.write_session() as session:
+        task = await AsyncTodoSkills.update_task(session, task_id, TaskUpdate(**_update_fields(status, priority, title)))
+        if task:
+            return _todo(task, "id,title,status")
+    return "Task not found"
+
+async def create_todos(todos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _check_batch(todos)
+    items = []
+    for todo in todos:
+        item = dict(todo)
+        if "recurrence" in item:
+            item["recurrence_rule"] = item.pop("recurrence")
+        if isinstance(item.get("due_date"), str):
+            item["due_date"] = _parse_due(item["due_date"])
+        items.append(item)
+    async with scope.write_session() as session:
+        return _results(await AsyncTodoSkills.bulk_create_tasks(session, items))
+
+async def update_todos(updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _check_batch(updates)
+    # Values stay strings; TaskUpdate validation inside bulk_update_tasks
+    # reports a bad status or priority against that item only
+    items = [
+        dict(
+            {name: entry[name] for name in ("status", "priority", "title") if entry.get(name)},
+            id=entry.get("task_id") or entry.get("id")
+        )
+        for entry in updates
+    ]
+    async with scope.write_session() as session:
+        return _results(await AsyncTodoSkills.bulk_update_tasks(session, items))
+
+async def complete_todos(task_ids: List[str]) -> List[Dict[str, Any]]:
+    _check_batch(task_ids)
+    async with scope.write_session() as session:
+        return _results(await AsyncTodoSkills.bulk_complete_tasks(session, task_ids))
@@ -1,11 +1,32 @@
-from typing import Optional, List
-from sqlmodel import SQLModel, Field
+from typing import Optional, List, Dict, Any
+from sqlmodel import SQLModel, Field, Index, text
 from datetime import datetime
 from enum import Enum
 import uuid
 
 # Models need to match domain.yaml spec
 
+# Columns that list_tasks can sort (and therefore keyset-paginate) on.
+# Each one gets a (column, id) index on the task table.
+SORTABLE_FIELDS = (
+    "created_at", "updated_at", "due_date", "start_date", "reminder_at",
+    "title", "priority", "status", "category",
+)
+
+# Composite indexes for the filter + sort shapes list_tasks serves:
+# an equality filter followed by the sort key and id, so the rows come
+# out of the index already in list order.
+FILTER_SORT_INDEXES = (
+    ("status", "created_at", "id"),
+    ("status", "due_date", "id"),
+    ("status", "priority", "due_date", "id"),
+    ("priority", "created_at", "id"),
+    ("category", "created_at", "id"),
+    # Pending reminders (list_due_reminders). A partial index would be smaller,
+    # but SQLite cannot match its WHERE against a bound `status = ?` parameter.
+    ("status", "reminder_at", "id"),
+)
+
 class TaskStatus(str, Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -21,39 +42,74 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
 
 class TaskBase(SQLModel):
-    title: str = Field(min_length=1, max_length=500, index=True)
+    title: str = Field(min_length=1, max_length=500)
     description: Optional[str] = Field(default=None, max_length=5000)
-    status: TaskStatus = Field(default=TaskStatus.PENDING, index=True)
+    status: TaskStatus = Field(default=TaskStatus.PENDING)
     
     # Phase 2 Fields
     priority: Optional[TaskPriority] = Field(default=TaskPriority.MEDIUM)
-    category: Optional[str] = Field(default=None, index=True)
-    # Tags are stored as simple comma-separated string for simplicity in SQLite/Simple SQLModel, 
-    # or we could use specific relationship tables. For hackathon speed, string or JSON is often accepted,
-    # but let's try to be clean. Actually, specification says "tags: type: array". 
-    # SQLModel doesn't support List[str] natively in SQLite without JSON type. 
-    # We'll stick to JSON column if possible or just a separate table? 
-    # To keep it simple and perfectly "single table" aligned unless spec demands relational:
-    # "tags" is an array. We'll simulate it with a JSON string or a relationship. 
-    # Let's use a simple JSON field if utilizing Postgres, but for SQLite compatibility without complex setup, 
-    # we might define it as a string separated by commas in Python logic, or valid JSON string.
-    # Let's use JSON type from python standard lib serialization in Pydantic.
+    category: Optional[str] = Field(default=None)
+    # Tags keep their JSON-list-string shape in the API and in this column, which
+    # is what the frontend reads back. Filtering goes through the indexed
+    # TaskTag association table instead, kept in sync by TodoSkills.
     tags: Optional[str] = Field(default="[]", description="JSON list of tags") 
 
     due_date: Optional[datetime] = Field(default=None)
     start_date: Optional[datetime] = Field(default=None)
     
     # Phase 3 Fields
-    recurrence_rule: Optional[str] = Field(default=None, description="Natural language recurrence rule e.g. 'daily'")
+    recurrence_rule: Optional[str] = Field(default=None, description="Recurrence rule: natural language ('daily', 'every Friday', 'every 2 weeks') or an RRULE ('FREQ=WEEKLY;BYDAY=FR')")
     reminder_at: Optional[datetime] = Field(default=None)
     ai_summary: Optional[str] = Field(default=None, description="AI-generated summary")
 
 class Task(TaskBase, table=True):
+    # (sort key, id) indexes back keyset pagination in list_tasks
+    __table_args__ = (
+        *(Index(f"ix_task_{field}_id", field, "id") for field in SORTABLE_FIELDS),
+        *(Index("ix_task_" + "_".join(columns), *columns) for columns in FILTER_SORT_INDEXES),
+        # Recurring tasks in id order, for the recurrence batch jobs' keyset scan
+        Index(
+            "ix_task_recurring_id", "id",
+            sqlite_where=text("recurrence_rule IS NOT NULL"),
+            postgresql_where=text("recurrence_rule IS NOT NULL")
+        ),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = Field(default=None)
 
+class TaskTag(SQLModel, table=True):
+    """One row per (task, tag); the indexed source of truth for tag filters."""
+    __table_args__ = (Index("ix_tasktag_tag_task_id", "tag", "task_id"),)
+
+    task_id: str = Field(foreign_key="task.id", primary_key=True)
+    tag: str = Field(primary_key=True)
+
+class TaskListVersion(SQLModel, table=True):
+    """Single-row counter bumped in every task write transaction."""
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0)
+
+class TaskStat(SQLModel, table=True):
+    """Task counts per (dimension, key), e.g. ("status", "pending"); maintained by TodoSkills."""
+    dimension: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    count: int = Field(default=0)
+
+class TaskChange(SQLModel, table=True):
+    """Append-only change log: one row per task touched by a write, in commit order."""
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    task_id: str
+    changed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+class ReminderDelivery(SQLModel, table=True):
+    """One row per reminder fired; the key makes each (task, reminder time) fire once."""
+    task_id: str = Field(primary_key=True)
+    reminder_at: datetime = Field(primary_key=True)
+    delivered_at: datetime = Field(default_factory=datetime.utcnow)
+
 class TaskCreate(TaskBase):
     pass
 
@@ -69,3 +125,53 @@ class TaskUpdate(SQLModel):
     recurrence_rule: Optional[str] = None
     reminder_at: Optional[datetime] = None
     ai_summary: Optional[str] = None
+
+class TaskSearchHit(TaskBase):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+    snippet: Optional[str] = None
+    score: float = 0.0
+
+class BulkItemResult(SQLModel):
+    index: int
+    id: Optional[str] = None
+    ok: bool
+    error: Optional[str] = None
+
+class BulkIds(SQLModel):
+    ids: List[str]
+
+class ImportLineError(SQLModel):
+    line: int
+    error: str
+
+class ImportResult(SQLModel):
+    imported: int = 0
+    failed: int = 0
+    # Capped; `failed` has the full count
+    errors: List[ImportLineError] = Field(default_factory=list)
+
+class TaskStats(SQLModel):
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+    # Tasks without a priority are counted under "none"
+    by_priority: Dict[str, int] = Field(default_factory=dict)
+    by_category: Dict[str, int] = Field(default_factory=dict)
+    uncategorized: int = 0
+    overdue: int = 0
+
+class TaskChangeEntry(SQLModel):
+    seq: int
+    task_id: str
+    # "upsert" (task carries its current state) or "delete"
+    op: str
+    task: Optional[Dict[str, Any]] = None
+
+class TaskChangeFeed(SQLModel):
+    changes: List[TaskChangeEntry] = Field(default_factory=list)
+    # Pass back as `since` to continue after these changes
+    next: int = 0
+    # The client's `since` is older than the retained log: refetch everything
+    resync: bool = False
@@ -0,0 +1,92 @@
+"""
+Query-plan regression check for the list_tasks query shapes.
+
+Seeds a throwaway SQLite database, runs EXPLAIN QUERY PLAN for every supported
+shape and reports any that fall back to a full table scan or a temp B-tree sort.
+
+    python -m backend.query_plans [row_count]
+"""
+import sys
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlmodel import SQLModel, Session, create_engine, text
+from .models import Task, TaskStatus, TaskPriority, SORTABLE_FIELDS
+from .skills import TodoSkills
+
+WEEK_START = datetime(2025, 1, 6)
+
+# (name, list_tasks filters, sort_by, sort_order)
+SUPPORTED_QUERY_SHAPES = [
+    *((f"all by {field} {order}", {}, field, order) for field in SORTABLE_FIELDS for order in ("asc", "desc")),
+    ("pending, newest first", {"status": TaskStatus.PENDING}, None, "desc"),
+    ("pending by due date", {"status": TaskStatus.PENDING}, "due_date", "asc"),
+    ("pending due this week", {
+        "status": TaskStatus.PENDING,
+        "due_after": WEEK_START,
+        "due_before": WEEK_START + timedelta(days=7),
+    }, "due_date", "asc"),
+    ("pending high priority by due date", {"status": TaskStatus.PENDING, "priority": TaskPriority.HIGH}, "due_date", "asc"),
+    ("urgent, newest first", {"priority": TaskPriority.URGENT}, None, "desc"),
+    ("category, newest first", {"category": "work"}, None, "desc"),
+]
+
+def seed_tasks(session: Session, count: int = 2000) -> None:
+    rng = random.Random(42)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    for i in range(count):
+        due = WEEK_START + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.7 else None
+        session.add(Task(
+            title=f"Seed task {i}",
+            status=rng.choice(statuses),
+            priority=rng.choice(priorities),
+            category=rng.choice(["work", "home", "errands", None]),
+            due_date=due,
+            reminder_at=due - timedelta(hours=1) if due and rng.random() < 0.3 else None,
+        ))
+    session.commit()
+
+def explain(session: Session, statement) -> List[str]:
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in session.exec(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+def plan_problems(plan: List[str]) -> List[str]:
+    problems = []
+    for step in plan:
+        if step.startswith("SCAN task") and "INDEX" not in step:
+            problems.append(f"full scan: {step}")
+        if "TEMP B-TREE" in step:
+            problems.append(f"temp sort: {step}")
+    return problems
+
+def check_query_plans(session: Session) -> Dict[str, List[str]]:
+    """Map each failing shape name to its offending plan steps; empty when all pass."""
+    statements = {}
+    for name, filters, sort_by, sort_order in SUPPORTED_QUERY_SHAPES:
+        field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+        filters = dict(filters)
+        statements[name] = TodoSkills._list_statement(
+            filters.pop("status", None), filters.pop("priority", None), None,
+            filters.pop("category", None), field, descending, **filters
+        ).limit(100)
+    statements["due reminders"] = TodoSkills._due_reminders_statement(WEEK_START).limit(500)
+
+    failures = {}
+    for name, statement in statements.items():
+        problems = plan_problems(explain(session, statement))
+        if problems:
+            failures[name] = problems
+    return failures
+
+if __name__ == "__main__":
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed_tasks(session, int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+        session.exec(text("ANALYZE"))
+        failures = check_query_plans(session)
+    for name, problems in failures.items():
+        print(f"FAIL {name}: {'; '.join(problems)}")
+    print(f"{len(SUPPORTED_QUERY_SHAPES) + 1 - len(failures)} shapes ok, {len(failures)} failing")
+    sys.exit(1 if failures else 0)
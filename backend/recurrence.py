@@ -0,0 +1,174 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice, takewhile
+from typing import List, NamedTuple, Optional
+from dateutil.rrule import rrule, rrulestr, DAILY, WEEKLY, MONTHLY, YEARLY, MO, TU, WE, TH, FR, SA, SU
+
+# Recurrence rules for recurring tasks.
+# A task's recurrence_rule is either an RFC 5545 RRULE ("FREQ=WEEKLY;BYDAY=FR",
+# optionally prefixed with "RRULE:") or one of the natural-language forms the
+# agent writes ("daily", "every Friday", "every 2 weeks", "every other month",
+# "weekdays"). Rules are compiled once per distinct string into a dateutil
+# rrule template; each lookup re-anchors the template at the task's due date.
+# Daily and weekly rules repeat with a fixed period, so catching up a long
+# overdue series jumps whole periods instead of stepping through each one.
+
+# Placeholder start for templates; real anchors come from the task
+_TEMPLATE_START = datetime(2000, 1, 1)
+
+WEEKDAYS = {
+    "monday": MO, "mon": MO, "tuesday": TU, "tue": TU, "tues": TU,
+    "wednesday": WE, "wed": WE, "thursday": TH, "thu": TH, "thurs": TH,
+    "friday": FR, "fri": FR, "saturday": SA, "sat": SA, "sunday": SU, "sun": SU,
+}
+UNITS = {"day": DAILY, "week": WEEKLY, "month": MONTHLY, "year": YEARLY}
+ALIASES = {
+    "daily": (DAILY, 1), "weekly": (WEEKLY, 1), "monthly": (MONTHLY, 1),
+    "yearly": (YEARLY, 1), "annually": (YEARLY, 1),
+    "biweekly": (WEEKLY, 2), "fortnightly": (WEEKLY, 2),
+}
+
+_WEEKDAY = "|".join(sorted(WEEKDAYS, key=len, reverse=True))
+_EVERY_UNIT = re.compile(r"\bevery\s+(?:(other)\s+|(\d+)\s+)?(day|week|month|year)s?\b")
+_EVERY_WEEKDAYS = re.compile(
+    rf"\bevery\s+(other\s+)?((?:{_WEEKDAY})s?(?:\s*(?:,|and|&)\s*(?:{_WEEKDAY})s?)*)\b"
+)
+_WORKDAYS = re.compile(r"\b(?:every\s+)?week\s?days?\b")
+_WEEKENDS = re.compile(r"\b(?:every\s+)?weekends?\b")
+
+class CompiledRule(NamedTuple):
+    template: rrule
+    # Length of one full repetition, when it is fixed
+    period: Optional[timedelta]
+    # Natural month rules land on the month's last day when it is shorter
+    # than the anchor's ("monthly" from Jan 31 gives Feb 28, not Mar 31)
+    month_end: bool = False
+
+# Days in one repetition of an INTERVAL=1 rule, for the fixed-period frequencies
+PERIOD_DAYS = {DAILY: 1, WEEKLY: 7}
+FREQS = {"DAILY": DAILY, "WEEKLY": WEEKLY, "MONTHLY": MONTHLY, "YEARLY": YEARLY}
+
+def _compiled(template: rrule, freq: Optional[int], interval: int = 1, count: bool = False) -> CompiledRule:
+    # COUNT rules are not periodic from an arbitrary anchor, so they never jump
+    period = None
+    if not count and freq in PERIOD_DAYS:
+        period = timedelta(days=interval * PERIOD_DAYS[freq])
+    return CompiledRule(template, period)
+
+def _rule_parts(text: str) -> dict:
+    """NAME=value parts of the RRULE line in `text`, names upper-cased."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line.upper().startswith("RRULE:"):
+            line = line[len("RRULE:"):]
+        elif not line.upper().startswith("FREQ="):
+            continue
+        return {
+            name.strip().upper(): value.strip()
+            for name, _, value in (part.partition("=") for part in line.split(";") if part.strip())
+        }
+    return {}
+
+def _template(freq: int, interval: int = 1, byweekday=None) -> CompiledRule:
+    compiled = _compiled(rrule(freq, dtstart=_TEMPLATE_START, interval=interval, byweekday=byweekday), freq, interval)
+    return compiled._replace(month_end=freq == MONTHLY)
+
+def _parse_natural(text: str) -> Optional[CompiledRule]:
+    if _WORKDAYS.search(text):
+        return _template(WEEKLY, byweekday=(MO, TU, WE, TH, FR))
+    if _WEEKENDS.search(text):
+        return _template(WEEKLY, byweekday=(SA, SU))
+    match = _EVERY_WEEKDAYS.search(text)
+    if match:
+        names = re.findall(_WEEKDAY, match.group(2))
+        days = tuple(dict.fromkeys(WEEKDAYS[name] for name in names))
+        return _template(WEEKLY, 2 if match.group(1) else 1, days)
+    match = _EVERY_UNIT.search(text)
+    if match:
+        interval = 2 if match.group(1) else int(match.group(2) or 1)
+        return _template(UNITS[match.group(3)], max(interval, 1))
+    # Keyword anywhere, as the original substring matching did ("daily at 9am")
+    for word in re.findall(r"[a-z]+", text):
+        if word in ALIASES:
+            return _template(*ALIASES[word])
+    return None
+
+@lru_cache(maxsize=4096)
+def compile_rule(rule: str) -> Optional[CompiledRule]:
+    """The compiled form of `rule`, or None when it is not a recognised rule."""
+    text = rule.strip()
+    if not text:
+        return None
+    if re.match(r"(?i)^(rrule:|freq=)", text):
+        # dateutil accepts INTERVAL=0, whose series never advances: after()
+        # would loop forever
+        parts = _rule_parts(text)
+        interval = parts.get("INTERVAL", "1")
+        if not interval.isdigit() or int(interval) < 1:
+            return None
+        try:
+            template = rrulestr(text, dtstart=_TEMPLATE_START)
+        except Exception:
+            # rrulestr raises whatever its parsing hits (ValueError, KeyError,
+            # IndexError, ...); any of them just means "not a rule"
+            return None
+        # EXDATE/RDATE lines give an rruleset, which has no single series to
+        # re-anchor at a task's due date
+        if not isinstance(template, rrule):
+            return None
+        return _compiled(template, FREQS.get(parts.get("FREQ")), int(interval), "COUNT" in parts)
+    return _parse_natural(text.lower())
+
+def _anchored(rule: Optional[str], start: datetime, skip_to: Optional[datetime] = None) -> Optional[rrule]:
+    compiled = compile_rule(rule) if rule else None
+    if compiled is None:
+        return None
+    if skip_to is not None and compiled.period is not None and skip_to > start:
+        # Same series, started from the last whole period before `skip_to`
+        start += compiled.period * ((skip_to - start) // compiled.period)
+    if compiled.month_end and start.day > 28:
+        # The anchor's day where the month has it, else the month's last day
+        return compiled.template.replace(dtstart=start, bymonthday=(start.day, -1), bysetpos=1)
+    return compiled.template.replace(dtstart=start)
+
+def next_occurrence(rule: Optional[str], after: datetime) -> Optional[datetime]:
+    """The first occurrence strictly after `after`, counting from `after`."""
+    anchored = _anchored(rule, after)
+    return anchored.after(after) if anchored is not None else None
+
+def occurrences(rule: Optional[str], after: datetime, until: datetime, limit: int) -> List[datetime]:
+    """Up to `limit` occurrences in (after, until], counting from `after`."""
+    anchored = _anchored(rule, after)
+    if anchored is None:
+        return []
+    return list(islice(takewhile(lambda when: when <= until, anchored.xafter(after)), limit))
+
+def first_on_or_after(rule: Optional[str], start: datetime, moment: datetime) -> Optional[datetime]:
+    """The first occurrence of the series starting at `start` that is not before `moment`."""
+    anchored = _anchored(rule, start, skip_to=moment)
+    return anchored.after(moment, inc=True) if anchored is not None else None
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from datetime import timedelta
+    from sqlmodel import Session
+    from .database import engine, create_db_and_tables
+    from .skills import TodoSkills
+
+    # python -m backend.recurrence advance | materialize [horizon_days]
+    create_db_and_tables()
+    command = sys.argv[1] if len(sys.argv) > 1 else "advance"
+    start = time.perf_counter()
+    with Session(engine) as session:
+        if command == "materialize":
+            days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+            count = TodoSkills.materialize_occurrences(session, datetime.utcnow() + timedelta(days=days))
+            print(f"created {count} occurrences", end="")
+        elif command == "advance":
+            count = TodoSkills.advance_overdue_recurring(session)
+            print(f"advanced {count} overdue tasks", end="")
+        else:
+            sys.exit(f"unknown command {command!r}; expected 'advance' or 'materialize'")
+    print(f" in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,233 @@
+import asyncio
+import heapq
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, col, and_
+from .models import Task, TaskStatus, ReminderDelivery
+from .events import EventHub
+
+# Server-side reminder engine.
+# A min-heap of (reminder_at, task_id) for pending tasks is loaded at startup
+# and kept current by TodoSkills writes (see track). One asyncio task sleeps
+# until the earliest reminder, claims it by inserting a ReminderDelivery row
+# (primary key = task + reminder time, so a reminder fires once even with
+# several workers or restarts) and pushes it to SSE subscribers.
+# Writes from other processes (CLI, MCP server) are picked up by a periodic
+# reload of the heap. A failed round (e.g. "database is locked") is logged and
+# retried with backoff, reloading the heap first, so the loop never dies.
+
+logger = logging.getLogger(__name__)
+
+class ReminderScheduler:
+    def __init__(self, grace: float = 600.0, resync_interval: float = 300.0, retry_delay: float = 1.0):
+        # Reminders missed by at most `grace` seconds (e.g. during a restart) still fire
+        self.grace = timedelta(seconds=grace)
+        self.resync_interval = resync_interval
+        # First wait after a failed round; doubles per failure up to resync_interval
+        self.retry_delay = retry_delay
+        self.hub = EventHub()
+        self._heap: List[Tuple[datetime, str]] = []
+        # Live entry per task; heap entries that disagree with it are stale
+        self._scheduled: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+        self.errors = 0
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # --- Index ---
+
+    def schedule(self, task_id: str, when: Optional[datetime]) -> None:
+        """Set (or clear, with None) the reminder for a task."""
+        with self._lock:
+            if when is None:
+                self._scheduled.pop(task_id, None)
+                return
+            if self._scheduled.get(task_id) == when:
+                return
+            self._scheduled[task_id] = when
+            heapq.heappush(self._heap, (when, task_id))
+            earliest = self._heap[0][0] == when
+        if earliest:
+            self._wake()
+
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Tuple[str, datetime]]:
+        due = []
+        with self._lock:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= now:
+                when, task_id = heapq.heappop(self._heap)
+                del self._scheduled[task_id]
+                due.append((task_id, when))
+                self._drop_stale()
+        return due
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    # --- Database ---
+
+    def load(self, session: Session, now: Optional[datetime] = None) -> int:
+        """Rebuild the index from pending, undelivered reminders; returns how many."""
+        since = (now or datetime.utcnow()) - self.grace
+        delivered = and_(
+            ReminderDelivery.task_id == Task.id,
+            ReminderDelivery.reminder_at == Task.reminder_at
+        )
+        rows = session.exec(
+            select(Task.id, Task.reminder_at)
+            .outerjoin(ReminderDelivery, delivered)
+            .where(
+                Task.status == TaskStatus.PENDING,
+                col(Task.reminder_at) >= since,
+                col(ReminderDelivery.task_id).is_(None)
+            )
+        ).all()
+        heap = [(when, task_id) for task_id, when in rows]
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap = heap
+            self._scheduled = {task_id: when for when, task_id in heap}
+        self._wake()
+        return len(heap)
+
+    def track(self, session: Session, task_ids: Iterable[str]) -> None:
+        """Re-read the reminder state of tasks after a committed write."""
+        if not self.active:
+            return
+        task_ids = list(task_ids)
+        current = {}
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            current.update(
+                (task_id, when) for task_id, status, when in session.exec(
+                    select(Task.id, Task.status, Task.reminder_at).where(col(Task.id).in_(chunk))
+                ) if status == TaskStatus.PENDING
+            )
+        for task_id in task_ids:
+            self.schedule(task_id, current.get(task_id))
+
+    def claim(self, session: Session, task_id: str, when: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Record a reminder as delivered and return its event payload, or None
+        when the task changed since it was indexed or the reminder was
+        already delivered.
+        """
+        task = session.get(Task, task_id)
+        if not task or task.status != TaskStatus.PENDING or task.reminder_at != when:
+            return None
+        session.add(ReminderDelivery(task_id=task_id, reminder_at=when, delivered_at=datetime.utcnow()))
+        try:
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            return None
+        return {
+            "task_id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "reminder_at": when.isoformat(),
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+        }
+
+    # --- Runner ---
+
+    async def deliver_due(self, session_factory: Callable, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Claim and publish every reminder due at `now`."""
+        now = now or datetime.utcnow()
+        events = []
+        for task_id, when in self.pop_due(now):
+            if when < now - self.grace:
+                continue
+            async with session_factory() as session:
+                event = await session.run_sync(self.claim, task_id, when)
+            if event:
+                self.hub.publish("reminder", event)
+                self.fired += 1
+                events.append(event)
+        return events
+
+    async def run(self, session_factory: Callable) -> None:
+        last_load = None
+        failures = 0
+        while True:
+            now = datetime.utcnow()
+            try:
+                if last_load is None or (now - last_load).total_seconds() >= self.resync_interval:
+                    async with session_factory() as session:
+                        await session.run_sync(self.load, now)
+                    last_load = now
+                await self.deliver_due(session_factory, now)
+                failures = 0
+            except Exception:
+                self.errors += 1
+                failures += 1
+                delay = min(self.retry_delay * 2 ** (failures - 1), self.resync_interval)
+                logger.exception("Reminder round failed; retrying in %.1fs", delay)
+                # Reminders popped but not claimed come back with the reload
+                last_load = None
+                await asyncio.sleep(delay)
+                continue
+
+            timeout = self.resync_interval
+            next_due = self.next_due()
+            if next_due is not None:
+                timeout = min(timeout, max((next_due - datetime.utcnow()).total_seconds(), 0))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, session_factory: Callable) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def _wake(self) -> None:
+        # track() runs inside TodoSkills writes, possibly off the event loop thread
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def stats(self) -> Dict[str, Any]:
+        next_due = self.next_due()
+        return {
+            "active": self.active,
+            "scheduled": len(self),
+            "next_due": next_due.isoformat() if next_due else None,
+            "fired": self.fired,
+            "errors": self.errors,
+            **self.hub.stats(),
+        }
+
+reminder_scheduler = ReminderScheduler(
+    grace=float(os.getenv("REMINDER_GRACE_SECONDS", "600")),
+    resync_interval=float(os.getenv("REMINDER_RESYNC_SECONDS", "300")),
+)
@@ -0,0 +1,154 @@
+import re
+from sqlalchemy import event, table, column, literal_column
+from sqlmodel import select, col, or_, func
+from .models import Task
+
+# Full-text index over task title + description.
+# SQLite: an external-content FTS5 table kept in sync by triggers. FTS5 rows
+# need an integer key, and task's implicit rowid may be renumbered by VACUUM
+# (its primary key is TEXT), so each task gets a stable key in task_fts_key
+# (INTEGER PRIMARY KEY) and the index reads its content through a view on it.
+# Postgres: a GIN expression index over to_tsvector(), maintained by Postgres itself.
+# Other dialects (or SQLite builds without FTS5) fall back to LIKE.
+
+_FTS_KEY = "(SELECT key FROM task_fts_key WHERE task_id = {}.id)"
+
+SQLITE_DDL = [
+    "CREATE TABLE IF NOT EXISTS task_fts_key (key INTEGER PRIMARY KEY, task_id TEXT NOT NULL UNIQUE)",
+    "CREATE VIEW IF NOT EXISTS task_fts_source AS "
+    "SELECT k.key AS key, t.title AS title, t.description AS description "
+    "FROM task_fts_key k JOIN task t ON t.id = k.task_id",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, content='task_fts_source', content_rowid='key', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts_key(task_id) VALUES (new.id); "
+    f"INSERT INTO task_fts(rowid, title, description) VALUES ({_FTS_KEY.format('new')}, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    f"VALUES ('delete', {_FTS_KEY.format('old')}, old.title, old.description); "
+    "DELETE FROM task_fts_key WHERE task_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    f"VALUES ('delete', {_FTS_KEY.format('old')}, old.title, old.description); "
+    f"INSERT INTO task_fts(rowid, title, description) VALUES ({_FTS_KEY.format('new')}, new.title, new.description); END",
+]
+
+# Databases created before task_fts_key indexed task's own rowid
+SQLITE_LEGACY_DROP = [
+    "DROP TRIGGER IF EXISTS task_fts_ai",
+    "DROP TRIGGER IF EXISTS task_fts_ad",
+    "DROP TRIGGER IF EXISTS task_fts_au",
+    "DROP TABLE IF EXISTS task_fts",
+]
+
+POSTGRES_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+POSTGRES_DDL = [f"CREATE INDEX IF NOT EXISTS ix_task_search ON task USING GIN ({POSTGRES_DOCUMENT})"]
+
+def install_search_index(connection) -> None:
+    """Create the full-text index for this connection's dialect if missing."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        existing = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE name = 'task_fts'"
+        ).first()
+        if existing and "task_fts_source" not in existing[0]:
+            for ddl in SQLITE_LEGACY_DROP:
+                connection.exec_driver_sql(ddl)
+            existing = None
+        try:
+            for ddl in SQLITE_DDL:
+                connection.exec_driver_sql(ddl)
+        except Exception:
+            # SQLite compiled without FTS5; search falls back to LIKE
+            return
+        if not existing:
+            rebuild_search_index(connection)
+    elif dialect == "postgresql":
+        for ddl in POSTGRES_DDL:
+            connection.exec_driver_sql(ddl)
+
+def rebuild_search_index(connection) -> None:
+    """
+    Re-derive the SQLite FTS index (and the task keys it uses) from the task
+    table. The triggers keep both current, so this is for new or repaired indexes.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DELETE FROM task_fts_key WHERE task_id NOT IN (SELECT id FROM task)")
+        connection.exec_driver_sql(
+            "INSERT INTO task_fts_key(task_id) SELECT id FROM task "
+            "WHERE id NOT IN (SELECT task_id FROM task_fts_key)"
+        )
+        connection.exec_driver_sql("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+def drop_search_index(connection) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS task_fts")
+        connection.exec_driver_sql("DROP VIEW IF EXISTS task_fts_source")
+        connection.exec_driver_sql("DROP TABLE IF EXISTS task_fts_key")
+
+# Keep the index alongside the table for metadata.create_all / drop_all users (tests)
+event.listen(Task.__table__, "after_create", lambda target, connection, **kw: install_search_index(connection))
+event.listen(Task.__table__, "before_drop", lambda target, connection, **kw: drop_search_index(connection))
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())
+
+def has_fts(connection) -> bool:
+    if connection.dialect.name == "postgresql":
+        return True
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = 'task_fts'"
+    ).first() is not None
+
+def search_statement(dialect: str, query: str, fts: bool = True):
+    """
+    Build a SELECT of (Task, snippet, score) for `query`, best match first.
+    Terms are ANDed together and prefix matched. Returns None for an empty query.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+
+    if fts and dialect == "sqlite":
+        fts_table = table("task_fts", column("rowid"))
+        keys = table("task_fts_key", column("key"), column("task_id"))
+        match = " ".join(f'"{term}"*' for term in terms)
+        # bm25 is lower-is-better; title hits weigh more than description hits
+        rank = func.bm25(literal_column("task_fts"), 10.0, 1.0)
+        snippet = func.snippet(literal_column("task_fts"), -1, "<mark>", "</mark>", "…", 12)
+        return (
+            select(Task, snippet, (-rank).label("score"))
+            .join(keys, keys.c.task_id == col(Task.id))
+            .join(fts_table, fts_table.c.rowid == keys.c.key)
+            .where(literal_column("task_fts").op("MATCH")(match))
+            .order_by(rank, col(Task.id))
+        )
+
+    if fts and dialect == "postgresql":
+        document = literal_column(POSTGRES_DOCUMENT)
+        tsquery = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        score = func.ts_rank_cd(document, tsquery)
+        snippet = func.ts_headline(
+            "english",
+            func.coalesce(Task.description, Task.title),
+            tsquery,
+            "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=5"
+        )
+        return (
+            select(Task, snippet, score.label("score"))
+            .where(document.op("@@")(tsquery))
+            .order_by(score.desc(), col(Task.id))
+        )
+
+    conditions = [
+        or_(col(Task.title).contains(term), col(Task.description).contains(term))
+        for term in terms
+    ]
+    return (
+        select(Task, func.substr(func.coalesce(Task.description, Task.title), 1, 120), literal_column("0.0"))
+        .where(*conditions)
+        .order_by(col(Task.title), col(Task.id))
+    )
@@ -0,0 +1,85 @@
+"""
+Fast JSON encoding for list endpoints.
+
+List routes build plain dicts straight from the selected columns and encode
+them here, skipping the per-row pydantic pass that `response_model` would do.
+orjson is used when installed; the stdlib encoder is the fallback. Both emit
+datetimes in isoformat and enums by value, matching jsonable_encoder.
+
+    python -m backend.serialization [row_count]   # encoding benchmark
+"""
+import sys
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default).decode()
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+def json_response(body: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Wrap an already encoded JSON body (e.g. from dumps or the task cache)."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+    from typing import List
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlmodel import SQLModel, Session, create_engine
+    from .models import Task
+    from .skills import TodoSkills
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        TodoSkills.bulk_create_tasks(session, [
+            {"title": f"Task {i}", "description": "lorem ipsum " * 400, "ai_summary": "summary " * 100,
+             "tags": "work,home", "due_date": "2025-03-01T09:00:00"}
+            for i in range(count)
+        ])
+
+    adapter = TypeAdapter(List[Task])
+
+    def orm_models():
+        # What `response_model=List[Task]` did: ORM objects, validation, jsonable_encoder, json
+        with Session(engine) as session:
+            tasks = TodoSkills.list_tasks(session, limit=count)
+            return json.dumps(jsonable_encoder(adapter.validate_python(tasks)))
+
+    def rows(fields=None):
+        with Session(engine) as session:
+            return dumps(TodoSkills.list_task_rows(session, fields, limit=count))
+
+    cases = [
+        ("orm + response_model", orm_models),
+        ("rows + fast encoder", rows),
+        ("rows, fields=id,title,status,priority,due_date",
+         lambda: rows("id,title,status,priority,due_date")),
+    ]
+    print(f"{count} rows, encoder: {'orjson' if orjson else 'json'}")
+    for name, run in cases:
+        tracemalloc.start()
+        start = time.perf_counter()
+        body = run()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:50} {elapsed * 1000:8.1f} ms  peak {peak / 2**20:7.1f} MiB  body {len(body) / 2**20:6.1f} MiB")
@@ -1,8 +1,20 @@
-from typing import List, Optional, Dict, Any
-from sqlmodel import Session, select, col, or_
-from .models import Task, TaskCreate, TaskUpdate, TaskStatus, TaskPriority
+from typing import List, Optional, Dict, Any, Tuple, Union
+from sqlmodel import Session, select, col, or_, and_, tuple_, literal, func, delete, insert, update
+from pydantic import ValidationError
+from .models import (
+    Task, TaskTag, TaskListVersion, TaskStat, TaskStats, TaskChange, TaskChangeEntry, TaskChangeFeed,
+    TaskCreate, TaskUpdate, TaskStatus, TaskPriority, TaskSearchHit, BulkItemResult, SORTABLE_FIELDS,
+)
+from . import search, stats, recurrence
+from .cache import task_cache
+from .reminders import reminder_scheduler
+from .changes import change_feed
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from collections import Counter
+import base64
+import json
+import re
+import uuid
 
 class TodoSkills:
     """
@@ -14,10 +26,201 @@ class TodoSkills:
     def create_task(session: Session, task_create: TaskCreate) -> Task:
         db_task = Task.from_orm(task_create)
         session.add(db_task)
-        session.commit()
+        TodoSkills._set_tags(session, db_task, db_task.tags)
+        TodoSkills._commit(session, [db_task.id], stats_before=Counter())
         session.refresh(db_task)
         return db_task
 
+    @staticmethod
+    def _commit(
+        session: Session,
+        task_ids: List[str],
+        stats_before: Optional[Counter] = None,
+        stats_after: Optional[Counter] = None
+    ) -> None:
+        """
+        Commit a task write. Every write path goes through here so the
+        bookkeeping that depends on "something changed" stays in one place.
+        `stats_before` holds the counter keys of `task_ids` taken before the
+        write (see _stat_keys); pass it whenever status, priority, category or
+        the set of tasks may have changed. `stats_after` can be supplied when
+        the caller already knows it, saving a query.
+        """
+        if stats_before is not None:
+            if stats_after is None:
+                stats_after = TodoSkills._stat_keys(session, task_ids)
+            TodoSkills._apply_stats(session, stats.delta(stats_before, stats_after))
+        # The version bump locks its row until commit, so change seqs taken
+        # after it are handed out in commit order
+        TodoSkills._bump_collection_version(session)
+        TodoSkills._record_changes(session, task_ids)
+        session.commit()
+        task_cache.invalidate(task_ids)
+        reminder_scheduler.track(session, task_ids)
+        change_feed.notify()
+
+    @staticmethod
+    def _stat_keys(session: Session, task_ids: List[str]) -> Counter:
+        """Counter keys of the given tasks as currently stored (pending ORM changes are flushed)."""
+        rows = []
+        for chunk in TodoSkills._chunks(list(dict.fromkeys(task_ids))):
+            rows.extend(session.exec(
+                select(Task.status, Task.priority, Task.category).where(col(Task.id).in_(chunk))
+            ).all())
+        return stats.counter_keys(rows)
+
+    @staticmethod
+    def _apply_stats(session: Session, changes: Dict[Tuple[str, str], int]) -> None:
+        # Same update-then-insert pattern as the collection version
+        for (dimension, key), change in changes.items():
+            updated = session.exec(
+                update(TaskStat).where(TaskStat.dimension == dimension, TaskStat.key == key)
+                .values(count=TaskStat.count + change)
+            )
+            if updated.rowcount == 0:
+                session.add(TaskStat(dimension=dimension, key=key, count=change))
+
+    @staticmethod
+    def _bump_collection_version(session: Session) -> None:
+        # Runs inside the write's transaction, so the version moves with the data
+        bumped = session.exec(
+            update(TaskListVersion).where(TaskListVersion.id == 1)
+            .values(version=TaskListVersion.version + 1)
+        )
+        if bumped.rowcount == 0:
+            session.add(TaskListVersion(id=1, version=1))
+
+    @staticmethod
+    def _record_changes(session: Session, task_ids: List[str]) -> None:
+        if task_ids:
+            now = datetime.utcnow()
+            session.execute(
+                insert(TaskChange.__table__),
+                [{"task_id": task_id, "changed_at": now} for task_id in dict.fromkeys(task_ids)]
+            )
+
+    @staticmethod
+    def list_changes(session: Session, since: Optional[int] = None, limit: int = 500) -> TaskChangeFeed:
+        """
+        Changes after seq `since`, oldest first, one entry per task carrying its
+        current state. Without `since`, returns only the current position.
+        `resync` is set when `since` predates the retained log (or is ahead of
+        it, e.g. after a database reset); the client must then refetch.
+        """
+        oldest, latest = session.exec(select(func.min(TaskChange.seq), func.max(TaskChange.seq))).one()
+        latest = latest or 0
+        if since is None:
+            return TaskChangeFeed(next=latest)
+        # A seq gap right after the compaction point can trigger an unneeded
+        # resync, never a missed change
+        if since > latest or (oldest is not None and since < oldest - 1):
+            return TaskChangeFeed(next=latest, resync=True)
+
+        rows = session.exec(
+            select(TaskChange.seq, TaskChange.task_id)
+            .where(col(TaskChange.seq) > since)
+            .order_by(col(TaskChange.seq))
+            .limit(limit)
+        ).all()
+        if not rows:
+            return TaskChangeFeed(next=since)
+        # A task changed several times in the window is reported once, at its last seq
+        last_seq = {task_id: seq for seq, task_id in rows}
+        current = {}
+        for chunk in TodoSkills._chunks(list(last_seq)):
+            for row in session.execute(select(*Task.__table__.columns).where(col(Task.id).in_(chunk))):
+                current[row.id] = dict(row._mapping)
+        changes = [
+            TaskChangeEntry(
+                seq=seq, task_id=task_id,
+                op="upsert" if task_id in current else "delete",
+                task=current.get(task_id)
+            )
+            for task_id, seq in sorted(last_seq.items(), key=lambda item: item[1])
+        ]
+        return TaskChangeFeed(changes=changes, next=rows[-1][0])
+
+    @staticmethod
+    def compact_changes(session: Session, before: datetime) -> int:
+        """
+        Drop change rows older than `before`. The newest row is always kept so
+        seqs are never reused and stale cursors can still be detected.
+        Returns the number of rows removed.
+        """
+        latest = session.exec(select(func.max(TaskChange.seq))).one()
+        if latest is None:
+            return 0
+        removed = session.exec(
+            delete(TaskChange).where(col(TaskChange.changed_at) < before, col(TaskChange.seq) < latest)
+        ).rowcount
+        session.commit()
+        return removed
+
+    @staticmethod
+    def collection_version(session: Session) -> int:
+        """Monotonic counter bumped by every task write; backs the list ETag."""
+        row = session.get(TaskListVersion, 1)
+        return row.version if row else 0
+
+    @staticmethod
+    def task_version(session: Session, task_id: str) -> Optional[datetime]:
+        """A task's updated_at, read without loading the row; None if it does not exist."""
+        return session.exec(select(Task.updated_at).where(Task.id == task_id)).first()
+
+    @staticmethod
+    def get_stats(session: Session, now: Optional[datetime] = None) -> TaskStats:
+        """
+        Task counts from the TaskStat counters. `overdue` depends on the clock,
+        so it is counted live: open tasks with a due date before `now`, an
+        index range over ix_task_status_due_date_id.
+        """
+        counters = {(row.dimension, row.key): row.count for row in session.exec(select(TaskStat))}
+        by = {dimension: {} for dimension in stats.DIMENSIONS}
+        for (dimension, key), count in counters.items():
+            if dimension in by and count:
+                by[dimension][key] = count
+        by_priority = by["priority"]
+        if stats.NONE_KEY in by_priority:
+            by_priority["none"] = by_priority.pop(stats.NONE_KEY)
+        overdue = session.exec(
+            select(func.count()).select_from(Task).where(
+                col(Task.status).in_(stats.OPEN_STATUSES),
+                col(Task.due_date) < (now or datetime.utcnow())
+            )
+        ).one()
+        return TaskStats(
+            total=counters.get((stats.TOTAL, stats.NONE_KEY), 0),
+            by_status={status.value: by["status"].get(status.value, 0) for status in TaskStatus},
+            by_priority={**{priority.value: 0 for priority in TaskPriority}, **by_priority},
+            by_category={key: count for key, count in by["category"].items() if key != stats.NONE_KEY},
+            uncategorized=by["category"].get(stats.NONE_KEY, 0),
+            overdue=overdue
+        )
+
+    @staticmethod
+    def rebuild_stats(session: Session) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """
+        Recompute the TaskStat counters from the task table and replace them.
+        Returns the keys that had drifted, as {(dimension, key): (stored, actual)}.
+        """
+        actual = Counter()
+        for status, priority, category, count in session.exec(
+            select(Task.status, Task.priority, Task.category, func.count())
+            .group_by(Task.status, Task.priority, Task.category)
+        ):
+            for key, value in stats.counter_keys([(status, priority, category)]).items():
+                actual[key] += value * count
+        stored = {(row.dimension, row.key): row.count for row in session.exec(select(TaskStat))}
+        drift = {
+            key: (stored.get(key, 0), actual.get(key, 0))
+            for key in stored.keys() | actual.keys()
+            if stored.get(key, 0) != actual.get(key, 0)
+        }
+        session.exec(delete(TaskStat))
+        session.add_all(TaskStat(dimension=dimension, key=key, count=count) for (dimension, key), count in actual.items())
+        session.commit()
+        return drift
+
     @staticmethod
     def list_tasks(
         session: Session,
@@ -28,8 +231,105 @@ class TodoSkills:
         sort_by: Optional[str] = None,
         sort_order: str = "desc",
         offset: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
     ) -> List[Task]:
+        """
+        List tasks with filters and sorting.
+        `tags` is a comma-separated list matched as whole tags; `tag_mode` picks
+        whether a task needs "any" or "all" of them. `due_after` / `due_before`
+        bound `due_date` (inclusive / exclusive).
+        When `cursor` is given, pagination is keyset based and `offset` is ignored.
+        Raises ValueError for an unsupported `sort_by`, `tag_mode` or a malformed cursor.
+        """
+        field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+        statement = TodoSkills._list_statement(
+            status, priority, tags, category, field, descending, tag_mode, due_after, due_before
+        )
+        return TodoSkills._paginate(session, statement, field, descending, offset, limit, cursor)
+
+    @staticmethod
+    def list_task_rows(
+        session: Session,
+        fields: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        tags: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        offset: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        list_tasks returning plain dicts instead of Task objects, for callers
+        that only serialize the result. `fields` is a comma-separated list of
+        columns to SELECT; id and the sort key are always included so the rows
+        can be paginated. Raises ValueError like list_tasks, and for unknown fields.
+        """
+        field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+        statement = TodoSkills._list_statement(
+            status, priority, tags, category, field, descending, tag_mode, due_after, due_before
+        ).with_only_columns(*TodoSkills._projection(fields, field))
+        rows = TodoSkills._paginate(session, statement, field, descending, offset, limit, cursor, entities=False)
+        return [dict(row._mapping) for row in rows]
+
+    @staticmethod
+    def _projection(fields: Optional[str], sort_field: str) -> list:
+        columns = Task.__table__.columns
+        if not fields:
+            return list(columns)
+        wanted = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = wanted.difference(columns.keys())
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(sorted(unknown))}. Use any of: {', '.join(columns.keys())}"
+            )
+        wanted.update(("id", sort_field))
+        # Table order, so the output shape does not depend on how fields were listed
+        return [column for column in columns if column.name in wanted]
+
+    @staticmethod
+    def _paginate(
+        session: Session, statement, field: str, descending: bool, offset: int, limit: int,
+        cursor: Optional[str], entities: bool = True
+    ) -> list:
+        # session.exec unwraps single-entity rows into Task objects; column
+        # projections need the plain Row objects from session.execute
+        run = session.exec if entities else session.execute
+        if not cursor:
+            return run(statement.offset(offset).limit(limit)).all()
+
+        # Each segment is a single index range; later segments only run when
+        # the earlier ones could not fill the page.
+        value, last_id = TodoSkills._decode_cursor(cursor, field, descending)
+        results = []
+        for predicate in TodoSkills._keyset_segments(field, descending, value, last_id):
+            remaining = limit - len(results)
+            if remaining <= 0:
+                break
+            results.extend(run(statement.where(predicate).limit(remaining)).all())
+        return results
+
+    @staticmethod
+    def _list_statement(
+        status: Optional[TaskStatus],
+        priority: Optional[TaskPriority],
+        tags: Optional[str],
+        category: Optional[str],
+        field: str,
+        descending: bool,
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ):
         statement = select(Task)
         if status:
             statement = statement.where(Task.status == status)
@@ -38,17 +338,128 @@ class TodoSkills:
         if category:
             statement = statement.where(Task.category == category)
         if tags:
-            statement = statement.where(col(Task.tags).contains(tags))
+            statement = statement.where(TodoSkills._tag_filter(tags, tag_mode))
+        if due_after:
+            statement = statement.where(col(Task.due_date) >= due_after)
+        if due_before:
+            statement = statement.where(col(Task.due_date) < due_before)
+
+        # NULLs placed where SQLite keeps them in the (column, id) index
+        column = col(getattr(Task, field))
+        if descending:
+            return statement.order_by(column.desc().nulls_last(), col(Task.id).desc())
+        return statement.order_by(column.asc().nulls_first(), col(Task.id).asc())
 
-        if sort_by:
-            field = getattr(Task, sort_by, None)
-            if field:
-                statement = statement.order_by(col(field).desc() if sort_order == "desc" else col(field).asc())
+    @staticmethod
+    def export_statement(
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        tags: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        tag_mode: str = "any",
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ):
+        """
+        The list_tasks query without pagination, selecting plain task columns
+        (no ORM objects) for streaming exports.
+        Raises ValueError for an unsupported `sort_by` or `tag_mode`.
+        """
+        field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+        statement = TodoSkills._list_statement(
+            status, priority, tags, category, field, descending, tag_mode, due_after, due_before
+        )
+        return statement.with_only_columns(*Task.__table__.columns)
+
+    @staticmethod
+    def export_rows(session: Session, statement, batch_size: int = 1000):
+        """Yield lists of rows from `statement` using a server-side cursor."""
+        result = session.execute(statement.execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
+    @staticmethod
+    def list_due_reminders(session: Session, until: datetime, limit: int = 500) -> List[Task]:
+        """Pending tasks whose reminder falls at or before `until`, earliest first."""
+        return session.exec(TodoSkills._due_reminders_statement(until).limit(limit)).all()
+
+    @staticmethod
+    def _due_reminders_statement(until: datetime):
+        # Served by ix_task_status_reminder_at_id: status equality, then a reminder range
+        return select(Task).where(
+            Task.status == TaskStatus.PENDING,
+            col(Task.reminder_at).is_not(None),
+            col(Task.reminder_at) <= until
+        ).order_by(col(Task.reminder_at), col(Task.id))
+
+    @staticmethod
+    def encode_cursor(task: Union[Task, Dict[str, Any]], sort_by: Optional[str] = None, sort_order: str = "desc") -> str:
+        """Build the opaque cursor that resumes a listing right after `task` (a Task or a list_task_rows dict)."""
+        field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+        if isinstance(task, dict):
+            value, task_id = task[field], task["id"]
         else:
-            statement = statement.order_by(col(Task.created_at).desc())
+            value, task_id = getattr(task, field), task.id
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, (TaskStatus, TaskPriority)):
+            value = value.value
+        payload = {"f": field, "d": descending, "v": value, "id": task_id}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _resolve_sort(sort_by: Optional[str], sort_order: str) -> Tuple[str, bool]:
+        if sort_by is None:
+            return "created_at", True
+        if sort_by not in SORTABLE_FIELDS:
+            raise ValueError(f"Unsupported sort_by '{sort_by}'. Use one of: {', '.join(SORTABLE_FIELDS)}")
+        return sort_by, sort_order == "desc"
 
-        statement = statement.offset(offset).limit(limit)
-        return session.exec(statement).all()
+    @staticmethod
+    def _decode_cursor(cursor: str, field: str, descending: bool) -> Tuple[Any, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value, last_id = payload["v"], payload["id"]
+            matches = payload["f"] == field and payload["d"] == descending
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+        if not matches:
+            raise ValueError("Cursor does not match the requested sort order")
+        if value is not None:
+            if field == "status":
+                value = TaskStatus(value)
+            elif field == "priority":
+                value = TaskPriority(value)
+            elif field.endswith("_at") or field.endswith("_date"):
+                value = datetime.fromisoformat(value)
+        return value, last_id
+
+    @staticmethod
+    def _keyset_segments(field: str, descending: bool, value: Any, last_id: str) -> list:
+        """
+        Predicates selecting the rows after (value, last_id), in list order.
+        NULL sort keys come first when ascending and last when descending, so
+        nullable columns need a separate segment for the NULL run instead of
+        an OR that would turn the index range into a scan.
+        """
+        column = col(getattr(Task, field))
+        id_column = col(Task.id)
+        if value is None:
+            if descending:
+                return [and_(column.is_(None), id_column < last_id)]
+            return [and_(column.is_(None), id_column > last_id), column.is_not(None)]
+
+        # Bind through the column type so enums compare by their stored name
+        key = tuple_(literal(value, column.type), literal(last_id, id_column.type))
+        if descending:
+            segments = [tuple_(column, id_column) < key]
+            if Task.__table__.c[field].nullable:
+                segments.append(column.is_(None))
+            return segments
+        return [tuple_(column, id_column) > key]
 
     @staticmethod
     def update_task(session: Session, task_id: str, task_update: TaskUpdate) -> Optional[Task]:
@@ -56,13 +467,16 @@ class TodoSkills:
         if not db_task:
             return None
         
+        stats_before = TodoSkills._stat_keys(session, [task_id])
         task_data = task_update.dict(exclude_unset=True)
         for key, value in task_data.items():
             setattr(db_task, key, value)
+        if "tags" in task_data:
+            TodoSkills._set_tags(session, db_task, db_task.tags)
         
         db_task.updated_at = datetime.utcnow()
         session.add(db_task)
-        session.commit()
+        TodoSkills._commit(session, [task_id], stats_before)
         session.refresh(db_task)
         return db_task
 
@@ -73,52 +487,412 @@ class TodoSkills:
             return None
         
         if db_task.status != TaskStatus.COMPLETED:
+            stats_before = TodoSkills._stat_keys(session, [task_id])
             db_task.status = TaskStatus.COMPLETED
             db_task.completed_at = datetime.utcnow()
             db_task.updated_at = datetime.utcnow()
             session.add(db_task)
             
             # Recurrence Logic
-            if db_task.recurrence_rule:
-                new_due = TodoSkills._calculate_next_due(db_task)
-                if new_due:
-                    new_task = Task(
-                        title=db_task.title,
-                        description=db_task.description,
-                        status=TaskStatus.PENDING,
-                        priority=db_task.priority,
-                        category=db_task.category,
-                        tags=db_task.tags,
-                        due_date=new_due,
-                        recurrence_rule=db_task.recurrence_rule
-                    )
-                    session.add(new_task)
-
-            session.commit()
+            new_task = TodoSkills._next_occurrence(db_task)
+            if new_task:
+                session.add(new_task)
+                TodoSkills._set_tags(session, new_task, new_task.tags)
+
+            changed_ids = [db_task.id] + ([new_task.id] if new_task else [])
+            TodoSkills._commit(session, changed_ids, stats_before)
             session.refresh(db_task)
         return db_task
 
+    @staticmethod
+    def _next_occurrence(db_task: Task) -> Optional[Task]:
+        """The pending task that follows a completed recurring task, if any."""
+        if not db_task.recurrence_rule:
+            return None
+        new_due = TodoSkills._calculate_next_due(db_task)
+        if not new_due:
+            return None
+        return Task(
+            title=db_task.title,
+            description=db_task.description,
+            status=TaskStatus.PENDING,
+            priority=db_task.priority,
+            category=db_task.category,
+            tags=db_task.tags,
+            due_date=new_due,
+            recurrence_rule=db_task.recurrence_rule
+        )
+
+    @staticmethod
+    def resolve_task_id(session: Session, ref: str, min_length: int = 4) -> Optional[str]:
+        """
+        The id of the task whose id is `ref` or starts with it (the short ids
+        the chat tools show). None when no task, or more than one, matches.
+        """
+        ref = ref.strip().lower()
+        if len(ref) < min_length or not re.fullmatch(r"[0-9a-f-]+", ref):
+            return None
+        # A range on the primary key rather than LIKE, which SQLite will not
+        # serve from the index
+        matches = session.exec(
+            select(Task.id).where(col(Task.id) >= ref, col(Task.id) < ref + "~").limit(2)
+        ).all()
+        return matches[0] if len(matches) == 1 else None
+
+    @staticmethod
+    def delete_task(session: Session, task_id: str) -> bool:
+        db_task = session.get(Task, task_id)
+        if not db_task:
+            return False
+        stats_before = TodoSkills._stat_keys(session, [task_id])
+        session.exec(delete(TaskTag).where(TaskTag.task_id == task_id))
+        session.delete(db_task)
+        TodoSkills._commit(session, [task_id], stats_before, stats_after=Counter())
+        return True
+
+    # --- Bulk operations ---
+    # Each runs in a single transaction using executemany-style INSERT/UPDATE
+    # statements and reports one BulkItemResult per input item, in input order.
+
+    @staticmethod
+    def bulk_create_tasks(session: Session, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+        results = []
+        task_rows, tag_rows = [], []
+        for index, item in enumerate(items):
+            try:
+                db_task = Task.from_orm(TaskCreate(**item))
+            except (ValidationError, TypeError) as e:
+                results.append(BulkItemResult(index=index, ok=False, error=str(e)))
+                continue
+            names = TodoSkills.parse_tags(db_task.tags)
+            db_task.tags = json.dumps(names)
+            task_rows.append(db_task.dict())
+            tag_rows.extend({"task_id": db_task.id, "tag": name} for name in names)
+            results.append(BulkItemResult(index=index, id=db_task.id, ok=True))
+
+        TodoSkills._bulk_insert(session, task_rows, tag_rows)
+        TodoSkills._commit(
+            session, [row["id"] for row in task_rows], Counter(), TodoSkills._row_stat_keys(task_rows)
+        )
+        return results
+
+    @staticmethod
+    def bulk_update_tasks(session: Session, items: List[Dict[str, Any]]) -> List[BulkItemResult]:
+        """Each item is {"id": ..., <TaskUpdate fields>}."""
+        results = []
+        updates = []
+        existing = TodoSkills._existing_ids(session, [item.get("id") for item in items if isinstance(item, dict)])
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            task_id = item.get("id") if isinstance(item, dict) else None
+            if task_id not in existing:
+                results.append(BulkItemResult(index=index, id=task_id, ok=False, error="Task not found"))
+                continue
+            try:
+                fields = TaskUpdate(**{k: v for k, v in item.items() if k != "id"}).dict(exclude_unset=True)
+            except (ValidationError, TypeError) as e:
+                results.append(BulkItemResult(index=index, id=task_id, ok=False, error=str(e)))
+                continue
+            updates.append(dict(fields, id=task_id, updated_at=now))
+            results.append(BulkItemResult(index=index, id=task_id, ok=True))
+
+        stats_before = TodoSkills._stat_keys(session, [row["id"] for row in updates])
+        # Tag changes replace the association rows wholesale for those tasks
+        retagged = [row for row in updates if "tags" in row]
+        tag_rows = []
+        for row in retagged:
+            names = TodoSkills.parse_tags(row["tags"])
+            row["tags"] = json.dumps(names)
+            tag_rows.extend({"task_id": row["id"], "tag": name} for name in names)
+        for chunk in TodoSkills._chunks([row["id"] for row in retagged]):
+            session.exec(delete(TaskTag).where(col(TaskTag.task_id).in_(chunk)))
+
+        # Bulk UPDATE by primary key; rows sharing the same keys are batched
+        if updates:
+            session.execute(update(Task), updates)
+        if tag_rows:
+            session.execute(insert(TaskTag), tag_rows)
+        TodoSkills._commit(session, [row["id"] for row in updates], stats_before)
+        return results
+
+    @staticmethod
+    def bulk_complete_tasks(session: Session, task_ids: List[str]) -> List[BulkItemResult]:
+        """Complete many tasks at once, spawning next occurrences like complete_task."""
+        tasks = {}
+        for chunk in TodoSkills._chunks(list(dict.fromkeys(task_ids))):
+            tasks.update((t.id, t) for t in session.exec(select(Task).where(col(Task.id).in_(chunk))))
+
+        now = datetime.utcnow()
+        to_complete = [t for t in tasks.values() if t.status != TaskStatus.COMPLETED]
+        task_rows, tag_rows = [], []
+        for db_task in to_complete:
+            new_task = TodoSkills._next_occurrence(db_task)
+            if new_task:
+                names = TodoSkills.parse_tags(new_task.tags)
+                new_task.tags = json.dumps(names)
+                task_rows.append(new_task.dict())
+                tag_rows.extend({"task_id": new_task.id, "tag": name} for name in names)
+
+        completed_ids = [t.id for t in to_complete]
+        stats_before = TodoSkills._stat_keys(session, completed_ids)
+        for chunk in TodoSkills._chunks(completed_ids):
+            session.exec(
+                update(Task).where(col(Task.id).in_(chunk))
+                .values(status=TaskStatus.COMPLETED, completed_at=now, updated_at=now)
+            )
+        TodoSkills._bulk_insert(session, task_rows, tag_rows)
+        TodoSkills._commit(session, completed_ids + [row["id"] for row in task_rows], stats_before)
+
+        return [
+            BulkItemResult(index=index, id=task_id, ok=task_id in tasks,
+                           error=None if task_id in tasks else "Task not found")
+            for index, task_id in enumerate(task_ids)
+        ]
+
+    @staticmethod
+    def bulk_delete_tasks(session: Session, task_ids: List[str]) -> List[BulkItemResult]:
+        existing = TodoSkills._existing_ids(session, task_ids)
+        stats_before = TodoSkills._stat_keys(session, list(existing))
+        for chunk in TodoSkills._chunks(list(existing)):
+            session.exec(delete(TaskTag).where(col(TaskTag.task_id).in_(chunk)))
+            session.exec(delete(Task).where(col(Task.id).in_(chunk)))
+        TodoSkills._commit(session, list(existing), stats_before, stats_after=Counter())
+        return [
+            BulkItemResult(index=index, id=task_id, ok=task_id in existing,
+                           error=None if task_id in existing else "Task not found")
+            for index, task_id in enumerate(task_ids)
+        ]
+
+    @staticmethod
+    def import_rows(session: Session, task_rows: List[Dict[str, Any]], tag_rows: List[Dict[str, Any]]) -> None:
+        """Insert one batch of already validated task and TaskTag rows in its own transaction."""
+        TodoSkills._bulk_insert(session, task_rows, tag_rows)
+        TodoSkills._commit(
+            session, [row["id"] for row in task_rows], Counter(), TodoSkills._row_stat_keys(task_rows)
+        )
+
+    @staticmethod
+    def _row_stat_keys(task_rows: List[Dict[str, Any]]) -> Counter:
+        return stats.counter_keys((row["status"], row["priority"], row["category"]) for row in task_rows)
+
+    @staticmethod
+    def _bulk_insert(session: Session, task_rows: List[Dict[str, Any]], tag_rows: List[Dict[str, Any]]) -> None:
+        # Core inserts on the tables skip the ORM bulk-insert bookkeeping;
+        # rows sorted by id land in the primary key and (column, id) indexes
+        # close together instead of at random pages
+        if task_rows:
+            session.execute(insert(Task.__table__), sorted(task_rows, key=lambda row: row["id"]))
+        if tag_rows:
+            session.execute(insert(TaskTag.__table__), tag_rows)
+
+    @staticmethod
+    def _existing_ids(session: Session, task_ids: List[Optional[str]]) -> set:
+        wanted = [task_id for task_id in dict.fromkeys(task_ids) if isinstance(task_id, str)]
+        existing = set()
+        for chunk in TodoSkills._chunks(wanted):
+            existing.update(session.exec(select(Task.id).where(col(Task.id).in_(chunk))))
+        return existing
+
+    @staticmethod
+    def _chunks(values: list, size: int = 500):
+        # Keeps IN (...) lists under the database's bound-parameter limit
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    @staticmethod
+    def parse_tags(tags: Optional[str]) -> List[str]:
+        """
+        Normalize a tags value into a list of unique lowercase tags.
+        Accepts the JSON list string the frontend sends or a comma-separated string.
+        """
+        if not tags:
+            return []
+        # Only try JSON when it can be JSON; a failed parse is comparatively slow
+        # and plain comma-separated input is common (CSV imports, the CLI)
+        values = None
+        if tags.lstrip()[:1] in ('[', '"'):
+            try:
+                values = json.loads(tags)
+            except ValueError:
+                pass
+        if values is None:
+            values = tags.split(",")
+        if not isinstance(values, list):
+            values = [values]
+        result = []
+        for value in values:
+            tag = str(value).strip().lower()
+            if tag and tag not in result:
+                result.append(tag)
+        return result
+
+    @staticmethod
+    def _set_tags(session: Session, db_task: Task, tags: Optional[str]) -> None:
+        # Rewrites both the JSON column and the association rows for one task
+        names = TodoSkills.parse_tags(tags)
+        db_task.tags = json.dumps(names)
+        session.exec(delete(TaskTag).where(TaskTag.task_id == db_task.id))
+        session.add_all(TaskTag(task_id=db_task.id, tag=name) for name in names)
+
+    @staticmethod
+    def _tag_filter(tags: str, tag_mode: str = "any"):
+        if tag_mode not in ("any", "all"):
+            raise ValueError("tag_mode must be 'any' or 'all'")
+        names = TodoSkills.parse_tags(tags)
+        matches = select(TaskTag.task_id).where(col(TaskTag.tag).in_(names))
+        if tag_mode == "all":
+            matches = matches.group_by(TaskTag.task_id).having(func.count() == len(names))
+        return col(Task.id).in_(matches)
+
+    @staticmethod
+    def backfill_tags(session: Session, batch_size: int = 1000) -> int:
+        """
+        Populate TaskTag rows from the legacy JSON `tags` column for tasks that
+        have none yet. Safe to run repeatedly; returns the number of tasks migrated.
+        """
+        tagged = select(TaskTag.task_id)
+        pending = select(Task).where(
+            col(Task.tags).is_not(None),
+            col(Task.tags).not_in(["", "[]"]),
+            col(Task.id).not_in(tagged)
+        ).limit(batch_size)
+        migrated = 0
+        while True:
+            tasks = session.exec(pending).all()
+            if not tasks:
+                return migrated
+            task_ids = [t.id for t in tasks]
+            for db_task in tasks:
+                # Tasks whose tags normalize to nothing are rewritten to "[]"
+                # so the next batch does not pick them up again
+                TodoSkills._set_tags(session, db_task, db_task.tags)
+                session.add(db_task)
+            TodoSkills._commit(session, task_ids)
+            migrated += len(tasks)
+
     @staticmethod
     def _calculate_next_due(db_task: Task) -> Optional[datetime]:
-        try:
-            base_date = db_task.due_date or datetime.utcnow()
-            rule = db_task.recurrence_rule.lower()
-            if "daily" in rule:
-                return base_date + relativedelta(days=1)
-            elif "weekly" in rule:
-                return base_date + relativedelta(weeks=1)
-            elif "monthly" in rule:
-                return base_date + relativedelta(months=1)
-        except:
-            pass
-        return None
-
-    @staticmethod
-    def search_tasks(session: Session, query: str) -> List[Task]:
-        statement = select(Task).where(
-            or_(
-                col(Task.title).contains(query),
-                col(Task.description).contains(query)
+        # Unrecognised rules yield None: the task simply does not recur
+        base_date = db_task.due_date or datetime.utcnow()
+        return recurrence.next_occurrence(db_task.recurrence_rule, base_date)
+
+    # --- Recurrence batch jobs ---
+    # Both walk the open recurring tasks once in primary key order, compute
+    # dates from the compiled rules and write each batch with executemany
+    # statements in its own transaction.
+
+    @staticmethod
+    def _recurring_batches(session: Session, batch_size: int, due_before: Optional[datetime] = None):
+        # Only the rule condition goes into SQL, so the scan follows the partial
+        # ix_task_recurring_id index in id order; with the status and due date
+        # conditions too, the planner picks a status index and sorts every page
+        columns = (
+            Task.id, Task.status, Task.title, Task.description, Task.priority, Task.category,
+            Task.tags, Task.due_date, Task.recurrence_rule
+        )
+        statement = select(*columns).where(col(Task.recurrence_rule).is_not(None)).order_by(Task.id).limit(batch_size)
+        last_id = None
+        while True:
+            page = statement if last_id is None else statement.where(col(Task.id) > last_id)
+            rows = session.execute(page).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield [
+                row for row in rows
+                if row.status in stats.OPEN_STATUSES and row.due_date is not None
+                and (due_before is None or row.due_date < due_before)
+            ]
+
+    @staticmethod
+    def materialize_occurrences(
+        session: Session, until: datetime, max_per_series: int = 366, batch_size: int = 1000
+    ) -> int:
+        """
+        Create the pending occurrences of every recurring task due up to
+        `until` (at most `max_per_series` each). The rule moves to the last
+        occurrence created, which becomes the series head, so completing an
+        earlier occurrence does not spawn a duplicate. Returns the number created.
+        """
+        created = 0
+        for rows in TodoSkills._recurring_batches(session, batch_size):
+            now = datetime.utcnow()
+            task_rows, tag_rows, heads = [], [], []
+            for row in rows:
+                dues = recurrence.occurrences(row.recurrence_rule, row.due_date, until, max_per_series)
+                if not dues:
+                    continue
+                names = TodoSkills.parse_tags(row.tags)
+                # Plain row dicts: constructing Task models costs more than the inserts
+                series = {
+                    "title": row.title, "description": row.description, "status": TaskStatus.PENDING,
+                    "priority": row.priority, "category": row.category, "tags": json.dumps(names),
+                    "start_date": None, "reminder_at": None, "ai_summary": None,
+                    "created_at": now, "updated_at": now, "completed_at": None,
+                }
+                for index, due in enumerate(dues):
+                    task_id = str(uuid.uuid4())
+                    rule = row.recurrence_rule if index == len(dues) - 1 else None
+                    task_rows.append(dict(series, id=task_id, due_date=due, recurrence_rule=rule))
+                    tag_rows.extend({"task_id": task_id, "tag": name} for name in names)
+                heads.append({"id": row.id, "recurrence_rule": None, "updated_at": now})
+            if not heads:
+                continue
+            session.execute(update(Task), heads)
+            TodoSkills._bulk_insert(session, task_rows, tag_rows)
+            # Head updates leave the counters alone; only the new rows count
+            TodoSkills._commit(
+                session, [row["id"] for row in heads + task_rows],
+                Counter(), TodoSkills._row_stat_keys(task_rows)
             )
+            created += len(task_rows)
+        return created
+
+    @staticmethod
+    def advance_overdue_recurring(session: Session, now: Optional[datetime] = None, batch_size: int = 1000) -> int:
+        """
+        Move every open recurring task whose due date has passed to its first
+        occurrence at or after `now`, skipping the missed ones. Returns the
+        number of tasks moved.
+        """
+        now = now or datetime.utcnow()
+        advanced = 0
+        # Series often share a rule and a due date (created together, imported)
+        next_due = {}
+        for rows in TodoSkills._recurring_batches(session, batch_size, due_before=now):
+            updates = []
+            for row in rows:
+                key = (row.recurrence_rule, row.due_date)
+                if key not in next_due:
+                    next_due[key] = recurrence.first_on_or_after(row.recurrence_rule, row.due_date, now)
+                due = next_due[key]
+                if due is not None:
+                    updates.append({"id": row.id, "due_date": due, "updated_at": now})
+            if updates:
+                session.execute(update(Task), updates)
+                TodoSkills._commit(session, [row["id"] for row in updates])
+                advanced += len(updates)
+        return advanced
+
+    @staticmethod
+    def search_tasks(session: Session, query: str, offset: int = 0, limit: int = 50) -> List[Task]:
+        """Full-text search over title and description, best match first."""
+        return [task for task, _, _ in TodoSkills._search(session, query, offset, limit)]
+
+    @staticmethod
+    def search_task_hits(session: Session, query: str, offset: int = 0, limit: int = 20) -> List[TaskSearchHit]:
+        """Like search_tasks, but each result carries a highlighted snippet and its score."""
+        return [
+            TaskSearchHit(**task.dict(), snippet=snippet, score=score)
+            for task, snippet, score in TodoSkills._search(session, query, offset, limit)
+        ]
+
+    @staticmethod
+    def _search(session: Session, query: str, offset: int, limit: int) -> list:
+        connection = session.connection()
+        statement = search.search_statement(
+            connection.dialect.name, query, fts=search.has_fts(connection)
         )
-        return session.exec(statement).all()
+        if statement is None:
+            return []
+        return session.exec(statement.offset(offset).limit(limit)).all()
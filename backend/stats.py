@@ -0,0 +1,55 @@
+"""
+Task counters by status, priority and category.
+
+The TaskStat table holds one row per (dimension, key). TodoSkills updates it
+in the same transaction as every task write, by diffing the counter keys of
+the touched tasks before and after the write. Reads are then a handful of
+small rows, whatever the size of the task table.
+
+    python -m backend.stats   # recompute from scratch and report any drift
+"""
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from .models import TaskStatus, TaskPriority
+
+TOTAL = "total"
+DIMENSIONS = ("status", "priority", "category")
+# Stored key for a NULL priority / category
+NONE_KEY = ""
+
+# Tasks in these states can still become overdue
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.PAUSED, TaskStatus.ON_HOLD)
+
+def _key(value) -> str:
+    if value is None:
+        return NONE_KEY
+    return value.value if isinstance(value, (TaskStatus, TaskPriority)) else str(value)
+
+def counter_keys(rows: Iterable[Tuple[Optional[TaskStatus], Optional[TaskPriority], Optional[str]]]) -> Counter:
+    """Count the (dimension, key) pairs for (status, priority, category) rows."""
+    counts = Counter()
+    for status, priority, category in rows:
+        counts[(TOTAL, NONE_KEY)] += 1
+        counts[("status", _key(status))] += 1
+        counts[("priority", _key(priority))] += 1
+        counts[("category", _key(category))] += 1
+    return counts
+
+def delta(before: Counter, after: Counter) -> Dict[Tuple[str, str], int]:
+    """Non-zero per-key changes between two counter_keys results."""
+    changes = {key: after.get(key, 0) - before.get(key, 0) for key in before.keys() | after.keys()}
+    return {key: change for key, change in changes.items() if change}
+
+if __name__ == "__main__":
+    from sqlmodel import Session
+    from .database import engine, create_db_and_tables
+    from .skills import TodoSkills
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        drift = TodoSkills.rebuild_stats(session)
+    for (dimension, key), (stored, actual) in sorted(drift.items()):
+        print(f"DRIFT {dimension}[{key!r}]: stored {stored}, actual {actual}")
+    print(f"counters rebuilt, {len(drift)} drifted")
+    sys.exit(1 if drift else 0)
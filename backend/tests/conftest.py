@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+import pytest
+from ..main import app, get_session, get_async_session
+from ..cache import task_cache
+
+# One SQLite file per test, shared by the sync session and the async routes.
+# The sync side runs in autocommit so it never holds a transaction that would
+# hide (or block) writes made through the async engine.
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+        isolation_level="AUTOCOMMIT"
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(name="transactional_engine")
+def transactional_engine_fixture(tmp_path):
+    # Default isolation: writes run inside a real transaction, so a failure
+    # before commit can be checked for partial results
+    engine = create_engine(f"sqlite:///{tmp_path / 'transactional.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    with Session(engine) as session:
+        yield session
+
+@pytest.fixture(name="client")
+def client_fixture(engine, session: Session):
+    # NullPool: aiosqlite connections belong to the TestClient's event loop
+    async_engine = create_async_engine(
+        str(engine.url).replace("sqlite:", "sqlite+aiosqlite:", 1), poolclass=NullPool
+    )
+
+    def get_session_override():
+        return session
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    # Each test has its own database, so start from an empty cache
+    task_cache.clear()
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
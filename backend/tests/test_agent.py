@@ -0,0 +1,160 @@
+import json
+import asyncio
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from ..main import app
+from ..agent import (
+    AgentRuntime, ConversationStore, FakeLLMClient, GeminiClient, TodoAgent, get_agent_runtime,
+    genai, DISABLED_MESSAGE, MAX_TOOL_ROUNDS, TOOL_ROUNDS_EXCEEDED
+)
+from ..models import Task
+from ..skills import TodoSkills
+from ..tool_output import TOKEN_BUDGET, task_line, task_page
+
+def use_runtime(runtime: AgentRuntime):
+    app.dependency_overrides[get_agent_runtime] = lambda: runtime
+
+def test_tools_run_against_the_request_session(client: TestClient):
+    use_runtime(AgentRuntime(FakeLLMClient()))
+    message = "create_todo " + json.dumps({"title": "Buy milk", "priority": "high", "recurrence": "every Friday"})
+    reply = client.post("/chat", json={"message": message}).json()
+    assert reply["response"].startswith("SUCCESS: Created ") and reply["response"].endswith(" Buy milk [high, every Friday]")
+
+    tasks = client.get("/tasks").json()
+    assert [(t["title"], t["priority"], t["recurrence_rule"]) for t in tasks] == [("Buy milk", "high", "every Friday")]
+
+def test_conversations_are_resumed(client: TestClient):
+    llm = FakeLLMClient(respond=lambda chat, message: f"{len(chat.history) // 2 + 1}: {message}")
+    runtime = AgentRuntime(llm)
+    use_runtime(runtime)
+    first = client.post("/chat", json={"message": "hello"}).json()
+    second = client.post("/chat", json={"message": "again", "conversation_id": first["conversation_id"]}).json()
+    other = client.post("/chat", json={"message": "hi"}).json()
+
+    assert (first["response"], second["response"], other["response"]) == ("1: hello", "2: again", "1: hi")
+    assert second["conversation_id"] == first["conversation_id"] != other["conversation_id"]
+    assert llm.chats_started == 2
+    assert runtime.stats()["resumed"] == 1
+
+def test_conversation_store_evicts_lru_and_idle():
+    store = ConversationStore(max_conversations=2, idle_ttl=60)
+    a = store.get_or_create("a", object)
+    store.get_or_create("b", object)
+    store.get_or_create("a", object)
+    store.get_or_create("c", object)
+    assert len(store) == 2 and store.get_or_create("a", object) is a
+    assert store.stats()["evicted"] == 1
+
+    a.last_used -= 120
+    store._conversations["c"].last_used -= 120
+    store.get_or_create("d", object)
+    assert set(store._conversations) == {"d"}
+
+def test_disabled_and_failing_clients(session: Session):
+    assert TodoAgent(session, AgentRuntime(None)).process_message("hi") == DISABLED_MESSAGE
+
+    def boom(chat, message):
+        raise RuntimeError("quota exceeded")
+    reply = asyncio.run(AgentRuntime(FakeLLMClient(respond=boom)).process_message(session, "hi", "c1"))
+    assert reply.conversation_id == "c1"
+    assert "quota exceeded" in reply.response
+
+class LoopingChat:
+    """Gemini-style chat whose model asks for a tool on every turn."""
+
+    def __init__(self):
+        self.history = [
+            genai.protos.Content(role="user", parts=[genai.protos.Part(text="earlier")]),
+            genai.protos.Content(role="model", parts=[genai.protos.Part(text="reply")]),
+        ]
+        self.sent = 0
+
+    async def send_message_async(self, content, stream=False):
+        self.sent += 1
+        call = genai.protos.Part(function_call=genai.protos.FunctionCall(name="get_todos", args={}))
+        self.history += [content, genai.protos.Content(role="model", parts=[call])]
+
+        async def chunks():
+            yield genai.protos.Content(parts=[call])
+        return chunks()
+
+def test_tool_round_limit_leaves_a_resumable_history():
+    chat = LoopingChat()
+
+    async def call_tool(name, args):
+        return "No tasks found."
+
+    async def collect():
+        return [event async for event in GeminiClient().stream(chat, "loop", call_tool)]
+
+    events = asyncio.run(collect())
+    assert chat.sent == MAX_TOOL_ROUNDS
+    assert events[-1] == ("text", {"delta": TOOL_ROUNDS_EXCEEDED})
+    # Earlier turns kept; this message reduced to a plain user/model exchange
+    assert [(c.role, c.parts[0].text) for c in chat.history] == [
+        ("user", "earlier"), ("model", "reply"), ("user", "loop"), ("model", TOOL_ROUNDS_EXCEEDED),
+    ]
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_stream_reports_tool_progress_and_text(client: TestClient):
+    use_runtime(AgentRuntime(FakeLLMClient()))
+    message = "create_todo " + json.dumps({"title": "Water plants"})
+    with client.stream("POST", "/chat/stream", json={"message": message}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.read().decode())
+
+    names = [name for name, _ in events]
+    assert names[:3] == ["conversation", "tool_call", "tool_result"]
+    assert names[-1] == "done" and set(names[3:-1]) == {"text"}
+    assert events[1][1] == {"name": "create_todo", "args": {"title": "Water plants"}}
+    done = events[-1][1]
+    assert done["response"] == "".join(data["delta"] for name, data in events if name == "text")
+    assert done["response"].startswith("SUCCESS: Created ") and done["response"].endswith(" Water plants")
+    assert done["conversation_id"] == events[0][1]["conversation_id"]
+    assert [t["title"] for t in client.get("/tasks").json()] == ["Water plants"]
+
+def call(client: TestClient, tool: str, **args) -> str:
+    return client.post("/chat", json={"message": f"{tool} {json.dumps(args)}"}).json()["response"]
+
+def test_tool_output_is_paged_with_short_ids(client: TestClient, session: Session):
+    runtime = AgentRuntime(FakeLLMClient(), fast_path=False)
+    use_runtime(runtime)
+    client.post("/tasks/bulk", json=[{"title": f"Chore {i:02d}", "priority": "high"} for i in range(25)])
+
+    first = call(client, "get_todos").splitlines()
+    assert first[0] == "Page 1, ids are 8-char prefixes:"
+    assert len(first) == 12 and first[-1] == 'More available: get_todos(status="pending", page=2)'
+    assert all(len(line.split(" ", 1)[0]) == 8 and line.endswith("[high]") for line in first[1:11])
+    last = call(client, "get_todos", page=3).splitlines()
+    assert len(last) == 6 and not last[-1].startswith("More")
+    assert call(client, "get_todos", page=4) == "No more results (page 4)."
+    assert call(client, "search_todos", query="chore", page=3).count("\n") == 5
+
+    short = first[1].split(" ", 1)[0]
+    assert call(client, "update_todo", id=short, priority="low").startswith(f"SUCCESS: Updated {short} Chore")
+    task_id = TodoSkills.resolve_task_id(session, short)
+    assert client.get(f"/tasks/{task_id}").json()["priority"] == "low"
+
+    usage = runtime.stats()["tool_output"]
+    assert usage["get_todos"]["calls"] == 3
+    assert 0 < usage["get_todos"]["max_tokens"] <= TOKEN_BUDGET
+
+def test_resolve_task_id_and_budget(session: Session):
+    tasks = [Task(id=f"abcd{i}000-0000-0000-0000-000000000000", title="x" * 200) for i in range(2)]
+    session.add_all(tasks)
+    session.commit()
+    assert TodoSkills.resolve_task_id(session, "abcd0") == tasks[0].id
+    assert TodoSkills.resolve_task_id(session, "ABCD1000") == tasks[1].id
+    assert TodoSkills.resolve_task_id(session, "abcd") is None  # ambiguous
+    assert TodoSkills.resolve_task_id(session, "abc") is None  # too short
+    assert TodoSkills.resolve_task_id(session, "abcd%") is None
+
+    text = task_page(tasks, 1, "next()", "none", budget=50)
+    assert text.splitlines()[1:] == [task_line(tasks[0]), "(1 more on this page omitted to save space)"]
+    assert len(task_line(tasks[0])) < 80
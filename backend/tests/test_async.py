@@ -0,0 +1,30 @@
+import asyncio
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from ..async_skills import AsyncTodoSkills
+from ..database import to_async_url
+from ..models import TaskCreate, TaskUpdate, TaskStatus
+from ..skills import TodoSkills
+
+def test_async_skills_share_sync_rules(engine, session: Session):
+    async_engine = create_async_engine(to_async_url(str(engine.url)))
+
+    async def scenario():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            task = await AsyncTodoSkills.create_task(async_session, TaskCreate(title="Async", tags='["A"]'))
+            await AsyncTodoSkills.update_task(async_session, task.id, TaskUpdate(status=TaskStatus.IN_PROGRESS))
+            listed = await AsyncTodoSkills.list_tasks(async_session, tags="a")
+            hits = await AsyncTodoSkills.search_tasks(async_session, "async")
+        await async_engine.dispose()
+        return task, listed, hits
+
+    task, listed, hits = asyncio.run(scenario())
+    assert [t.id for t in listed] == [task.id] == [t.id for t in hits]
+    # Visible to the sync API used by the MCP server and CLI callers
+    assert TodoSkills.list_tasks(session, status=TaskStatus.IN_PROGRESS)[0].id == task.id
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./backend/database.db") == "sqlite+aiosqlite:///./backend/database.db"
+    assert to_async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert to_async_url("postgres://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
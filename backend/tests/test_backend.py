@@ -1,35 +1,5 @@
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
-import pytest
-from ..main import app, get_session
-from ..models import Task
-
-# In-memory SQLite for testing
-sqlite_file_name = "database.db"
-sqlite_url = "sqlite://" # In-memory
-
-engine = create_engine(
-    sqlite_url, 
-    connect_args={"check_same_thread": False}, 
-    poolclass=StaticPool
-)
-
-@pytest.fixture(name="session")
-def session_fixture():
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-    SQLModel.metadata.drop_all(engine)
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
-    app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+from sqlmodel import Session
 
 def test_create_task(client: TestClient):
     response = client.post(
@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from datetime import datetime, timedelta
+from ..async_skills import AsyncTodoSkills
+from ..database import to_async_url
+from ..models import Task, TaskTag, TaskStat, TaskListVersion
+from ..skills import TodoSkills
+
+def test_bulk_create_reports_per_item_results(client: TestClient):
+    response = client.post("/tasks/bulk", json=[
+        {"title": "One", "tags": '["a"]'},
+        {"title": ""},
+        {"title": "Three", "priority": "urgent"},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["error"]
+
+    titles = {t["title"] for t in client.get("/tasks").json()}
+    assert titles == {"One", "Three"}
+    assert [t["title"] for t in client.get("/tasks", params={"tags": "a"}).json()] == ["One"]
+
+def test_bulk_update(client: TestClient):
+    ids = [r["id"] for r in client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]).json()]
+
+    results = client.patch("/tasks/bulk", json=[
+        {"id": ids[0], "status": "in_progress"},
+        {"id": ids[1], "title": "B2", "tags": '["x"]'},
+        {"id": "missing", "title": "Nope"},
+        {"id": ids[0], "priority": "bogus"},
+    ]).json()
+    assert [r["ok"] for r in results] == [True, True, False, False]
+
+    assert client.get(f"/tasks/{ids[0]}").json()["status"] == "in_progress"
+    second = client.get(f"/tasks/{ids[1]}").json()
+    assert second["title"] == "B2" and second["tags"] == '["x"]'
+
+def test_bulk_complete_spawns_recurrences(client: TestClient):
+    due = datetime.utcnow()
+    ids = [r["id"] for r in client.post("/tasks/bulk", json=[
+        {"title": "Plain"},
+        {"title": "Daily", "recurrence_rule": "daily", "due_date": due.isoformat()},
+    ]).json()]
+
+    results = client.post("/tasks/bulk/complete", json={"ids": ids + ["missing"]}).json()
+    assert [r["ok"] for r in results] == [True, True, False]
+
+    pending = client.get("/tasks", params={"status": "pending"}).json()
+    assert [t["title"] for t in pending] == ["Daily"]
+    new_due = datetime.fromisoformat(pending[0]["due_date"])
+    assert abs((new_due - (due + timedelta(days=1))).total_seconds()) < 1
+
+    # Completing again is a no-op, not a second occurrence
+    client.post("/tasks/bulk/complete", json={"ids": ids})
+    assert len(client.get("/tasks", params={"status": "pending"}).json()) == 1
+
+def test_bulk_delete(client: TestClient, session: Session):
+    ids = [r["id"] for r in client.post("/tasks/bulk", json=[
+        {"title": "Keep"}, {"title": "Drop", "tags": '["t"]'},
+    ]).json()]
+
+    results = client.request("DELETE", "/tasks/bulk", json={"ids": [ids[1], "missing"]}).json()
+    assert [r["ok"] for r in results] == [True, False]
+    assert [t["title"] for t in client.get("/tasks").json()] == ["Keep"]
+    assert session.exec(select(TaskTag)).all() == []
+    assert client.get("/search", params={"query": "drop"}).json() == []
+
+def snapshot(engine):
+    """Everything a bulk write touches, read on a fresh connection."""
+    with Session(engine) as session:
+        return (
+            sorted((t.title, t.status, t.tags) for t in session.exec(select(Task))),
+            sorted((t.task_id, t.tag) for t in session.exec(select(TaskTag))),
+            sorted((s.dimension, s.key, s.count) for s in session.exec(select(TaskStat))),
+            [v.version for v in session.exec(select(TaskListVersion))],
+        )
+
+def fail_before_commit(monkeypatch):
+    # Runs after the rows, tags and counters are written, just before commit
+    def boom(session, task_ids):
+        raise RuntimeError("disk I/O error")
+    monkeypatch.setattr(TodoSkills, "_record_changes", staticmethod(boom))
+
+def test_failed_bulk_update_commits_nothing(transactional_engine, monkeypatch):
+    with Session(transactional_engine) as session:
+        results = TodoSkills.bulk_create_tasks(session, [{"title": "A"}, {"title": "B", "tags": '["x"]'}])
+    ids = [r.id for r in results]
+    before = snapshot(transactional_engine)
+
+    fail_before_commit(monkeypatch)
+    with Session(transactional_engine) as session:
+        with pytest.raises(RuntimeError):
+            TodoSkills.bulk_update_tasks(session, [
+                {"id": ids[0], "status": "completed"},
+                {"id": ids[1], "title": "B2", "tags": '["y"]'},
+                {"id": "missing", "title": "Nope"},
+            ])
+    assert snapshot(transactional_engine) == before
+
+def test_failed_async_bulk_create_commits_nothing(transactional_engine, monkeypatch):
+    before = snapshot(transactional_engine)
+    fail_before_commit(monkeypatch)
+    async_engine = create_async_engine(to_async_url(str(transactional_engine.url)), poolclass=NullPool)
+
+    async def scenario():
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                await AsyncTodoSkills.bulk_create_tasks(session, [
+                    {"title": "One", "tags": '["a"]'}, {"title": ""}, {"title": "Three"},
+                ])
+        finally:
+            await async_engine.dispose()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
+    assert snapshot(transactional_engine) == before
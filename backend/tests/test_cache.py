@@ -0,0 +1,108 @@
+import fnmatch
+import time
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from ..cache import task_cache, MemoryCache, RedisCache, TaskCache
+from ..crud import delete_task
+from ..models import TaskUpdate
+from ..skills import TodoSkills
+
+class DictRedis:
+    """Tiny redis-py stand-in: just the commands RedisCache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = str(value).encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def scan_iter(self, pattern):
+        return [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+
+def test_repeated_reads_hit_cache(client: TestClient):
+    task_id = client.post("/tasks", json={"title": "Cached"}).json()["id"]
+    before = client.get("/metrics").json()["cache"]
+
+    for _ in range(3):
+        client.get("/tasks", params={"status": "pending"})
+        client.get(f"/tasks/{task_id}")
+    after = client.get("/metrics").json()["cache"]
+
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 4
+
+def test_skill_writes_invalidate_reads(client: TestClient, session: Session):
+    task_id = client.post("/tasks", json={"title": "Before"}).json()["id"]
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Before"
+    assert [t["title"] for t in client.get("/tasks").json()] == ["Before"]
+
+    TodoSkills.update_task(session, task_id, TaskUpdate(title="After"))
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "After"
+    assert [t["title"] for t in client.get("/tasks").json()] == ["After"]
+    assert client.get("/search", params={"query": "after"}).json()[0]["id"] == task_id
+
+    TodoSkills.complete_task(session, task_id)
+    assert client.get(f"/tasks/{task_id}").json()["status"] == "completed"
+
+    delete_task(session, task_id)
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    assert client.get("/tasks").json() == []
+
+def test_writes_from_another_process_are_not_served_stale(client: TestClient, session: Session, monkeypatch):
+    task_id = client.post("/tasks", json={"title": "Before"}).json()["id"]
+    list_etag = client.get("/tasks").headers["ETag"]
+    task_etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+    client.get("/search", params={"query": "before"})
+
+    # Another process writes to the database but cannot touch this cache
+    monkeypatch.setattr(task_cache, "invalidate", lambda task_ids=(): None)
+    TodoSkills.update_task(session, task_id, TaskUpdate(title="After"))
+
+    listed = client.get("/tasks", headers={"If-None-Match": list_etag})
+    assert listed.status_code == 200 and [t["title"] for t in listed.json()] == ["After"]
+    shown = client.get(f"/tasks/{task_id}", headers={"If-None-Match": task_etag})
+    assert shown.status_code == 200 and shown.json()["title"] == "After"
+    assert client.get("/search", params={"query": "after"}).json()[0]["id"] == task_id
+
+def test_memory_cache_lru_and_ttl():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=None)
+    cache.set("b", 2, ttl=None)
+    cache.get("a")
+    cache.set("c", 3, ttl=None)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+    cache.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+def test_redis_compatible_backend():
+    cache = TaskCache(RedisCache(DictRedis()), ttl=30)
+    generation = cache.generation()
+    key = cache.query_key("tasks", generation, status="pending", limit=10)
+    cache.set(key, [{"id": "1"}], generation)
+    cache.set(cache.task_key("1"), {"id": "1"}, generation)
+    assert cache.get(key) == [{"id": "1"}]
+
+    cache.invalidate(["1"])
+    assert cache.get(cache.task_key("1")) is None
+    assert cache.get(cache.query_key("tasks", cache.generation(), status="pending", limit=10)) is None
+
+def test_stale_read_is_not_stored():
+    cache = TaskCache(MemoryCache())
+    generation = cache.generation()
+    cache.invalidate(["1"])  # a write lands while the read is in flight
+    cache.set(cache.task_key("1"), {"id": "1", "title": "stale"}, generation)
+    assert cache.get(cache.task_key("1")) is None
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from ..async_skills import AsyncTodoSkills
+from ..changes import ChangeFeed
+from ..database import to_async_url
+from ..models import TaskCreate
+from ..skills import TodoSkills
+from .. import skills
+
+def test_feed_reports_latest_state_per_task(client: TestClient):
+    start = client.get("/tasks/changes").json()
+    assert start == {"changes": [], "next": 0, "resync": False}
+
+    kept = client.post("/tasks", json={"title": "Kept"}).json()
+    gone = client.post("/tasks", json={"title": "Gone"}).json()
+    client.patch(f"/tasks/{kept['id']}", json={"title": "Renamed"})
+    client.delete(f"/tasks/{gone['id']}")
+
+    feed = client.get("/tasks/changes", params={"since": 0, "timeout": 0}).json()
+    assert [(c["task_id"], c["op"]) for c in feed["changes"]] == [(kept["id"], "upsert"), (gone["id"], "delete")]
+    assert feed["changes"][0]["task"]["title"] == "Renamed"
+    assert feed["changes"][1]["task"] is None
+    assert feed["next"] == 4 and not feed["resync"]
+
+    idle = client.get("/tasks/changes", params={"since": feed["next"], "timeout": 0}).json()
+    assert idle == {"changes": [], "next": 4, "resync": False}
+
+def test_bulk_writes_are_logged(client: TestClient):
+    created = client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]).json()
+    client.post("/tasks/import", content='{"title": "C"}\n')
+    feed = client.get("/tasks/changes", params={"since": 0, "limit": 2, "timeout": 0}).json()
+    assert {c["task_id"] for c in feed["changes"]} == {item["id"] for item in created}
+    rest = client.get("/tasks/changes", params={"since": feed["next"], "timeout": 0}).json()
+    assert [c["task"]["title"] for c in rest["changes"]] == ["C"]
+
+def test_compaction_forces_resync(client: TestClient, session: Session):
+    for i in range(3):
+        client.post("/tasks", json={"title": f"Task {i}"})
+    assert TodoSkills.compact_changes(session, datetime.utcnow() + timedelta(seconds=1)) == 2
+    # The newest row survives, so the position is still known
+    assert client.get("/tasks/changes").json()["next"] == 3
+    assert client.get("/tasks/changes", params={"since": 2, "timeout": 0}).json()["resync"] is False
+    stale = client.get("/tasks/changes", params={"since": 1, "timeout": 0}).json()
+    assert stale == {"changes": [], "next": 3, "resync": True}
+    # A cursor from a different (e.g. reset) database is also stale
+    assert client.get("/tasks/changes", params={"since": 99, "timeout": 0}).json()["resync"] is True
+
+def test_long_poll_wakes_on_commit(engine, session: Session, monkeypatch):
+    feed = ChangeFeed(poll_interval=30)
+    monkeypatch.setattr(skills, "change_feed", feed)
+    async_engine = create_async_engine(to_async_url(str(engine.url)), poolclass=NullPool)
+
+    async def scenario():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            async def load(since):
+                result = await AsyncTodoSkills.list_changes(async_session, since)
+                await async_session.commit()
+                return result
+
+            waiter = asyncio.create_task(feed.long_poll(load, 0, timeout=10))
+            await asyncio.sleep(0.1)
+            started = time.monotonic()
+            TodoSkills.create_task(session, TaskCreate(title="Wake up"))
+            result = await waiter
+            elapsed = time.monotonic() - started
+        await async_engine.dispose()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(scenario())
+    assert [c.task["title"] for c in result.changes] == ["Wake up"]
+    assert elapsed < 5
+
+def test_stream_emits_position_then_changes(session: Session):
+    feed = ChangeFeed(poll_interval=30)
+    TodoSkills.create_task(session, TaskCreate(title="First"))
+
+    async def load(since):
+        return TodoSkills.list_changes(session, since)
+
+    async def read():
+        stream = feed.stream(load, None)
+        chunks = [await stream.__anext__()]
+        TodoSkills.create_task(session, TaskCreate(title="Second"))
+        feed.notify()
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    position, changes = asyncio.run(read())
+    assert position == 'id: 1\nevent: position\ndata: {"next":1}\n\n'
+    assert changes.startswith("id: 2\nevent: changes\n")
+    assert '"title":"Second"' in changes
+
+def test_compaction_survives_errors():
+    feed = ChangeFeed(compact_interval=0.01)
+    calls = []
+
+    async def compact(before: datetime) -> int:
+        calls.append(before)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return 2
+
+    async def scenario():
+        feed.start(compact)
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        await feed.stop()
+
+    asyncio.run(scenario())
+    assert feed.compaction_errors == 1
+    assert feed.compacted >= 4
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+import pytest
+from ..database import build_engine, pool_stats, _engine_options
+
+def test_prod_profile_tunes_sqlite(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'prod.db'}", profile="prod")
+    assert engine.echo is False
+    with Session(engine) as session:
+        assert session.exec(text("PRAGMA journal_mode")).one()[0] == "wal"
+        assert session.exec(text("PRAGMA synchronous")).one()[0] == 1  # NORMAL
+        assert session.exec(text("PRAGMA busy_timeout")).one()[0] == 5000
+        assert session.exec(text("PRAGMA mmap_size")).one()[0] > 0
+
+        stats = pool_stats(engine)["engine"]
+        assert stats["checked_out"] == 1
+        assert stats["checkouts"] >= 1
+    assert pool_stats(engine)["engine"]["checked_out"] == 0
+    engine.dispose()
+
+def test_profiles_for_postgres():
+    prod = _engine_options("postgresql://u:p@db/todo", "prod", asynchronous=False)
+    assert prod["echo"] is False and prod["pool_pre_ping"] is True
+    assert prod["pool_size"] == 10 and prod["max_overflow"] == 20
+    assert _engine_options("postgresql://u:p@db/todo", "dev", asynchronous=False)["echo"] is True
+    with pytest.raises(ValueError):
+        _engine_options("postgresql://u:p@db/todo", "staging", asynchronous=False)
+
+def test_in_memory_sqlite_keeps_default_pool():
+    assert "poolclass" not in _engine_options("sqlite://", "prod", asynchronous=False)
+
+def test_metrics_exposes_pool_stats(client: TestClient):
+    stats = client.get("/metrics").json()["pool"]
+    assert {"sync", "async"} <= set(stats)
+    assert "checked_out" in stats["sync"] and "max_wait_ms" in stats["sync"]
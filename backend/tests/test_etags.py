@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+def test_list_etag_round_trip(client: TestClient):
+    client.post("/tasks", json={"title": "Task 1"})
+    first = client.get("/tasks")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    cached = client.get("/tasks", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    # Weak and list forms of the validator still match
+    assert client.get("/tasks", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+def test_list_etag_changes_on_write(client: TestClient):
+    task_id = client.post("/tasks", json={"title": "Task 1"}).json()["id"]
+    etag = client.get("/tasks").headers["ETag"]
+
+    client.patch(f"/tasks/{task_id}", json={"title": "Renamed"})
+    response = client.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["title"] == "Renamed"
+
+def test_list_etag_depends_on_query(client: TestClient):
+    client.post("/tasks", json={"title": "Task 1"})
+    etag = client.get("/tasks").headers["ETag"]
+    response = client.get("/tasks", params={"status": "completed"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_task_etag_round_trip(client: TestClient):
+    task_id = client.post("/tasks", json={"title": "Task 1"}).json()["id"]
+    etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post(f"/tasks/{task_id}/complete")
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_task_etag_missing_task(client: TestClient):
+    response = client.get("/tasks/missing", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
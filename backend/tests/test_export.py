@@ -0,0 +1,60 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+import csv
+import io
+import json
+from ..skills import TodoSkills
+from ..export import EXPORT_COLUMNS
+
+def seed(client: TestClient):
+    client.post("/tasks", json={"title": "Alpha", "priority": "high", "tags": "work", "due_date": "2025-01-02T09:00:00"})
+    client.post("/tasks", json={"title": "Beta, with comma", "priority": "low"})
+    client.post("/tasks", json={"title": "Gamma", "priority": "high", "description": "line one\nline two"})
+
+def test_export_ndjson(client: TestClient):
+    seed(client)
+    response = client.get("/tasks/export", params={"sort_by": "title"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Alpha", "Beta, with comma", "Gamma"]
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+    assert rows[0]["priority"] == "high"
+    assert rows[0]["due_date"] == "2025-01-02T09:00:00"
+    assert rows[1]["due_date"] is None
+
+def test_export_csv(client: TestClient):
+    seed(client)
+    response = client.get("/tasks/export", params={"format": "csv", "sort_by": "title"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Alpha", "Beta, with comma", "Gamma"]
+    assert rows[2]["description"] == "line one\nline two"
+    assert rows[1]["due_date"] == ""
+
+def test_export_applies_list_filters(client: TestClient):
+    seed(client)
+    listed = client.get("/tasks", params={"priority": "high"}).json()
+    response = client.get("/tasks/export", params={"priority": "high"})
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in exported] == [task["id"] for task in listed]
+
+    tagged = client.get("/tasks/export", params={"tags": "work"}).text.splitlines()
+    assert [json.loads(line)["title"] for line in tagged] == ["Alpha"]
+
+def test_export_empty_csv_has_header(client: TestClient):
+    response = client.get("/tasks/export", params={"format": "csv"})
+    assert response.text.strip() == ",".join(EXPORT_COLUMNS)
+
+def test_export_rejects_bad_parameters(client: TestClient):
+    assert client.get("/tasks/export", params={"format": "xml"}).status_code == 422
+    assert client.get("/tasks/export", params={"sort_by": "description"}).status_code == 400
+
+def test_export_rows_are_batched(session: Session):
+    for i in range(5):
+        TodoSkills.bulk_create_tasks(session, [{"title": f"Task {i}"}])
+    statement = TodoSkills.export_statement(sort_by="title", sort_order="asc")
+    batches = list(TodoSkills.export_rows(session, statement, batch_size=2))
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert [row.title for rows in batches for row in rows] == [f"Task {i}" for i in range(5)]
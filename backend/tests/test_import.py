@@ -0,0 +1,82 @@
+from fastapi.testclient import TestClient
+import asyncio
+import json
+from ..importer import iter_lines, iter_records
+
+def ndjson(*records) -> str:
+    return "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n"
+
+def test_import_ndjson_reports_bad_lines(client: TestClient):
+    body = ndjson(
+        {"title": "First", "priority": "high", "tags": "work,home"},
+        "{not json",
+        {"title": ""},
+        "",
+        [1, 2],
+        {"title": "Second", "due_date": "2025-02-01T09:00:00"},
+    )
+    response = client.post("/tasks/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [2, 3, 5]
+
+    titles = sorted(task["title"] for task in client.get("/tasks").json())
+    assert titles == ["First", "Second"]
+    tagged = client.get("/tasks", params={"tags": "home"}).json()
+    assert [task["title"] for task in tagged] == ["First"]
+    assert json.loads(tagged[0]["tags"]) == ["work", "home"]
+
+def test_import_csv(client: TestClient):
+    body = (
+        "title,priority,description,tags\r\n"
+        "Plain,low,,\r\n"
+        '"Quoted, title",high,"spans\r\ntwo lines",work\r\n'
+        "Too,many,fields,here,extra\r\n"
+        "Bad priority,whenever,,\r\n"
+    )
+    response = client.post("/tasks/import", content=body, headers={"Content-Type": "text/csv"})
+    result = response.json()
+    assert result["imported"] == 2
+    assert [error["line"] for error in result["errors"]] == [5, 6]
+
+    tasks = {task["title"]: task for task in client.get("/tasks").json()}
+    assert tasks["Plain"]["description"] is None
+    assert tasks["Quoted, title"]["description"] == "spans\ntwo lines"
+    assert tasks["Quoted, title"]["priority"] == "high"
+
+def test_import_ignores_client_ids(client: TestClient):
+    body = ndjson({"id": "fixed", "title": "One"}, {"id": "fixed", "title": "Two"})
+    assert client.post("/tasks/import", content=body).json()["imported"] == 2
+    assert client.get("/tasks/fixed").status_code == 404
+
+def test_import_round_trips_export(client: TestClient):
+    client.post("/tasks", json={"title": "Exported", "tags": "a,b", "priority": "urgent"})
+    exported = client.get("/tasks/export", params={"format": "csv"}).text
+    result = client.post("/tasks/import", params={"format": "csv"}, content=exported).json()
+    assert result == {"imported": 1, "failed": 0, "errors": []}
+    copies = client.get("/tasks", params={"tags": "b", "priority": "urgent"}).json()
+    assert len(copies) == 2
+
+def test_iter_lines_handles_split_chunks():
+    data = "é first\r\nsecond\nthird".encode()
+
+    async def chunks():
+        for i in range(len(data)):
+            yield data[i:i + 1]
+
+    async def collect():
+        return [item async for item in iter_lines(chunks())]
+
+    assert asyncio.run(collect()) == [(1, "é first"), (2, "second"), (3, "third")]
+
+def test_iter_records_unterminated_csv_quote():
+    async def lines():
+        for item in [(1, "title"), (2, '"open'), (3, "still open")]:
+            yield item
+
+    async def collect():
+        return [item async for item in iter_records(lines(), "csv")]
+
+    assert asyncio.run(collect()) == [(2, None, "Unterminated quoted field")]
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+from fastapi.testclient import TestClient
+from ..main import app
+from ..agent import AgentRuntime, FakeLLMClient, get_agent_runtime
+from ..models import TaskPriority, TaskStatus
+from ..intents import parse, Intent
+
+MONDAY = datetime(2025, 1, 6, 10, 0)
+
+def test_parse_add():
+    assert parse("add buy milk tomorrow high priority", MONDAY) == Intent("create", {
+        "title": "buy milk", "priority": TaskPriority.HIGH, "due_date": datetime(2025, 1, 7)
+    })
+    assert parse("Add Call Mom on Friday at 5pm", MONDAY).args == {
+        "title": "Call Mom", "due_date": datetime(2025, 1, 10, 17, 0)
+    }
+    assert parse("add standup daily at 9am", MONDAY).args == {
+        "title": "standup", "recurrence_rule": "daily", "due_date": datetime(2025, 1, 7, 9, 0)
+    }
+    assert parse("remind me to renew passport by March 3rd", MONDAY).args == {
+        "title": "renew passport", "due_date": datetime(2025, 3, 3)
+    }
+    assert parse("add buy 2 apples", MONDAY).args == {"title": "buy 2 apples"}
+
+def test_parse_other_commands_and_fallthrough():
+    assert parse("list pending") == Intent("list", {"status": TaskStatus.PENDING})
+    assert parse("show all tasks") == Intent("list", {"status": None})
+    assert parse("mark Buy milk as done") == Intent("complete", {"target": "Buy milk"})
+    assert parse("find tasks about taxes") == Intent("search", {"query": "taxes"})
+    for message in ("how are you?", "can you add milk?", "find time to exercise", "add gym every single day", "plan my week"):
+        assert parse(message, MONDAY) is None, message
+    # Destructive or loosely worded messages always go to the model
+    for message in ("delete task 1234abcd", "remove 1234abcd", "new idea: should we delete task 1234abcd",
+                    "new phone case"):
+        assert parse(message, MONDAY) is None, message
+
+def test_fast_path_skips_the_model(client: TestClient):
+    llm = FakeLLMClient()
+    runtime = AgentRuntime(llm)
+    app.dependency_overrides[get_agent_runtime] = lambda: runtime
+
+    added = client.post("/chat", json={"message": "add Buy milk tomorrow high priority"}).json()
+    task = client.get("/tasks").json()[0]
+    assert (task["title"], task["priority"]) == ("Buy milk", "high")
+    assert added["response"].startswith(f"Added:\n- {task['id'][:8]} Buy milk [high, due ")
+
+    listed = client.post("/chat", json={"message": "list pending", "conversation_id": added["conversation_id"]}).json()
+    assert listed["response"].startswith(f"- {task['id'][:8]} Buy milk")
+    done = client.post("/chat", json={"message": "complete buy milk"}).json()
+    assert done["response"].startswith("Completed:")
+    assert client.get(f"/tasks/{task['id']}").json()["status"] == "completed"
+
+    # Ambiguous or unknown targets go to the model
+    missing = client.post("/chat", json={"message": "complete something else"}).json()
+    assert missing["response"] == "You said: complete something else"
+    sent = [text for c in runtime.conversations._conversations.values() for role, text in c.chat.history if role == "user"]
+    assert sent == ["complete something else"]
+
+    stats = runtime.stats()["fast_path"]
+    assert (stats["messages"], stats["hits"]) == (4, 3)
+    assert stats["by_intent"] == {"create": 1, "list": 1, "complete": 1}
+    assert stats["p50_ms"] is not None
+
+def test_fast_path_works_without_a_model(client: TestClient):
+    app.dependency_overrides[get_agent_runtime] = lambda: AgentRuntime(None)
+    reply = client.post("/chat", json={"message": "add water plants every 3 days"}).json()
+    assert reply["response"].startswith("Added:") and reply["conversation_id"] is None
+    assert client.get("/tasks").json()[0]["recurrence_rule"] == "every 3 days"
+    assert "disabled" in client.post("/chat", json={"message": "plan my week"}).json()["response"]
@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from sqlmodel import Session, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from .. import mcp_tools
+from ..database import to_async_url
+from ..models import Task, TaskStatus
+
+@pytest.fixture(autouse=True)
+def mcp_engine(engine):
+    # NullPool: each call() runs on its own event loop
+    mcp_tools.scope.use(create_async_engine(to_async_url(str(engine.url)), poolclass=NullPool))
+    yield
+    asyncio.run(mcp_tools.scope.dispose())
+    mcp_tools.scope.use(None)
+
+def call(tool, *args, **kwargs):
+    return asyncio.run(getattr(mcp_tools, tool)(*args, **kwargs))
+
+def test_list_todos_pages_with_a_cursor():
+    call("create_todos", [{"title": f"Task {i}"} for i in range(5)])
+
+    first = call("list_todos", limit=2)
+    assert len(first["todos"]) == 2 and first["next_cursor"]
+    assert set(first["todos"][0]) == {"id", "title", "status", "priority", "due_date"}
+
+    seen = [t["id"] for t in first["todos"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = call("list_todos", cursor=cursor, limit=2)
+        seen += [t["id"] for t in page["todos"]]
+        cursor = page["next_cursor"]
+    assert len(seen) == len(set(seen)) == 5
+
+def test_list_todos_caps_the_page(monkeypatch):
+    monkeypatch.setattr(mcp_tools, "MAX_PAGE_SIZE", 3)
+    call("create_todos", [{"title": f"Task {i}"} for i in range(5)])
+    page = call("list_todos", limit=1000)
+    assert len(page["todos"]) == 3 and page["next_cursor"]
+
+def test_search_todos_pages_and_checks_the_query():
+    call("create_todos", [{"title": f"Groceries run {i}"} for i in range(3)] + [{"title": "Dentist"}])
+
+    first = call("search_todos", "groceries", limit=2)
+    assert len(first["todos"]) == 2 and first["next_cursor"]
+    rest = call("search_todos", "groceries", cursor=first["next_cursor"], limit=2)
+    assert len(rest["todos"]) == 1 and rest["next_cursor"] is None
+    assert {t["id"] for t in first["todos"]}.isdisjoint(t["id"] for t in rest["todos"])
+
+    with pytest.raises(ValueError):
+        call("search_todos", "dentist", cursor=first["next_cursor"])
+
+def test_batch_tools_report_per_item(session: Session):
+    created = call("create_todos", [
+        {"title": "Water plants", "recurrence": "daily", "due_date": "2025-01-06T09:00:00Z"},
+        {"title": ""},
+        {"title": "Call mom", "priority": "high"},
+    ])
+    assert [r["ok"] for r in created] == [True, False, True]
+    plants, mom = created[0]["id"], created[2]["id"]
+    assert session.get(Task, plants).recurrence_rule == "daily"
+
+    updated = call("update_todos", [
+        {"task_id": mom, "title": "Call mum", "status": "in_progress"},
+        {"task_id": "missing", "title": "Nope"},
+        {"task_id": mom, "priority": "bogus"},
+    ])
+    assert [r["ok"] for r in updated] == [True, False, False]
+    session.expire_all()
+    assert session.get(Task, mom).title == "Call mum"
+
+    completed = call("complete_todos", [plants, "missing"])
+    assert [r["ok"] for r in completed] == [True, False]
+    rows = session.exec(select(Task).where(Task.title == "Water plants")).all()
+    assert sorted(t.status for t in rows) == sorted([TaskStatus.COMPLETED, TaskStatus.PENDING])
+
+def test_batches_are_capped(monkeypatch):
+    monkeypatch.setattr(mcp_tools, "MAX_BATCH_ITEMS", 2)
+    with pytest.raises(ValueError):
+        call("complete_todos", ["a", "b", "c"])
+
+def test_single_tools():
+    task = call("create_todo", "Write report", due_date="2025-02-01")
+    assert call("update_todo", task["id"], status="completed")["status"] == "completed"
+    assert call("update_todo", "missing", title="x") == "Task not found"
+
+def test_concurrent_calls_do_not_lock_each_other_out(session: Session):
+    async def client(number):
+        created = await mcp_tools.create_todo(f"Client {number}")
+        await mcp_tools.update_todo(created["id"], priority="high")
+        return await mcp_tools.list_todos(limit=5)
+
+    async def scenario():
+        return await asyncio.gather(*(client(n) for n in range(20)))
+
+    pages = asyncio.run(scenario())
+    assert all(page["todos"] for page in pages)
+    assert len(session.exec(select(Task).where(Task.priority == "high")).all()) == 20
+
+def test_server_registers_async_tools():
+    from .. import mcp_server
+    tools = {tool.name for tool in asyncio.run(mcp_server.mcp.list_tools())}
+    assert tools == {
+        "list_todos", "create_todo", "create_todos", "update_todo",
+        "update_todos", "complete_todos", "search_todos",
+    }
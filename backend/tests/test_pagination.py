@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+import pytest
+from datetime import datetime, timedelta
+from ..skills import TodoSkills
+from ..models import Task
+
+def seed(client: TestClient, count: int = 7):
+    base = datetime(2025, 1, 1)
+    for i in range(count):
+        payload = {"title": f"Task {i % 3}", "priority": ["low", "high", None][i % 3]}
+        # Leave some due dates empty to exercise NULL ordering
+        if i % 3:
+            payload["due_date"] = (base + timedelta(days=i % 4)).isoformat()
+        client.post("/tasks", json=payload)
+
+def walk(client: TestClient, params: dict, page_size: int = 2):
+    seen = []
+    cursor = None
+    for _ in range(50):
+        query = dict(params, limit=page_size)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/tasks", params=query)
+        assert response.status_code == 200
+        seen.extend(t["id"] for t in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+    raise AssertionError("cursor walk did not terminate")
+
+@pytest.mark.parametrize("sort_by", [None, "title", "priority", "status", "due_date", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_pages_match_offset_listing(client: TestClient, sort_by, sort_order):
+    seed(client)
+    params = {"sort_order": sort_order}
+    if sort_by:
+        params["sort_by"] = sort_by
+
+    full = client.get("/tasks", params=params).json()
+    assert walk(client, params) == [t["id"] for t in full]
+
+def test_offset_mode_still_works(client: TestClient):
+    seed(client)
+    full = [t["id"] for t in client.get("/tasks").json()]
+    page = client.get("/tasks", params={"offset": 2, "limit": 3}).json()
+    assert [t["id"] for t in page] == full[2:5]
+
+def test_invalid_cursor_rejected(client: TestClient):
+    seed(client, 3)
+    response = client.get("/tasks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_cursor_for_other_sort_rejected(client: TestClient):
+    seed(client, 3)
+    first = client.get("/tasks", params={"sort_by": "title", "limit": 1})
+    cursor = first.headers["X-Next-Cursor"]
+    response = client.get("/tasks", params={"sort_by": "due_date", "cursor": cursor})
+    assert response.status_code == 400
+
+def test_unsupported_sort_by_rejected(client: TestClient):
+    response = client.get("/tasks", params={"sort_by": "description"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("sort_by", ["due_date", "priority", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_segments_use_index_ranges(session: Session, sort_by, sort_order):
+    last = Task(title="Anchor", due_date=datetime(2025, 1, 1))
+    field, descending = TodoSkills._resolve_sort(sort_by, sort_order)
+    statement = TodoSkills._list_statement(None, None, None, None, field, descending)
+    values = [getattr(last, field)]
+    if Task.__table__.c[field].nullable:
+        values.append(None)
+    for value in values:
+        for predicate in TodoSkills._keyset_segments(field, descending, value, last.id):
+            compiled = statement.where(predicate).limit(10).compile(
+                session.get_bind(), compile_kwargs={"literal_binds": True}
+            )
+            plan = " ".join(
+                row[-1] for row in session.exec(text(f"EXPLAIN QUERY PLAN {compiled}"))
+            )
+            assert "SEARCH task USING INDEX" in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
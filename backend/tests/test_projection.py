@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+import json
+from .. import serialization
+from ..models import Task, TaskStatus
+
+def test_fields_projection(client: TestClient):
+    client.post("/tasks", json={"title": "Task 1", "description": "long text", "priority": "high"})
+    tasks = client.get("/tasks", params={"fields": "title,priority"}).json()
+    # id and the sort key (created_at by default) always come along
+    assert tasks == [{"id": tasks[0]["id"], "title": "Task 1", "priority": "high", "created_at": tasks[0]["created_at"]}]
+
+def test_full_rows_match_task_model(client: TestClient):
+    created = client.post("/tasks", json={"title": "Task 1", "due_date": "2025-01-02T09:30:00.250000"}).json()
+    assert client.get("/tasks").json() == [created]
+
+def test_unknown_field_rejected(client: TestClient):
+    response = client.get("/tasks", params={"fields": "title,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+def test_projection_with_cursor(client: TestClient):
+    for i in range(5):
+        client.post("/tasks", json={"title": f"Task {i}"})
+    params = {"fields": "title", "sort_by": "title", "sort_order": "asc", "limit": 2}
+    titles = []
+    cursor = None
+    while True:
+        response = client.get("/tasks", params=dict(params, cursor=cursor) if cursor else params)
+        titles.extend(task["title"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert titles == [f"Task {i}" for i in range(5)]
+
+def test_stdlib_fallback_matches(monkeypatch):
+    task = Task(title="Task", status=TaskStatus.COMPLETED, due_date=datetime(2025, 1, 2, 9, 30, 0, 250000))
+    rows = [task.model_dump()]
+    fast = json.loads(serialization.dumps(rows))
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(serialization.dumps(rows)) == fast == jsonable_encoder(rows)
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+from datetime import datetime
+import pytest
+from ..query_plans import seed_tasks, check_query_plans, explain, WEEK_START
+from ..skills import TodoSkills
+
+@pytest.mark.parametrize("analyze", [False, True])
+def test_supported_query_shapes_use_indexes(session: Session, analyze):
+    seed_tasks(session, 500)
+    if analyze:
+        session.exec(text("ANALYZE"))
+    assert check_query_plans(session) == {}
+
+def test_due_reminders_use_reminder_index(session: Session):
+    plan = explain(session, TodoSkills._due_reminders_statement(WEEK_START))
+    assert any("ix_task_status_reminder_at_id" in step for step in plan), plan
+
+def test_due_date_range_filter(client: TestClient):
+    for day in (1, 5, 9):
+        client.post("/tasks", json={"title": f"Day {day}", "due_date": datetime(2025, 1, day).isoformat()})
+
+    response = client.get("/tasks", params={
+        "due_after": datetime(2025, 1, 1).isoformat(),
+        "due_before": datetime(2025, 1, 9).isoformat(),
+        "sort_by": "due_date",
+    })
+    assert [t["title"] for t in response.json()] == ["Day 1", "Day 5"]
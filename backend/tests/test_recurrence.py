@@ -0,0 +1,91 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from datetime import datetime
+from ..skills import TodoSkills
+from ..models import Task
+from .. import recurrence
+
+MONDAY = datetime(2025, 1, 6, 9, 0)
+
+def test_rule_forms():
+    assert recurrence.next_occurrence("daily", MONDAY) == datetime(2025, 1, 7, 9, 0)
+    assert recurrence.next_occurrence("every Friday", MONDAY) == datetime(2025, 1, 10, 9, 0)
+    assert recurrence.next_occurrence("every 2 weeks", MONDAY) == datetime(2025, 1, 20, 9, 0)
+    assert recurrence.next_occurrence("every monday and wednesday", MONDAY) == datetime(2025, 1, 8, 9, 0)
+    assert recurrence.next_occurrence("weekdays", datetime(2025, 1, 10, 9, 0)) == datetime(2025, 1, 13, 9, 0)
+    # Month rules clamp to the month end rather than skipping short months
+    assert recurrence.next_occurrence("monthly", datetime(2025, 1, 31)) == datetime(2025, 2, 28)
+    assert recurrence.next_occurrence("every 2 months", datetime(2024, 12, 31, 9, 0)) == datetime(2025, 2, 28, 9, 0)
+    assert recurrence.next_occurrence("monthly", datetime(2025, 1, 30)) == datetime(2025, 2, 28)
+    assert recurrence.next_occurrence("monthly", datetime(2025, 3, 31)) == datetime(2025, 4, 30)
+    assert recurrence.next_occurrence("monthly", datetime(2025, 4, 30)) == datetime(2025, 5, 30)
+    assert recurrence.occurrences("monthly", datetime(2025, 1, 30), datetime(2025, 4, 30), 5) == [
+        datetime(2025, 2, 28), datetime(2025, 3, 30), datetime(2025, 4, 30),
+    ]
+    assert recurrence.next_occurrence("RRULE:FREQ=MONTHLY;BYMONTHDAY=15", MONDAY) == datetime(2025, 1, 15, 9, 0)
+    assert recurrence.next_occurrence("FREQ=WEEKLY;BYDAY=FR", MONDAY) == datetime(2025, 1, 10, 9, 0)
+    # Legacy substring behaviour is kept
+    assert recurrence.next_occurrence("daily at 9am", MONDAY) == datetime(2025, 1, 7, 9, 0)
+    assert recurrence.next_occurrence("whenever", MONDAY) is None
+    assert recurrence.next_occurrence("FREQ=NEVER", MONDAY) is None
+    assert recurrence.compile_rule("every Friday") is recurrence.compile_rule("every Friday")
+
+def test_zero_interval_is_rejected():
+    # Would otherwise hang in rrule.after()
+    assert recurrence.compile_rule("FREQ=WEEKLY;INTERVAL=0") is None
+    assert recurrence.compile_rule("RRULE:FREQ=DAILY;INTERVAL=-1") is None
+    assert recurrence.next_occurrence("FREQ=WEEKLY;INTERVAL=0", MONDAY) is None
+    assert recurrence.next_occurrence("FREQ=WEEKLY;INTERVAL=2", MONDAY) == datetime(2025, 1, 20, 9, 0)
+
+def test_unsupported_rrules_are_rejected():
+    # EXDATE/RDATE make dateutil return an rruleset
+    assert recurrence.compile_rule("RRULE:FREQ=DAILY\nEXDATE:20250107T090000") is None
+    assert recurrence.compile_rule("RRULE:FREQ=DAILY\nRDATE:20250107T090000") is None
+    assert recurrence.compile_rule("FREQ=DAILY;BYDAY=XX") is None
+    assert recurrence.compile_rule("FREQ=WEEKLY;INTERVAL=2").period.days == 14
+    assert recurrence.compile_rule("FREQ=WEEKLY;COUNT=3").period is None
+
+def test_complete_spawns_next_from_rule(client: TestClient):
+    task = client.post("/tasks", json={
+        "title": "Review", "due_date": MONDAY.isoformat(), "recurrence_rule": "every Friday"
+    }).json()
+    client.post(f"/tasks/{task['id']}/complete")
+    pending = [t for t in client.get("/tasks").json() if t["status"] == "pending"]
+    assert [t["due_date"] for t in pending] == ["2025-01-10T09:00:00"]
+
+def test_materialize_moves_rule_to_series_head(client: TestClient, session: Session):
+    client.post("/tasks", json={
+        "title": "Standup", "tags": "work", "due_date": MONDAY.isoformat(), "recurrence_rule": "weekdays"
+    })
+    client.post("/tasks", json={"title": "One-off", "due_date": MONDAY.isoformat()})
+
+    created = TodoSkills.materialize_occurrences(session, datetime(2025, 1, 13, 23, 0))
+    assert created == 5
+    standups = session.exec(select(Task).where(Task.title == "Standup").order_by(Task.due_date)).all()
+    assert [t.due_date.day for t in standups] == [6, 7, 8, 9, 10, 13]
+    assert [t.recurrence_rule for t in standups] == [None] * 5 + ["weekdays"]
+    assert all(t.tags == '["work"]' for t in standups)
+    assert len(client.get("/tasks", params={"tags": "work"}).json()) == 6
+
+    # Nothing left to do until the horizon moves; completing an early one spawns nothing
+    assert TodoSkills.materialize_occurrences(session, datetime(2025, 1, 13, 23, 0)) == 0
+    client.post(f"/tasks/{standups[0].id}/complete")
+    assert client.get("/tasks/stats").json()["total"] == 7
+    assert TodoSkills.rebuild_stats(session) == {}
+
+def test_advance_overdue_skips_missed_occurrences(client: TestClient, session: Session):
+    late = client.post("/tasks", json={
+        "title": "Water plants", "due_date": datetime(2025, 1, 1, 8, 0).isoformat(), "recurrence_rule": "every 3 days"
+    }).json()
+    done = client.post("/tasks", json={
+        "title": "Done", "due_date": datetime(2025, 1, 1, 8, 0).isoformat(), "recurrence_rule": "daily",
+        "status": "completed"
+    }).json()
+    upcoming = client.post("/tasks", json={
+        "title": "Later", "due_date": datetime(2025, 2, 1, 8, 0).isoformat(), "recurrence_rule": "daily"
+    }).json()
+
+    assert TodoSkills.advance_overdue_recurring(session, datetime(2025, 1, 12, 12, 0)) == 1
+    assert client.get(f"/tasks/{late['id']}").json()["due_date"] == "2025-01-13T08:00:00"
+    assert client.get(f"/tasks/{done['id']}").json()["due_date"] == "2025-01-01T08:00:00"
+    assert client.get(f"/tasks/{upcoming['id']}").json()["due_date"] == "2025-02-01T08:00:00"
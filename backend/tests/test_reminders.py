@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from ..database import to_async_url
+from ..models import Task, TaskCreate, TaskUpdate, TaskStatus
+from ..reminders import ReminderScheduler
+from ..skills import TodoSkills
+from .. import reminders, skills
+
+NOW = datetime(2025, 1, 6, 9, 0)
+
+def add(session: Session, title: str, reminder_at, status=TaskStatus.PENDING) -> Task:
+    return TodoSkills.create_task(session, TaskCreate(title=title, reminder_at=reminder_at, status=status))
+
+def test_index_orders_and_reschedules():
+    scheduler = ReminderScheduler()
+    scheduler.schedule("a", NOW + timedelta(minutes=5))
+    scheduler.schedule("b", NOW + timedelta(minutes=1))
+    scheduler.schedule("c", NOW + timedelta(minutes=3))
+    scheduler.schedule("a", NOW + timedelta(minutes=2))
+    scheduler.schedule("c", None)
+    assert scheduler.next_due() == NOW + timedelta(minutes=1)
+    assert scheduler.pop_due(NOW + timedelta(minutes=10)) == [
+        ("b", NOW + timedelta(minutes=1)), ("a", NOW + timedelta(minutes=2))
+    ]
+    assert len(scheduler) == 0 and scheduler.next_due() is None
+
+def test_load_skips_delivered_closed_and_stale(session: Session):
+    scheduler = ReminderScheduler(grace=600)
+    due = add(session, "Due", NOW - timedelta(minutes=1))
+    later = add(session, "Later", NOW + timedelta(hours=1))
+    add(session, "Done", NOW, status=TaskStatus.COMPLETED)
+    add(session, "Long gone", NOW - timedelta(days=1))
+    add(session, "No reminder", None)
+    assert scheduler.load(session, NOW) == 2
+
+    assert scheduler.claim(session, due.id, due.reminder_at)["title"] == "Due"
+    # Exactly once: a second claim (another worker, a restart) is refused
+    assert scheduler.claim(session, due.id, due.reminder_at) is None
+    assert scheduler.load(session, NOW) == 1
+    assert scheduler.pop_due(NOW + timedelta(days=1)) == [(later.id, later.reminder_at)]
+
+def test_claim_rejects_changed_task(session: Session):
+    scheduler = ReminderScheduler()
+    task = add(session, "Moved", NOW)
+    TodoSkills.update_task(session, task.id, TaskUpdate(reminder_at=NOW + timedelta(hours=1)))
+    assert scheduler.claim(session, task.id, NOW) is None
+
+def test_writes_feed_running_scheduler(engine, session: Session, monkeypatch):
+    scheduler = ReminderScheduler(resync_interval=3600)
+    monkeypatch.setattr(reminders, "reminder_scheduler", scheduler)
+    monkeypatch.setattr(skills, "reminder_scheduler", scheduler)
+    async_engine = create_async_engine(to_async_url(str(engine.url)), poolclass=NullPool)
+
+    async def scenario():
+        scheduler.start(lambda: AsyncSession(async_engine, expire_on_commit=False))
+        queue = scheduler.hub.subscribe()
+        try:
+            await asyncio.sleep(0)
+            soon = datetime.utcnow() + timedelta(milliseconds=200)
+            task = add(session, "Ping", soon)
+            cancelled = add(session, "Cancelled", soon)
+            TodoSkills.delete_task(session, cancelled.id)
+            assert len(scheduler) == 1
+            event_id, event, data = await asyncio.wait_for(queue.get(), 5)
+            await asyncio.sleep(0.3)
+            return task, event, data, queue.empty()
+        finally:
+            scheduler.hub.unsubscribe(queue)
+            await scheduler.stop()
+            await async_engine.dispose()
+
+    task, event, data, nothing_else = asyncio.run(scenario())
+    assert event == "reminder"
+    assert data["task_id"] == task.id
+    assert nothing_else
+    assert scheduler.fired == 1
+
+def test_scheduler_survives_failing_sessions(engine, session: Session):
+    scheduler = ReminderScheduler(resync_interval=3600, retry_delay=0.01)
+    task = add(session, "Ping", datetime.utcnow() + timedelta(milliseconds=100))
+    async_engine = create_async_engine(to_async_url(str(engine.url)), poolclass=NullPool)
+    calls = []
+
+    def flaky_session():
+        # The first two rounds fail as a locked database would
+        calls.append(None)
+        if len(calls) <= 2:
+            raise RuntimeError("database is locked")
+        return AsyncSession(async_engine, expire_on_commit=False)
+
+    async def scenario():
+        scheduler.start(flaky_session)
+        queue = scheduler.hub.subscribe()
+        try:
+            return await asyncio.wait_for(queue.get(), 5)
+        finally:
+            scheduler.hub.unsubscribe(queue)
+            await scheduler.stop()
+            await async_engine.dispose()
+
+    event_id, event, data = asyncio.run(scenario())
+    assert data["task_id"] == task.id
+    assert scheduler.errors == 2
+    assert scheduler.fired == 1
+
+def test_stream_replays_after_last_event_id():
+    scheduler = ReminderScheduler()
+    first = scheduler.hub.publish("reminder", {"task_id": "a"})
+    scheduler.hub.publish("reminder", {"task_id": "b"})
+
+    async def read_one():
+        stream = scheduler.hub.stream(last_event_id=first)
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+
+    assert asyncio.run(read_one()) == f'id: {first + 1}\nevent: reminder\ndata: {{"task_id":"b"}}\n\n'
@@ -0,0 +1,70 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from ..models import TaskCreate
+from ..search import install_search_index, SQLITE_LEGACY_DROP
+from ..skills import TodoSkills
+
+def test_search_ranks_title_hits_first(client: TestClient):
+    client.post("/tasks", json={"title": "Call plumber", "description": "About the garden hose"})
+    client.post("/tasks", json={"title": "Garden cleanup", "description": "Rake leaves"})
+
+    results = client.get("/search", params={"query": "garden"}).json()
+    assert [r["title"] for r in results] == ["Garden cleanup", "Call plumber"]
+    assert results[0]["score"] >= results[1]["score"]
+
+def test_search_returns_highlighted_snippets(client: TestClient):
+    client.post("/tasks", json={"title": "Groceries", "description": "Buy oat milk and bread"})
+
+    result = client.get("/search", params={"query": "milk"}).json()[0]
+    assert "<mark>milk</mark>" in result["snippet"]
+
+def test_search_is_paginated(client: TestClient):
+    for i in range(5):
+        client.post("/tasks", json={"title": f"Report {i}"})
+
+    first = client.get("/search", params={"query": "report", "limit": 2}).json()
+    rest = client.get("/search", params={"query": "report", "offset": 2, "limit": 10}).json()
+    assert len(first) == 2 and len(rest) == 3
+    assert not {r["id"] for r in first} & {r["id"] for r in rest}
+
+def test_search_index_follows_updates_and_deletes(client: TestClient, session: Session):
+    task_id = client.post("/tasks", json={"title": "Draft proposal"}).json()["id"]
+    client.patch(f"/tasks/{task_id}", json={"title": "Final budget"})
+
+    assert TodoSkills.search_tasks(session, "proposal") == []
+    assert [t.id for t in TodoSkills.search_tasks(session, "budget")] == [task_id]
+
+    client.delete(f"/tasks/{task_id}")
+    assert TodoSkills.search_tasks(session, "budget") == []
+
+def test_search_ignores_query_syntax(client: TestClient):
+    client.post("/tasks", json={"title": "Fix \"quotes\" AND stuff"})
+    assert client.get("/search", params={"query": "\"quotes* OR ("}).status_code == 200
+    assert client.get("/search", params={"query": "  "}).json() == []
+
+def test_search_survives_vacuum(client: TestClient, engine, session: Session):
+    # VACUUM may renumber task's implicit rowids; search must not follow them
+    ids = [client.post("/tasks", json={"title": f"Item {i} {word}"}).json()["id"]
+           for i, word in enumerate(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot"])]
+    for task_id in ids[:3]:
+        client.delete(f"/tasks/{task_id}")
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+        # What VACUUM is allowed to do to a table without an INTEGER PRIMARY KEY
+        connection.exec_driver_sql("UPDATE task SET rowid = rowid + 1000")
+
+    assert [t.id for t in TodoSkills.search_tasks(session, "echo")] == [ids[4]]
+    assert sorted(t.title for t in TodoSkills.search_tasks(session, "item")) == [
+        "Item 3 delta", "Item 4 echo", "Item 5 foxtrot"
+    ]
+
+def test_legacy_rowid_index_is_replaced(engine, session: Session):
+    task = TodoSkills.create_task(session, TaskCreate(title="Legacy budget"))
+    with engine.connect() as connection:
+        for ddl in SQLITE_LEGACY_DROP:
+            connection.exec_driver_sql(ddl)
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE task_fts USING fts5(title, description, content='task', content_rowid='rowid')"
+        )
+        install_search_index(connection)
+    assert [t.id for t in TodoSkills.search_tasks(session, "budget")] == [task.id]
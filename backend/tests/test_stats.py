@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select, text
+from datetime import datetime, timedelta
+from ..skills import TodoSkills
+from ..models import Task, TaskStat, TaskStatus
+from .. import stats
+
+def test_stats_follow_every_write_path(client: TestClient, session: Session):
+    past = (datetime.utcnow() - timedelta(days=2)).isoformat()
+    first = client.post("/tasks", json={"title": "One", "priority": "high", "category": "work", "due_date": past}).json()
+    second = client.post("/tasks", json={"title": "Two", "recurrence_rule": "daily"}).json()
+    client.post("/tasks", json={"title": "Three"})
+
+    client.patch(f"/tasks/{first['id']}", json={"category": "home", "priority": "low"})
+    client.post(f"/tasks/{second['id']}/complete")
+    created = client.post("/tasks/bulk", json=[{"title": "Bulk 1"}, {"title": "Bulk 2", "category": "work"}, {"title": ""}]).json()
+    bulk_ids = [item["id"] for item in created if item["ok"]]
+    client.patch("/tasks/bulk", json=[{"id": bulk_ids[0], "status": "in_progress"}, {"id": bulk_ids[1], "title": ""}])
+    client.post("/tasks/bulk/complete", json={"ids": [bulk_ids[1], "missing"]})
+    client.request("DELETE", "/tasks/bulk", json={"ids": [bulk_ids[0]]})
+    client.post("/tasks/import", content='{"title": "Imported", "category": "work"}\n')
+    client.delete(f"/tasks/{first['id']}")
+
+    result = client.get("/tasks/stats").json()
+    tasks = client.get("/tasks").json()
+    assert result["total"] == len(tasks) == 5
+    assert result["by_status"] == {
+        status.value: sum(t["status"] == status.value for t in tasks) for status in TaskStatus
+    }
+    assert result["by_category"] == {"work": 2}
+    assert result["uncategorized"] == 3
+    assert result["by_priority"] == {
+        priority: sum(t["priority"] == priority for t in tasks) for priority in ("low", "medium", "high", "urgent")
+    }
+    assert TodoSkills.rebuild_stats(session) == {}
+
+def test_overdue_counts_open_tasks_only(client: TestClient):
+    past = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    client.post("/tasks", json={"title": "Late", "due_date": past})
+    client.post("/tasks", json={"title": "Late but paused", "due_date": past, "status": "paused"})
+    client.post("/tasks", json={"title": "Done late", "due_date": past, "status": "completed"})
+    client.post("/tasks", json={"title": "Upcoming", "due_date": future})
+    assert client.get("/tasks/stats").json()["overdue"] == 2
+
+def test_rebuild_reports_and_fixes_drift(client: TestClient, session: Session):
+    client.post("/tasks", json={"title": "One"})
+    session.exec(text("UPDATE taskstat SET count = 7 WHERE dimension = 'total'"))
+    drift = TodoSkills.rebuild_stats(session)
+    assert drift == {(stats.TOTAL, stats.NONE_KEY): (7, 1)}
+    assert client.get("/tasks/stats").json()["total"] == 1
+    assert TodoSkills.rebuild_stats(session) == {}
+
+def test_empty_stats(client: TestClient):
+    result = client.get("/tasks/stats").json()
+    assert result["total"] == 0
+    assert set(result["by_status"]) == {status.value for status in TaskStatus}
+    assert all(count == 0 for count in result["by_status"].values())
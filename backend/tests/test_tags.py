@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select, text
+from ..models import Task, TaskTag
+from ..skills import TodoSkills
+
+def create(client: TestClient, title: str, tags: list) -> str:
+    response = client.post("/tasks", json={"title": title, "tags": str(tags).replace("'", '"')})
+    return response.json()["id"]
+
+def titles(client: TestClient, **params) -> set:
+    return {t["title"] for t in client.get("/tasks", params=params).json()}
+
+def test_tag_filter_matches_whole_tags(client: TestClient):
+    create(client, "Report", ["work"])
+    create(client, "Essay", ["homework"])
+
+    assert titles(client, tags="work") == {"Report"}
+
+def test_tag_filter_any_and_all(client: TestClient):
+    create(client, "Both", ["work", "urgent"])
+    create(client, "Work only", ["work"])
+    create(client, "Neither", ["home"])
+
+    assert titles(client, tags="work,urgent") == {"Both", "Work only"}
+    assert titles(client, tags="work,urgent", tag_mode="all") == {"Both"}
+    assert client.get("/tasks", params={"tags": "work", "tag_mode": "some"}).status_code == 400
+
+def test_tags_keep_json_list_shape(client: TestClient):
+    response = client.post("/tasks", json={"title": "Shape", "tags": '["Work", " home ", "work"]'})
+    assert response.json()["tags"] == '["work", "home"]'
+
+def test_update_and_delete_keep_tag_rows_in_sync(client: TestClient, session: Session):
+    task_id = create(client, "Retag", ["old"])
+    client.patch(f"/tasks/{task_id}", json={"tags": '["new"]'})
+
+    assert titles(client, tags="old") == set()
+    assert titles(client, tags="new") == {"Retag"}
+
+    client.delete(f"/tasks/{task_id}")
+    assert session.exec(select(TaskTag)).all() == []
+
+def test_backfill_migrates_legacy_json(session: Session):
+    session.add(Task(id="legacy", title="Legacy", tags='["a", "b"]'))
+    session.commit()
+
+    assert TodoSkills.backfill_tags(session) == 1
+    assert TodoSkills.backfill_tags(session) == 0
+    assert {t.tag for t in session.exec(select(TaskTag))} == {"a", "b"}
+
+def test_tag_filter_uses_tag_index(session: Session):
+    statement = select(Task).where(TodoSkills._tag_filter("a,b", "all"))
+    compiled = statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = " ".join(row[-1] for row in session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "ix_tasktag_tag_task_id" in plan, plan
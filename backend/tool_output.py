@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from .models import Task
+
+# Compact, token-budgeted text for what the chat agent's tools return.
+# Every tool result is pasted into the model's prompt, so tasks are listed
+# one short line each with an 8-character id prefix (TodoSkills.resolve_task_id
+# maps it back), pages are capped, and a trailing hint tells the model how to
+# ask for the next page instead of receiving everything at once.
+
+SHORT_ID_LENGTH = 8
+PAGE_SIZE = int(os.getenv("AGENT_TOOL_PAGE_SIZE", "10"))
+# Upper bound for one tool result, in estimated tokens
+TOKEN_BUDGET = int(os.getenv("AGENT_TOOL_TOKEN_BUDGET", "400"))
+MAX_TITLE_CHARS = 60
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text and ids
+    return (len(text) + 3) // 4
+
+def short_id(task_id: str) -> str:
+    return task_id[:SHORT_ID_LENGTH]
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def task_line(task: Task) -> str:
+    """`a1b2c3d4 Title [status, priority, due 2025-01-07 09:00, rule]`, defaults left out."""
+    details = []
+    if task.status and task.status.value != "pending":
+        details.append(task.status.value)
+    if task.priority and task.priority.value != "medium":
+        details.append(task.priority.value)
+    if task.due_date:
+        details.append(f"due {task.due_date:%Y-%m-%d %H:%M}".removesuffix(" 00:00"))
+    if task.recurrence_rule:
+        details.append(_clip(task.recurrence_rule, 30))
+    suffix = f" [{', '.join(details)}]" if details else ""
+    return f"{short_id(task.id)} {_clip(task.title, MAX_TITLE_CHARS)}{suffix}"
+
+def task_page(tasks: List[Task], page: int, next_call: str, empty: str, budget: int = TOKEN_BUDGET) -> str:
+    """
+    One page of task lines. `tasks` holds up to PAGE_SIZE + 1 rows; the extra
+    one only signals that another page exists. Lines that would overflow
+    `budget` are left out and reported in the hint.
+    """
+    if not tasks:
+        return empty if page == 1 else f"No more results (page {page})."
+    shown = tasks[:PAGE_SIZE]
+    more = len(tasks) > PAGE_SIZE
+    header = f"Page {page}, ids are 8-char prefixes:"
+    lines, used = [header], estimate_tokens(header)
+    for task in shown:
+        line = task_line(task)
+        # Leave room for the hint
+        if used + estimate_tokens(line) > budget - 20:
+            break
+        lines.append(line)
+        used += estimate_tokens(line)
+    omitted = len(shown) - (len(lines) - 1)
+    if omitted:
+        lines.append(f"({omitted} more on this page omitted to save space)")
+    if more:
+        lines.append(f"More available: {next_call}")
+    return "\n".join(lines)
+
+class ToolOutputStats:
+    """Calls and estimated output tokens per tool, to watch prompt growth."""
+
+    def __init__(self):
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._tokens: Dict[str, int] = defaultdict(int)
+        self._max: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, output: str) -> int:
+        tokens = estimate_tokens(output)
+        with self._lock:
+            self._calls[tool] += 1
+            self._tokens[tool] += tokens
+            self._max[tool] = max(self._max[tool], tokens)
+        return tokens
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tool: {
+                    "calls": calls,
+                    "avg_tokens": round(self._tokens[tool] / calls, 1),
+                    "max_tokens": self._max[tool],
+                }
+                for tool, calls in self._calls.items()
+            }
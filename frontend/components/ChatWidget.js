@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from 'react';
-import { chatWithTodo } from '../utils/api';
+import { streamChat } from '../utils/api';
 import { ChatBubbleLeftRightIcon, XMarkIcon, PaperAirplaneIcon } from '@heroicons/react/24/solid';
 
 export default function ChatWidget() {
@@ -9,6 +9,8 @@ export default function ChatWidget() {
     ]);
     const [input, setInput] = useState('');
     const [isLoading, setIsLoading] = useState(false);
+    // Lets the server keep the chat history between messages
+    const [conversationId, setConversationId] = useState(null);
     const messagesEndRef = useRef(null);
 
     const scrollToBottom = () => {
@@ -28,11 +30,22 @@ export default function ChatWidget() {
         setInput('');
         setIsLoading(true);
 
+        // The reply is filled in as text and tool progress stream in
+        const updateReply = (update) => setMessages(prev => {
+            const last = prev[prev.length - 1];
+            return [...prev.slice(0, -1), { ...last, ...update(last) }];
+        });
+        setMessages(prev => [...prev, { role: 'assistant', content: '' }]);
+
         try {
-            const response = await chatWithTodo(input);
-            setMessages(prev => [...prev, { role: 'assistant', content: response.response }]);
+            const done = await streamChat(input, conversationId, (event, data) => {
+                if (event === 'conversation') setConversationId(data.conversation_id);
+                if (event === 'text') updateReply(last => ({ content: last.content + data.delta, status: null }));
+                if (event === 'tool_call') updateReply(() => ({ status: `Running ${data.name}...` }));
+            });
+            if (done) updateReply(() => ({ content: done.response, status: null }));
         } catch (error) {
-            setMessages(prev => [...prev, { role: 'assistant', content: 'Sorry, I encountered an error. Please check if the backend is running and API key is set.' }]);
+            updateReply(() => ({ content: 'Sorry, I encountered an error. Please check if the backend is running and API key is set.', status: null }));
         } finally {
             setIsLoading(false);
         }
@@ -64,13 +77,14 @@ export default function ChatWidget() {
 
                     {/* Messages */}
                     <div className="flex-1 overflow-y-auto p-4 space-y-4 bg-gray-50 dark:bg-gray-900">
-                        {messages.map((msg, idx) => (
+                        {messages.filter(msg => msg.content || msg.status).map((msg, idx) => (
                             <div key={idx} className={`flex ${msg.role === 'user' ? 'justify-end' : 'justify-start'}`}>
                                 <div className={`max-w-[80%] rounded-lg p-3 ${msg.role === 'user'
                                         ? 'bg-indigo-600 text-white rounded-br-none'
                                         : 'bg-white dark:bg-gray-700 text-gray-800 dark:text-gray-100 border border-gray-200 dark:border-gray-600 rounded-bl-none'
                                     }`}>
                                     <p className="text-sm whitespace-pre-wrap">{msg.content}</p>
+                                    {msg.status && <p className="text-xs italic opacity-70">{msg.status}</p>}
                                 </div>
                             </div>
                         ))}
@@ -1,25 +1,10 @@
-import { useEffect, useRef, useState } from 'react';
+import { useEffect } from 'react';
 import api from '../utils/api';
 
+// Reminders are scheduled and fired by the backend and pushed over SSE,
+// so this component only listens; EventSource reconnects on its own and
+// resumes from the last event it saw.
 const NotificationManager = () => {
-    const [tasks, setTasks] = useState([]);
-    const notifiedRef = useRef(new Set());
-
-    useEffect(() => {
-        const fetchTasks = async () => {
-            try {
-                const response = await api.get('/tasks', { params: { status: 'pending' } });
-                setTasks(response.data);
-            } catch (error) {
-                console.error("NotificationManager failing to fetch:", error);
-            }
-        };
-
-        fetchTasks();
-        const interval = setInterval(fetchTasks, 60000); // Pulse every minute
-        return () => clearInterval(interval);
-    }, []);
-
     useEffect(() => {
         // Request permission on mount
         if ('Notification' in window && Notification.permission === 'default') {
@@ -28,34 +13,26 @@ const NotificationManager = () => {
     }, []);
 
     useEffect(() => {
-        if (!tasks || !('Notification' in window) || Notification.permission !== 'granted') return;
+        if (!('EventSource' in window)) return;
 
-        const interval = setInterval(() => {
-            const now = new Date();
+        const source = new EventSource(`${api.defaults.baseURL}/reminders/stream`);
 
-            tasks.forEach(task => {
-                if (task.reminder_at && task.status !== 'completed') {
-                    const reminderTime = new Date(task.reminder_at);
-
-                    // If reminder time has passed (within the last 10 minutes) 
-                    // and we haven't notified for this task yet in this session
-                    if (reminderTime <= now &&
-                        reminderTime > new Date(now.getTime() - 10 * 60 * 1000) &&
-                        !notifiedRef.current.has(task.id)) {
-
-                        new Notification(`Reminder: ${task.title}`, {
-                            body: task.description || 'You have a task due!',
-                            icon: '/favicon.ico' // Default nextjs favicon
-                        });
-
-                        notifiedRef.current.add(task.id);
-                    }
-                }
+        source.addEventListener('reminder', (event) => {
+            if (!('Notification' in window) || Notification.permission !== 'granted') return;
+            const reminder = JSON.parse(event.data);
+            new Notification(`Reminder: ${reminder.title}`, {
+                body: reminder.description || 'You have a task due!',
+                icon: '/favicon.ico', // Default nextjs favicon
+                tag: `${reminder.task_id}:${reminder.reminder_at}` // One notification per reminder across tabs
             });
-        }, 10000); // Check every 10 seconds
+        });
 
-        return () => clearInterval(interval);
-    }, [tasks]);
+        source.onerror = () => {
+            console.error("NotificationManager lost the reminder stream, retrying");
+        };
+
+        return () => source.close();
+    }, []);
 
     return null; // This is a logic-only component
 };
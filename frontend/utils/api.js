@@ -7,9 +7,46 @@ const api = axios.create({
     },
 });
 
-export const chatWithTodo = async (message) => {
-    const response = await api.post('/chat', { message });
+export const chatWithTodo = async (message, conversationId = null) => {
+    const response = await api.post('/chat', { message, conversation_id: conversationId });
     return response.data;
 };
 
+// Streams /chat/stream, calling onEvent(event, data) for each server-sent
+// event as it arrives; resolves with the final `done` payload
+export const streamChat = async (message, conversationId, onEvent) => {
+    const response = await fetch(`${api.defaults.baseURL}/chat/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message, conversation_id: conversationId }),
+    });
+    if (!response.ok) throw new Error(`Chat failed with status ${response.status}`);
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done = null;
+    while (true) {
+        const { value, done: finished } = await reader.read();
+        if (finished) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (!data) continue;
+            const payload = JSON.parse(data);
+            if (event === 'done') done = payload;
+            onEvent(event, payload);
+        }
+    }
+    return done;
+};
+
 export default api;
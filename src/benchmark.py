@@ -0,0 +1,120 @@
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from storage import LogStore, MemoryStore
+from todo import Task, TodoApp, STATUS_PENDING
+
+# CLI benchmark, run from the repository root:
+#   python src/benchmark.py --tasks 1000000 --commands 100000
+# Fills a store with --tasks tasks, then reports the memory each task takes,
+# how long `list` takes (output discarded) and how long a short-ID lookup
+# takes, for the in-memory store and for a LogStore opened from a snapshot.
+# Then pipes a script of --commands commands through todo.py, interactively
+# and with --batch, and reports commands per second for each.
+
+class _Discard(io.TextIOBase):
+    def write(self, text):
+        return len(text)
+
+def _task(number, now):
+    task = Task.__new__(Task)
+    task.id = str(uuid.uuid4())
+    task.title = f"Task number {number}"
+    task.status = STATUS_PENDING
+    task.created_at = task.updated_at = (now + datetime.timedelta(microseconds=number)).isoformat()
+    return task
+
+def _fill(store, count):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for number in range(count):
+        task = _task(number, now)
+        store[task.id] = task
+    return store
+
+def _timed(label, action):
+    start = time.perf_counter()
+    result = action()
+    print(f"{label:<32} {time.perf_counter() - start:8.3f}s")
+    return result
+
+def _list(app):
+    with contextlib.redirect_stdout(_Discard()):
+        app.handle_list([])
+
+def _lookups(app, ids):
+    with contextlib.redirect_stdout(_Discard()):
+        for key in ids:
+            app.resolve_id(key[:8])
+
+def _measure(label, app, ids):
+    _timed(f"{label}: list", lambda: _list(app))
+    _timed(f"{label}: first prefix lookup", lambda: _lookups(app, ids[:1]))
+    sample = ids[::max(1, len(ids) // 1000)]
+    _timed(f"{label}: {len(sample)} prefix lookups", lambda: _lookups(app, sample))
+
+def _script(count):
+    # Mostly adds, with a failing lookup every tenth command
+    return "".join(
+        "show 0000\n" if number % 10 == 9 else f"add Task number {number}\n"
+        for number in range(count)
+    )
+
+def _throughput(script, count):
+    todo = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'todo.py')
+    modes = [
+        ("interactive", []), ("--batch", ['--batch', '-']),
+        ("--batch --json", ['--batch', '-', '--json']), ("--batch --quiet", ['--batch', '-', '--quiet']),
+    ]
+    for label, flags in modes:
+        # Output goes to a pipe, as when a script's output is consumed
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, todo, *flags], input=script, text=True,
+                                stdout=subprocess.PIPE, env={**os.environ, 'TODO_DATA_DIR': ''})
+        elapsed = time.perf_counter() - start
+        print(f"{label + ':':<32} {count / elapsed:8.0f} commands/s ({len(result.stdout) / 2**20:.1f} MiB out)")
+
+def _tasks(count):
+    tracemalloc.start()
+    store = _fill(MemoryStore(), count)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'memory per task':<32} {used / max(count, 1):8.0f} B")
+
+    ids = list(store)
+    _measure("memory", TodoApp(store), ids)
+
+    directory = tempfile.mkdtemp(prefix='todo-bench-')
+    try:
+        with LogStore(directory, load=Task.from_dict, dump=Task.to_dict,
+                      compact_after=len(ids) + 1) as persistent:
+            for key in ids:
+                persistent[key] = store[key]
+            persistent.compact()
+        del store
+        with LogStore(directory, load=Task.from_dict, dump=Task.to_dict) as persistent:
+            _measure("log store", TodoApp(persistent), ids)
+    finally:
+        shutil.rmtree(directory)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the Todo CLI on a large task list")
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--commands', type=int, default=100_000, help="script length for the throughput run")
+    args = parser.parse_args(argv)
+
+    if args.tasks:
+        _tasks(args.tasks)
+    if args.commands:
+        _throughput(_script(args.commands), args.commands)
+
+if __name__ == '__main__':
+    main()
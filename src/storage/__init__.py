@@ -0,0 +1,6 @@
+"""Task stores for the CLI: in memory, or durable (an append-only operation log compacted into mmap'd snapshots)."""
+from .store import LogStore
+from .memory import MemoryStore
+from .trie import PrefixTrie
+
+__all__ = ['LogStore', 'MemoryStore', 'PrefixTrie']
@@ -0,0 +1,66 @@
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from .snapshot import write_snapshot, to_row
+from .store import LogStore, SNAPSHOT
+
+# Startup benchmark, run from src/:
+#   python -m storage --tasks 1000000 --tail 100000
+# Builds a snapshot of --tasks tasks plus a log of --tail updates (the most a
+# log grows to before compaction, by default), then times opening the store,
+# a lookup, an update and a full compaction.
+
+def _records(count, ids):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for number in range(count):
+        stamp = (now + datetime.timedelta(microseconds=number)).isoformat()
+        ids.append(str(uuid.uuid4()))
+        yield {
+            'id': ids[-1], 'title': f"Task number {number}", 'status': 'pending',
+            'created_at': stamp, 'updated_at': stamp,
+        }
+
+def _timed(label, action):
+    start = time.perf_counter()
+    result = action()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time opening a LogStore")
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--tail', type=int, default=100_000, help="log entries to replay on open")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix='todo-store-')
+    try:
+        path = os.path.join(directory, SNAPSHOT)
+        ids = []
+        _timed(f"write {args.tasks} snapshot", lambda: write_snapshot(path, map(to_row, _records(args.tasks, ids)), 1))
+        print(f"{'snapshot size':<28} {os.path.getsize(path) / 2**20:8.1f} MiB")
+        _timed("open (empty log)", lambda: LogStore(directory).close())
+
+        store = LogStore(directory, compact_after=args.tail + 1)
+        for number, key in enumerate(ids[:args.tail]):
+            task = store[key]
+            task['title'] = f"Renamed {number}"
+            store[key] = task
+        store.close()
+
+        store = _timed(f"open (+{min(args.tail, len(ids))} log entries)",
+                       lambda: LogStore(directory, compact_after=args.tail + 1))
+        if ids:
+            _timed("lookup by id", lambda: store[ids[len(ids) // 2]])
+        _timed("iterate all", lambda: sum(1 for _ in store.values()))
+        _timed("compact", store.compact)
+        store.close()
+        _timed("open after compaction", lambda: LogStore(directory).close())
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+from .trie import PrefixTrie
+
+# In-memory task store: a dict of id -> task (insertion order is creation
+# order, so listing needs no sort) plus a prefix index over the ids, kept in
+# step through item assignment and `del` (dict.update() and pop() bypass it).
+
+class MemoryStore(dict):
+    def __init__(self):
+        super().__init__()
+        self._ids = PrefixTrie()
+
+    def __setitem__(self, key, task):
+        if key not in self:
+            self._ids.add(key)
+        super().__setitem__(key, task)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._ids.remove(key)
+
+    def clear(self):
+        super().clear()
+        self._ids = PrefixTrie()
+
+    def match_prefix(self, prefix, limit=None):
+        """Ids starting with `prefix`, at most `limit` of them."""
+        return self._ids.match(prefix, limit)
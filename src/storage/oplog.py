@@ -0,0 +1,70 @@
+import json
+import os
+import time
+
+# Append-only operation log, one JSON array per line:
+#   ["put", {task dict}]   - add a task or replace it with its new state
+#   ["del", "<task id>"]   - delete a task
+# Appends are buffered and fsynced in batches: after `sync_every` operations
+# or `sync_interval` seconds, whichever comes first, and on close. A crash can
+# therefore lose at most the last unsynced batch; a half-written last line is
+# detected on the next open and cut off.
+
+class OpLog:
+    def __init__(self, path, sync_every=1000, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.entries = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+
+    def replay(self):
+        """
+        Yield every complete entry, then open the log for appending. A torn or
+        unparsable tail (from a crash mid-write) is truncated away.
+        """
+        good = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as log:
+                for line in log:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    good += len(line)
+                    self.entries += 1
+                    yield entry
+            if good != os.path.getsize(self.path):
+                with open(self.path, 'r+b') as log:
+                    log.truncate(good)
+        self._file = open(self.path, 'ab')
+
+    def append(self, op, value):
+        self._file.write(json.dumps([op, value], separators=(',', ':')).encode('utf-8') + b'\n')
+        self.entries += 1
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def flush(self):
+        """Hand buffered entries to the OS (survives a process crash, not a power loss)."""
+        if self._file:
+            self._file.flush()
+
+    def sync(self):
+        """Flush and fsync; everything appended so far is durable afterwards."""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
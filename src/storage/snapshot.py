@@ -0,0 +1,209 @@
+import json
+import mmap
+import os
+import struct
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+# Binary snapshot of every live task, read through mmap.
+#
+# Layout: an 8-byte magic, a 4-byte header length and a JSON header, then
+#   index   - u32 record numbers ordered by task id (binary search for lookups)
+#   records - fixed-size rows in insertion order: id (16 raw UUID bytes),
+#             status (index into the header's status list), created_at and
+#             updated_at (microseconds since the epoch), title offset and length
+#   titles  - every title, UTF-8, back to back
+# Opening a snapshot only parses the header; rows are decoded when read, so
+# startup cost does not grow with the number of tasks.
+
+MAGIC = b"TODOSNP1"
+RECORD = struct.Struct("<16sBqqQI")
+INDEX = struct.Struct("<I")
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+HEX_DIGITS = frozenset('0123456789abcdef')
+
+def to_micros(timestamp):
+    """ISO-8601 string -> microseconds since the epoch (UTC)."""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def from_micros(micros):
+    return (EPOCH + timedelta(microseconds=micros)).isoformat()
+
+def format_id(raw_id):
+    """Canonical UUID string for 16 raw bytes; str(uuid.UUID(bytes=...)) is several times slower."""
+    digits = raw_id.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+def to_row(record):
+    """Task dict -> (raw id, status, created µs, updated µs, UTF-8 title), as write_snapshot takes it."""
+    return (
+        uuid.UUID(record['id']).bytes, record['status'], to_micros(record['created_at']),
+        to_micros(record['updated_at']), record['title'].encode('utf-8'),
+    )
+
+def write_snapshot(path, rows, generation):
+    """
+    Write `rows` (see to_row; insertion order) to `path` and fsync it.
+    Callers write to a temporary name and rename it into place, so a crash
+    never leaves a half-written snapshot behind.
+    """
+    statuses = {}
+    records = bytearray()
+    titles = bytearray()
+    ids = []
+    for raw_id, status, created, updated, title in rows:
+        code = statuses.setdefault(status, len(statuses))
+        records += RECORD.pack(raw_id, code, created, updated, len(titles), len(title))
+        titles += title
+        ids.append(raw_id)
+
+    count = len(ids)
+    order = sorted(range(count), key=ids.__getitem__)
+    index = struct.pack(f"<{count}I", *order)
+    header = {
+        'generation': generation,
+        'count': count,
+        'statuses': list(statuses),
+    }
+    head = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    # Pad so the index starts 4-byte aligned
+    head += b' ' * (-(len(MAGIC) + 4 + len(head)) % 4)
+
+    with open(path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(struct.pack('<I', len(head)))
+        out.write(head)
+        out.write(index)
+        out.write(records)
+        out.write(titles)
+        out.flush()
+        os.fsync(out.fileno())
+
+def sync_directory(directory):
+    """Make a rename durable; not possible (or needed) on Windows."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class _SortedIds:
+    """Task ids in sorted order, as a sequence bisect can search."""
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot.count
+
+    def __getitem__(self, position):
+        return self.snapshot.raw_id(self.snapshot.record_at(position))
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file. An empty snapshot (generation 0) stands
+    in when the file does not exist yet.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.generation = 0
+        self.count = 0
+        self.statuses = []
+        self._file = None
+        self._map = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._open()
+        self._sorted = _SortedIds(self)
+
+    def _open(self):
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a task snapshot")
+        start = len(MAGIC) + 4
+        (head_len,) = struct.unpack_from('<I', self._map, len(MAGIC))
+        header = json.loads(self._map[start:start + head_len])
+        self.generation = header['generation']
+        self.count = header['count']
+        self.statuses = header['statuses']
+        self._index_at = start + head_len
+        self._records_at = self._index_at + self.count * INDEX.size
+        self._titles_at = self._records_at + self.count * RECORD.size
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = self._file = None
+
+    def record_at(self, position):
+        """Record number of the `position`-th id in sorted order."""
+        return INDEX.unpack_from(self._map, self._index_at + position * INDEX.size)[0]
+
+    def raw_id(self, number):
+        start = self._records_at + number * RECORD.size
+        return self._map[start:start + 16]
+
+    def task_id(self, number):
+        return format_id(self.raw_id(number))
+
+    def find(self, task_id):
+        """Record number for `task_id`, or None."""
+        if not self.count:
+            return None
+        try:
+            parsed = uuid.UUID(task_id)
+        except (ValueError, TypeError, AttributeError):
+            return None
+        # Only the canonical spelling names a task, as with a plain dict
+        if str(parsed) != task_id:
+            return None
+        raw_id = parsed.bytes
+        position = bisect_left(self._sorted, raw_id)
+        if position < self.count and self._sorted[position] == raw_id:
+            return self.record_at(position)
+        return None
+
+    def match_prefix(self, prefix):
+        """Ids starting with `prefix` (canonical lowercase UUID spelling), in id order."""
+        digits = prefix.replace('-', '')
+        if not self.count or len(digits) > 32 or not HEX_DIGITS.issuperset(digits):
+            return
+        low = digits.ljust(32, '0')
+        # Dashes must sit where the canonical spelling has them
+        if str(uuid.UUID(low))[:len(prefix)] != prefix:
+            return
+        start = bisect_left(self._sorted, bytes.fromhex(low))
+        end = bisect_right(self._sorted, bytes.fromhex(digits.ljust(32, 'f')))
+        for position in range(start, end):
+            yield self.task_id(self.record_at(position))
+
+    def row(self, number):
+        """Record `number` in to_row form, without decoding it."""
+        raw_id, status, created, updated, title_at, title_len = RECORD.unpack_from(
+            self._map, self._records_at + number * RECORD.size
+        )
+        start = self._titles_at + title_at
+        return raw_id, self.statuses[status], created, updated, self._map[start:start + title_len]
+
+    def record(self, number):
+        """The task dict stored as record `number`."""
+        raw_id, status, created, updated, title_at, title_len = RECORD.unpack_from(
+            self._map, self._records_at + number * RECORD.size
+        )
+        start = self._titles_at + title_at
+        created_at = from_micros(created)
+        return {
+            'id': format_id(raw_id),
+            'title': self._map[start:start + title_len].decode('utf-8'),
+            'status': self.statuses[status],
+            'created_at': created_at,
+            'updated_at': created_at if updated == created else from_micros(updated),
+        }
@@ -0,0 +1,234 @@
+import glob
+import os
+import re
+from collections.abc import MutableMapping
+from itertools import chain
+from .oplog import OpLog
+from .snapshot import Snapshot, write_snapshot, to_row, sync_directory
+from .trie import PrefixTrie
+
+# Durable task store: a snapshot plus the operation log written since it.
+#
+#   <directory>/snapshot.bin     - every task as of the last compaction (mmap)
+#   <directory>/ops.<gen>.log    - operations since snapshot generation <gen>
+#
+# Opening maps the snapshot and replays only its log. Once the log holds
+# `compact_after` entries, the live tasks are written to a new snapshot
+# (generation + 1), renamed into place, and the old log is dropped; a crash
+# at any point leaves either the old pair or the new snapshot, never a mix.
+#
+# LogStore is a dict-like mapping of id -> task, so TodoApp can use it in
+# place of its in-memory dict. Assigning `store[id] = task` logs the task's
+# new state; mutating a task object alone is not persisted.
+
+SNAPSHOT = 'snapshot.bin'
+_LOG_NAME = re.compile(r'ops\.(\d+)\.log$')
+
+class LogStore(MutableMapping):
+    def __init__(self, directory, load=dict, dump=dict, compact_after=100_000,
+                 sync_every=1000, sync_interval=1.0):
+        """
+        `load` turns a stored task dict into the object handed out, `dump`
+        turns it back (e.g. Task.from_dict / Task.to_dict).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compact_after = compact_after
+        self._load = load
+        self._dump = dump
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._snapshot_path = os.path.join(directory, SNAPSHOT)
+        self._snapshot = Snapshot(self._snapshot_path)
+        # Every task changed since the snapshot (None = deleted), in the order
+        # first touched. Replay only fills this; whether an id is also in the
+        # snapshot is looked up later, when it matters.
+        self._overlay = {}
+        # Live task count, None until worked out after a replay
+        self._size = None
+        # Prefix index over live overlay ids, built on the first prefix lookup
+        self._overlay_ids = None
+        self._log = None
+        self._open_log()
+
+    # -- log -------------------------------------------------------------
+
+    def _log_path(self, generation):
+        return os.path.join(self.directory, f'ops.{generation}.log')
+
+    def _open_log(self):
+        generation = self._snapshot.generation
+        # Leftovers from a compaction interrupted before or after its rename
+        for path in glob.glob(os.path.join(self.directory, 'ops.*.log')):
+            match = _LOG_NAME.search(path)
+            if match and int(match.group(1)) != generation:
+                os.remove(path)
+        if os.path.exists(self._snapshot_path + '.tmp'):
+            os.remove(self._snapshot_path + '.tmp')
+
+        self._log = OpLog(self._log_path(generation), self._sync_every, self._sync_interval)
+        overlay, load = self._overlay, self._load
+        for op, value in self._log.replay():
+            if op == 'put':
+                overlay[value['id']] = load(value)
+            elif op == 'del':
+                overlay[value] = None
+        self._size = None if overlay else self._snapshot.count
+
+    def flush(self):
+        """Hand pending log entries to the OS without waiting for the disk."""
+        self._log.flush()
+
+    def sync(self):
+        """Make every change so far durable."""
+        self._log.sync()
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._snapshot.close()
+            self._log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # -- compaction ------------------------------------------------------
+
+    def compact(self):
+        """Write every live task to a new snapshot and start an empty log."""
+        self._compact(self._rows())
+
+    def _rows(self):
+        # Untouched snapshot records are copied as they are stored
+        for number, _, task in self._merged():
+            yield self._snapshot.row(number) if number is not None else to_row(self._dump(task))
+
+    def clear(self):
+        self._compact(())
+
+    def _compact(self, records):
+        generation = self._snapshot.generation + 1
+        temp = self._snapshot_path + '.tmp'
+        self._log.sync()
+        write_snapshot(temp, records, generation)
+        old_log = self._log.path
+        self._log.close()
+        # Windows cannot replace a file that is still mapped
+        self._snapshot.close()
+        os.replace(temp, self._snapshot_path)
+        sync_directory(self.directory)
+
+        self._snapshot = Snapshot(self._snapshot_path)
+        self._overlay.clear()
+        self._overlay_ids = None
+        self._open_log()
+        if os.path.exists(old_log):
+            os.remove(old_log)
+
+    def _maybe_compact(self):
+        if self._log.entries >= self.compact_after:
+            self.compact()
+
+    # -- mapping ---------------------------------------------------------
+
+    def _live(self, key):
+        if key in self._overlay:
+            return self._overlay[key] is not None
+        return self._snapshot.find(key) is not None
+
+    def __setitem__(self, key, task):
+        if self._size is not None and not self._live(key):
+            self._size += 1
+        self._overlay[key] = task
+        if self._overlay_ids is not None:
+            self._overlay_ids.add(key)
+        self._log.append('put', self._dump(task))
+        self._maybe_compact()
+
+    def __delitem__(self, key):
+        if not self._live(key):
+            raise KeyError(key)
+        self._overlay[key] = None
+        if self._overlay_ids is not None:
+            self._overlay_ids.remove(key)
+        if self._size is not None:
+            self._size -= 1
+        self._log.append('del', key)
+        self._maybe_compact()
+
+    def __getitem__(self, key):
+        if key in self._overlay:
+            task = self._overlay[key]
+        else:
+            number = self._snapshot.find(key)
+            task = self._load(self._snapshot.record(number)) if number is not None else None
+        if task is None:
+            raise KeyError(key)
+        return task
+
+    __contains__ = _live
+
+    def __len__(self):
+        if self._size is None:
+            size = self._snapshot.count
+            for key, task in self._overlay.items():
+                in_snapshot = self._snapshot.find(key) is not None
+                if task is None and in_snapshot:
+                    size -= 1
+                elif task is not None and not in_snapshot:
+                    size += 1
+            self._size = size
+        return self._size
+
+    def match_prefix(self, prefix, limit=None):
+        """Live ids starting with `prefix`, at most `limit` of them."""
+        if self._overlay_ids is None:
+            self._overlay_ids = PrefixTrie(key for key, task in self._overlay.items() if task is not None)
+        found, seen = [], set()
+        for key in chain(self._snapshot.match_prefix(prefix), self._overlay_ids.match(prefix)):
+            if limit is not None and len(found) >= limit:
+                break
+            # Skip snapshot ids deleted since, and overlay ids already found in the snapshot
+            if key not in seen and self._overlay.get(key, True) is not None:
+                seen.add(key)
+                found.append(key)
+        return found
+
+    def _merged(self):
+        """
+        Live entries in insertion order: (record number, None, None) for an
+        untouched snapshot record, (None, id, task) for everything in the overlay.
+        """
+        snapshot, overlay = self._snapshot, self._overlay
+        replaced = set()
+        for number in range(snapshot.count):
+            if overlay:
+                key = snapshot.task_id(number)
+                if key in overlay:
+                    replaced.add(key)
+                    if overlay[key] is not None:
+                        yield None, key, overlay[key]
+                    continue
+            yield number, None, None
+        # Then tasks added since the snapshot
+        for key, task in list(overlay.items()):
+            if task is not None and key not in replaced:
+                yield None, key, task
+
+    def items(self):
+        """(id, task) pairs in insertion order, decoded from the snapshot as they are reached."""
+        for number, key, task in self._merged():
+            if number is None:
+                yield key, task
+            else:
+                record = self._snapshot.record(number)
+                yield record['id'], self._load(record)
+
+    def values(self):
+        return (task for _, task in self.items())
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
@@ -0,0 +1,89 @@
+# Prefix index over task ids, so commands can take a short unique prefix.
+#
+# A burst trie: each node maps the next character to either a child node or a
+# bucket (a plain list) of the keys below it. A bucket that grows past
+# BUCKET_SIZE is split into a node. Random ids such as UUIDs spread evenly,
+# so a million keys need only a few thousand nodes and small buckets instead
+# of one node per character.
+
+BUCKET_SIZE = 32
+# Bucket for keys that end exactly at a node
+_END = ''
+
+class PrefixTrie:
+    def __init__(self, keys=()):
+        self._root = {}
+        self._size = 0
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key):
+        node, depth = self._root, 0
+        while True:
+            char = key[depth] if depth < len(key) else _END
+            child = node.get(char)
+            if isinstance(child, dict):
+                node, depth = child, depth + 1
+                continue
+            if child is None:
+                node[char] = [key]
+            elif key in child:
+                return
+            else:
+                child.append(key)
+                if len(child) > BUCKET_SIZE and char != _END:
+                    node[char] = self._burst(child, depth + 1)
+            self._size += 1
+            return
+
+    def _burst(self, keys, depth):
+        node = {}
+        for key in keys:
+            node.setdefault(key[depth] if depth < len(key) else _END, []).append(key)
+        for char, bucket in node.items():
+            if len(bucket) > BUCKET_SIZE and char != _END:
+                node[char] = self._burst(bucket, depth + 1)
+        return node
+
+    def remove(self, key):
+        """Drop `key`; unknown keys are ignored."""
+        node, depth = self._root, 0
+        while True:
+            char = key[depth] if depth < len(key) else _END
+            child = node.get(char)
+            if isinstance(child, dict):
+                node, depth = child, depth + 1
+                continue
+            if child is not None and key in child:
+                child.remove(key)
+                if not child:
+                    del node[char]
+                self._size -= 1
+            return
+
+    def match(self, prefix, limit=None):
+        """Keys starting with `prefix`, at most `limit` of them."""
+        node = self._root
+        for depth, char in enumerate(prefix):
+            child = node.get(char)
+            if child is None:
+                return []
+            if isinstance(child, list):
+                return [key for key in child if key.startswith(prefix)][:limit]
+            node = child
+        found = []
+        self._collect(node, found, limit)
+        return found
+
+    def _collect(self, node, found, limit):
+        for child in node.values():
+            if isinstance(child, dict):
+                self._collect(child, found, limit)
+            else:
+                found.extend(child)
+            if limit is not None and len(found) >= limit:
+                del found[limit:]
+                return
@@ -1,19 +1,30 @@
 import sys
+import os
 import uuid
 import datetime
 import json
+import argparse
+from storage import MemoryStore
 
 # Constants
 STATUS_PENDING = 'pending'
 STATUS_IN_PROGRESS = 'in_progress'
 STATUS_COMPLETED = 'completed'
 VALID_STATUSES = {STATUS_PENDING, STATUS_IN_PROGRESS, STATUS_COMPLETED}
+# Shortest ID prefix commands accept in place of a full task ID
+MIN_ID_PREFIX = 4
+# Output buffer size for --batch
+BATCH_BUFFER = 1 << 16
 
 class Task:
     """
     Represents a single task in the Todo system.
     Strictly adheres to Phase 1 fields.
+    Uses __slots__ (no per-task __dict__), and a new task's created_at and
+    updated_at share one string, to keep large task lists small.
     """
+    __slots__ = ('id', 'title', 'status', 'created_at', 'updated_at')
+
     def __init__(self, title):
         self.id = str(uuid.uuid4())
         self.title = title
@@ -38,6 +49,18 @@ class Task:
         self.status = STATUS_COMPLETED
         self.updated_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a task from its to_dict() form, e.g. when loading from storage."""
+        task = cls.__new__(cls)
+        task.id = data['id']
+        task.title = data['title']
+        # Share the status constants and, when equal, one timestamp string
+        task.status = _STATUSES.get(data['status'], data['status'])
+        task.created_at = data['created_at']
+        task.updated_at = task.created_at if data['updated_at'] == task.created_at else data['updated_at']
+        return task
+
     def to_dict(self):
         """Return dictionary representation for JSON output or testing."""
         return {
@@ -52,123 +75,187 @@ class Task:
         """Consistent string format for list display."""
         return f"[{self.id}] {self.title} | {self.status} | {self.created_at}"
 
+_STATUSES = {status: status for status in VALID_STATUSES}
+
 class TodoApp:
     """
-    Main application controller for the In-Memory Todo CLI.
+    Main application controller for the Todo CLI.
+    Tasks live in memory (storage.MemoryStore) unless a persistent store
+    (storage.LogStore) is passed in. Either way `self.tasks` is a mapping of
+    id -> Task in creation order with a `match_prefix` lookup, and every
+    change is written back with `self.tasks[id] = task`.
+
+    Handlers report through say() and error() rather than print(), so the
+    same commands can answer as text, as JSON lines (`json=True`), or with
+    errors only (`quiet=True`). Output goes to `out`, or sys.stdout if unset.
     """
-    def __init__(self):
-        self.tasks = {} # id -> Task
+    def __init__(self, store=None, json=False, quiet=False, out=None):
+        self.tasks = store if store is not None else MemoryStore() # id -> Task
         self.running = True
+        self.json = json
+        self.quiet = quiet
+        self.out = out
+        self.errors = 0
+        self._command = None
 
     def reset_store(self):
-        """Reset the in-memory store for testing."""
-        self.tasks = {}
+        """Reset the store for testing."""
+        self.tasks.clear()
+
+    def close(self):
+        """Flush and close a persistent store."""
+        if hasattr(self.tasks, 'close'):
+            self.tasks.close()
+
+    def say(self, text, **fields):
+        """
+        Report a result: `text` for people, `fields` (default: the text as
+        "message") for JSON lines.
+        """
+        if self.quiet:
+            return
+        if self.json:
+            text = json.dumps({'ok': True, 'command': self._command, **(fields or {'message': text})})
+        (self.out or sys.stdout).write(text + "\n")
+
+    def error(self, text):
+        """Report a command that did nothing; shown even when quiet."""
+        self.errors += 1
+        if self.json:
+            text = json.dumps({'ok': False, 'command': self._command, 'error': text.removeprefix("Error: ")})
+        (self.out or sys.stdout).write(text + "\n")
 
     def get_all_tasks_as_dicts(self):
         """Helper for testing to retrieve all data."""
         return [t.to_dict() for t in self.tasks.values()]
 
+    def resolve_id(self, id_):
+        """
+        The full ID for `id_`, which may also be a unique prefix of at least
+        MIN_ID_PREFIX characters. Prints the error and returns None otherwise.
+        """
+        if id_ in self.tasks:
+            return id_
+        matches = self.tasks.match_prefix(id_, 2) if len(id_) >= MIN_ID_PREFIX else []
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            self.error(f"Error: ID prefix {id_} matches more than one task. Use more characters.")
+        else:
+            self.error(f"Error: Task with ID {id_} not found.")
+        return None
+
     def print_help(self):
-        print("Available commands:")
-        print("  add <title>                          - Add a new task")
-        print("  list                                 - List all tasks")
-        print("  show <id>                            - Show task details")
-        print("  update <id> <new_title | new_status> - Update task title or status")
-        print("  delete <id>                          - Delete a task")
-        print("  complete <id>                        - Mark task as completed")
-        print("  help                                 - Show this help message")
-        print("  exit / quit                          - Exit the application")
+        self.say("\n".join([
+            "Available commands:",
+            "  add <title>                          - Add a new task",
+            "  list                                 - List all tasks",
+            "  show <id>                            - Show task details",
+            "  update <id> <new_title | new_status> - Update task title or status",
+            "  delete <id>                          - Delete a task",
+            "  complete <id>                        - Mark task as completed",
+            "  help                                 - Show this help message",
+            "  exit / quit                          - Exit the application",
+            f"IDs can be shortened to any unique prefix of {MIN_ID_PREFIX}+ characters.",
+        ]))
 
     def handle_add(self, args):
         if not args:
-            print("Error: Missing title.")
+            self.error("Error: Missing title.")
             return
         title = " ".join(args).strip()
         if not title:
-            print("Error: Title cannot be empty.")
+            self.error("Error: Title cannot be empty.")
             return
         task = Task(title)
         self.tasks[task.id] = task
-        print(f"Task added: {task}")
+        self.say(f"Task added: {task}", task=task.to_dict())
 
     def handle_list(self, args):
         if not self.tasks:
-            print("No tasks found.")
+            self.say("No tasks found.", tasks=[])
+            return
+        # The store keeps creation order, so no sort is needed
+        if self.json:
+            # One line per task, so a large list streams
+            for t in self.tasks.values():
+                self.say(None, task=t.to_dict())
             return
-        # Sort by created_at for consistent display
-        sorted_tasks = sorted(self.tasks.values(), key=lambda t: t.created_at)
-        for t in sorted_tasks:
-            print(t)
+        if not self.quiet:
+            (self.out or sys.stdout).writelines(f"{t}\n" for t in self.tasks.values())
 
     def handle_show(self, args):
         if not args:
-            print("Error: Missing task ID.")
+            self.error("Error: Missing task ID.")
             return
-        id_ = args[0]
-        if id_ not in self.tasks:
-            print(f"Error: Task with ID {id_} not found.")
+        id_ = self.resolve_id(args[0])
+        if id_ is None:
             return
         
         t = self.tasks[id_]
         # Enhanced detailed view
-        print(f"[{t.id}]")
-        print(f"Title:      {t.title}")
-        print(f"Status:     {t.status}")
-        print(f"Created At: {t.created_at}")
-        print(f"Updated At: {t.updated_at}")
+        self.say(
+            f"[{t.id}]\n"
+            f"Title:      {t.title}\n"
+            f"Status:     {t.status}\n"
+            f"Created At: {t.created_at}\n"
+            f"Updated At: {t.updated_at}",
+            task=t.to_dict()
+        )
 
     def handle_update(self, args):
         if len(args) < 2:
-            print("Error: Usage: update <id> <new_title | new_status>")
+            self.error("Error: Usage: update <id> <new_title | new_status>")
             return
-        id_ = args[0]
+        id_ = self.resolve_id(args[0])
         value = " ".join(args[1:]).strip()
         
-        if id_ not in self.tasks:
-            print(f"Error: Task with ID {id_} not found.")
+        if id_ is None:
             return
         
         if not value:
-            print("Error: Update value cannot be empty.")
+            self.error("Error: Update value cannot be empty.")
             return
 
+        task = self.tasks[id_]
         # Check if value is a status (case-insensitive)
         lower_value = value.lower()
         if lower_value in VALID_STATUSES:
-            self.tasks[id_].update_status(lower_value)
-            print(f"Task status updated: {self.tasks[id_]}")
+            task.update_status(lower_value)
+            self.tasks[id_] = task
+            self.say(f"Task status updated: {task}", task=task.to_dict())
         else:
             # Treat as title
-            self.tasks[id_].update_title(value)
-            print(f"Task title updated: {self.tasks[id_]}")
+            task.update_title(value)
+            self.tasks[id_] = task
+            self.say(f"Task title updated: {task}", task=task.to_dict())
 
     def handle_delete(self, args):
         if not args:
-            print("Error: Missing task ID.")
+            self.error("Error: Missing task ID.")
             return
-        id_ = args[0]
-        if id_ not in self.tasks:
-            print(f"Error: Task with ID {id_} not found.")
+        id_ = self.resolve_id(args[0])
+        if id_ is None:
             return
         del self.tasks[id_]
-        print(f"Task deleted: {id_}")
+        self.say(f"Task deleted: {id_}", id=id_)
 
     def handle_complete(self, args):
         if not args:
-            print("Error: Missing task ID.")
+            self.error("Error: Missing task ID.")
             return
-        id_ = args[0]
-        if id_ not in self.tasks:
-            print(f"Error: Task with ID {id_} not found.")
+        id_ = self.resolve_id(args[0])
+        if id_ is None:
             return
         
         task = self.tasks[id_]
         if task.status == STATUS_COMPLETED:
-            print("Task is already completed.")
+            self.error("Task is already completed.")
             return
             
         task.complete()
-        print(f"Task completed: {task}")
+        self.tasks[id_] = task
+        self.say(f"Task completed: {task}", task=task.to_dict())
 
     def process_command(self, line):
         """Process a single command line."""
@@ -181,6 +268,7 @@ class TodoApp:
 
         command = parts[0].lower()
         args = parts[1:]
+        self._command = command
 
         # Check for hooks (placeholders for future phases)
         # In a real CLI lib, we'd parse these properly. 
@@ -190,7 +278,7 @@ class TodoApp:
         # For simplicity, we assume standard usage per Phase 1 spec.
 
         if command in ('exit', 'quit'):
-            print("Goodbye!")
+            self.say("Goodbye!")
             self.running = False
             return
         elif command == 'add':
@@ -208,7 +296,7 @@ class TodoApp:
         elif command == 'help':
             self.print_help()
         else:
-            print(f"Unknown command: '{command}'. Type 'help' for available commands.")
+            self.error(f"Unknown command: '{command}'. Type 'help' for available commands.")
 
     def run(self):
         print("Hackathon Todo CLI (Type 'exit' to quit)")
@@ -226,6 +314,9 @@ class TodoApp:
                 
                 line = line.strip()
                 self.process_command(line)
+                # Persist each command before waiting for the next one
+                if hasattr(self.tasks, 'flush'):
+                    self.tasks.flush()
                 
             except KeyboardInterrupt:
                 print("\nGoodbye!")
@@ -233,6 +324,77 @@ class TodoApp:
             except Exception as e:
                 print(f"An unexpected error occurred: {e}")
 
+    def run_batch(self, lines):
+        """
+        Run commands from an iterable of lines without prompts, stopping at
+        exit/quit. Output is flushed by the caller, not after every command.
+        """
+        for line in lines:
+            try:
+                self.process_command(line.strip())
+            except Exception as e:
+                self.error(f"An unexpected error occurred: {e}")
+            if not self.running:
+                break
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hackathon Todo CLI")
+    parser.add_argument(
+        '--data', default=os.environ.get('TODO_DATA_DIR'),
+        help="directory to keep tasks in between runs (default: in memory only)"
+    )
+    parser.add_argument(
+        '--batch', metavar='FILE',
+        help="run the commands in FILE ('-' for stdin) without prompts, then exit"
+    )
+    parser.add_argument('--json', action='store_true', help="with --batch: report each result as a JSON line")
+    parser.add_argument('--quiet', action='store_true', help="with --batch: report errors only")
+    args = parser.parse_args(argv)
+    # The interactive prompt and banner are for people, not JSON readers
+    if (args.json or args.quiet) and not args.batch:
+        parser.error("--json and --quiet need --batch")
+
+    # Open the script before the store, so a bad path leaves nothing to close
+    script = None
+    if args.batch:
+        try:
+            script = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+        except OSError as e:
+            parser.error(f"cannot read batch file {args.batch}: {e.strerror}")
+
+    store = None
+    if args.data:
+        from storage import LogStore
+        try:
+            store = LogStore(args.data, load=Task.from_dict, dump=Task.to_dict)
+        except BaseException:
+            if script is not None and script is not sys.stdin:
+                script.close()
+            raise
+
+    if script is None:
+        app = TodoApp(store)
+        try:
+            app.run()
+        finally:
+            app.close()
+        return 0
+
+    app = TodoApp(store, json=args.json, quiet=args.quiet)
+    out = None
+    try:
+        # Write through a large buffer instead of flushing per line or per command
+        sys.stdout.flush()
+        out = app.out = open(sys.stdout.fileno(), 'w', buffering=BATCH_BUFFER, closefd=False,
+                             encoding=sys.stdout.encoding, errors=sys.stdout.errors)
+        app.run_batch(script)
+    finally:
+        app.close()
+        if out is not None:
+            out.close()
+        if script is not sys.stdin:
+            script.close()
+    return 1 if app.errors else 0
+
 if __name__ == "__main__":
-    app = TodoApp()
-    app.run()
+    sys.exit(main())
@@ -83,6 +83,66 @@ def test_app():
         if "Unknown command: 'foo'" not in captured_output.getvalue():
             print("FAILED: Unknown command handling", file=original_stdout)
 
+        # TEST 7: PERSISTENT STORE SURVIVES A RESTART AND COMPACTION
+        import tempfile
+        from storage import LogStore
+        from todo import Task
+        data_dir = tempfile.mkdtemp()
+        open_store = lambda: LogStore(data_dir, load=Task.from_dict, dump=Task.to_dict, compact_after=3)
+        persistent = TodoApp(open_store())
+        persistent.handle_add(["Persist", "me"])
+        persistent.handle_add(["Drop", "me"])
+        keep, drop = list(persistent.tasks)
+        persistent.handle_complete([keep])  # third log entry: compacts
+        persistent.handle_delete([drop])
+        persistent.close()
+
+        reopened = TodoApp(open_store())
+        if list(reopened.tasks) != [keep] or reopened.tasks[keep].status != STATUS_COMPLETED:
+            print("FAILED: Persistent store did not reload its tasks", file=original_stdout)
+        reopened.close()
+
+        # TEST 8: SHORT ID PREFIXES
+        captured_output.truncate(0); captured_output.seek(0)
+        app.handle_show([id1[:8]])
+        if f"[{id1}]" not in captured_output.getvalue():
+            print("FAILED: Unique ID prefix not accepted", file=original_stdout)
+
+        captured_output.truncate(0); captured_output.seek(0)
+        app.handle_show([id1[:2]])
+        if "not found" not in captured_output.getvalue():
+            print("FAILED: Too-short ID prefix accepted", file=original_stdout)
+
+        app.tasks[id1[:6] + "-other"] = app.tasks[id1]
+        captured_output.truncate(0); captured_output.seek(0)
+        app.handle_show([id1[:6]])
+        if "matches more than one task" not in captured_output.getvalue():
+            print("FAILED: Ambiguous ID prefix not caught", file=original_stdout)
+        del app.tasks[id1[:6] + "-other"]
+
+        reopened = TodoApp(open_store())
+        reopened.handle_add(["After", "reopen"])
+        reopened.handle_delete([keep[:8]])
+        if reopened.tasks.match_prefix(keep[:8]) or len(reopened.tasks) != 1:
+            print("FAILED: ID prefix on a persistent store", file=original_stdout)
+        reopened.close()
+
+        # TEST 9: BATCH MODE, JSON LINES AND QUIET
+        import json
+        out = io.StringIO()
+        batch = TodoApp(json=True, out=out)
+        batch.run_batch(["add Batch task\n", "show 0000\n", "exit\n", "add Never run\n"])
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        if [line['ok'] for line in lines] != [True, False, True] or lines[0]['task']['title'] != "Batch task":
+            print("FAILED: Batch JSON output", file=original_stdout)
+        if len(batch.tasks) != 1 or batch.errors != 1:
+            print("FAILED: Batch mode did not stop at exit", file=original_stdout)
+
+        out = io.StringIO()
+        TodoApp(quiet=True, out=out).run_batch(["add Quiet task", "list", "delete 0000"])
+        if out.getvalue() != "Error: Task with ID 0000 not found.\n":
+            print("FAILED: Quiet mode reported more than errors", file=original_stdout)
+
         print("ALL ENHANCED TESTS PASSED!", file=original_stdout)
 
     except Exception as e: